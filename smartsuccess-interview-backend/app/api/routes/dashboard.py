@@ -10,8 +10,10 @@ from datetime import datetime
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
+from app.models import InterviewPhase, InterviewType
 from app.services.session_store import InterviewStatus, SessionStore
 from app.services.session_adapter import convert_base_session_to_store
+from app.services.llm_service import PRIORITY_BACKGROUND, get_llm_service
 
 # Import interview services for fallback
 try:
@@ -34,6 +36,24 @@ def get_session_store(request: Request) -> Optional[SessionStore]:
     return getattr(request.app.state, 'session_store', None)
 
 
+# Interview service sessions are InterviewSession models, also after a
+# restart (files that do not decode are skipped). With use_enum_values,
+# phase and interview_type hold either the Enum member or its value.
+PHASE_STATUS = {
+    InterviewPhase.COMPLETED: InterviewStatus.COMPLETED,
+    InterviewPhase.IN_PROGRESS: InterviewStatus.IN_PROGRESS,
+}
+
+
+def _service_sessions(service, **filters):
+    """(session_id, session) of a service's own interview type"""
+    # The session index is shared by all services: without the type filter
+    # each service would load every other service's sessions too
+    return service.sessions.query(
+        interview_type=InterviewType(service.interview_type).value, **filters
+    )
+
+
 @router.get("/history/{user_id}")
 async def get_interview_history(
     request: Request,
@@ -79,49 +99,29 @@ async def get_interview_history(
     if INTERVIEW_SERVICES_AVAILABLE:
         for service_getter in [get_screening_interview_service, get_behavioral_interview_service, get_technical_interview_service]:
             try:
-                service = service_getter()
-                for session_id, base_session in service.sessions.items():
-                    # BUGFIX: Safe access — base_session may be dict after JSON round-trip
-                    _uid = getattr(base_session, 'user_id', None) or (base_session.get('user_id') if isinstance(base_session, dict) else None)
-                    if _uid == user_id:
-                        # Safely access phase and interview_type (handle both Enum and string)
-                        from enum import Enum
-                        _phase = getattr(base_session, 'phase', None) or (base_session.get('phase') if isinstance(base_session, dict) else None)
-                        phase_value = _phase.value if isinstance(_phase, Enum) else str(_phase) if _phase else 'pending'
-                        _itype = getattr(base_session, 'interview_type', None) or (base_session.get('interview_type') if isinstance(base_session, dict) else None)
-                        interview_type_value = _itype.value if isinstance(_itype, Enum) else str(_itype) if _itype else 'unknown'
-                        
-                        # Check status filter
-                        if status:
-                            if status == "completed" and phase_value != "completed":
-                                continue
-                            elif status == "in_progress" and phase_value != "in_progress":
-                                continue
-                        
-                        # Check if already in history
-                        if any(h["session_id"] == session_id for h in history):
-                            continue
-                        
-                        # Normalize interview_type format
-                        interview_type_str = interview_type_value.lower().replace(" interview", "")
-                        
-                        # BUGFIX: Safe access for all fields (may be dict after JSON round-trip)
-                        _sid = getattr(base_session, 'session_id', None) or (base_session.get('session_id') if isinstance(base_session, dict) else session_id)
-                        _responses = getattr(base_session, 'responses', []) if not isinstance(base_session, dict) else base_session.get('responses', [])
-                        _questions = getattr(base_session, 'questions_asked', []) if not isinstance(base_session, dict) else base_session.get('questions_asked', [])
-                        _created = getattr(base_session, 'created_at', None) if not isinstance(base_session, dict) else base_session.get('created_at')
-                        _completed = getattr(base_session, 'completed_at', None) if not isinstance(base_session, dict) else base_session.get('completed_at')
-                        
-                        history.append({
-                            "session_id": _sid,
-                            "interview_type": interview_type_str,
-                            "status": "completed" if phase_value == "completed" else "in_progress",
-                            "questions_answered": len(_responses) if _responses else 0,
-                            "total_questions": len(_questions) if _questions else 0,
-                            "voice_enabled": False,
-                            "created_at": _created.isoformat() if hasattr(_created, 'isoformat') else str(_created) if _created else datetime.now().isoformat(),
-                            "completed_at": _completed.isoformat() if hasattr(_completed, 'isoformat') else str(_completed) if _completed else None
-                        })
+                # BUGFIX: Same lru_cache key as the interview routes, so their
+                # service is reused instead of rebuilt from disk as raw dicts
+                service = service_getter(session_store=session_store)
+                # Indexed by user (and status) with SESSION_BACKEND=sqlite
+                phase_filter = status if status in ("completed", "in_progress") else None
+                for session_id, base_session in _service_sessions(
+                    service, user_id=user_id, phase=phase_filter, limit=limit
+                ):
+                    # Check if already in history
+                    if any(h["session_id"] == session_id for h in history):
+                        continue
+                    
+                    completed_at = base_session.completed_at
+                    history.append({
+                        "session_id": base_session.session_id,
+                        "interview_type": InterviewType(base_session.interview_type).value,
+                        "status": "completed" if base_session.phase == InterviewPhase.COMPLETED else "in_progress",
+                        "questions_answered": len(base_session.responses),
+                        "total_questions": len(base_session.questions_asked),
+                        "voice_enabled": False,
+                        "created_at": base_session.created_at.isoformat(),
+                        "completed_at": completed_at.isoformat() if completed_at else None
+                    })
             except Exception as e:
                 print(f"Error getting sessions from service: {e}")
                 continue
@@ -158,76 +158,36 @@ async def get_user_stats(
     if INTERVIEW_SERVICES_AVAILABLE:
         for service_getter in [get_screening_interview_service, get_behavioral_interview_service, get_technical_interview_service]:
             try:
-                service = service_getter()
-                for session_id, base_session in service.sessions.items():
-                    # BUGFIX: Safe access — base_session may be dict after JSON round-trip
-                    _uid = getattr(base_session, 'user_id', None) or (base_session.get('user_id') if isinstance(base_session, dict) else None)
-                    if _uid == user_id:
-                        # Convert to StoreSession format for consistency
-                        if session_store:
-                            store_session = convert_base_session_to_store(base_session, session_store)
-                            # Check if not already in list
-                            if not any(s.session_id == store_session.session_id for s in all_sessions_list):
-                                all_sessions_list.append(store_session)
-                        else:
-                            # Create temporary entry
-                            # Note: InterviewStatus is already imported globally at top of file
-                            from app.services.session_store import InterviewSession as StoreSession
-                            from app.models import InterviewPhase
-                            from enum import Enum
-                            
-                            # Safely access phase and interview_type (handle both Enum and string)
-                            _phase = getattr(base_session, 'phase', None) or (base_session.get('phase') if isinstance(base_session, dict) else None)
-                            phase_value = _phase.value if isinstance(_phase, Enum) else str(_phase) if _phase else 'pending'
-                            _itype = getattr(base_session, 'interview_type', None) or (base_session.get('interview_type') if isinstance(base_session, dict) else None)
-                            interview_type_value = _itype.value if isinstance(_itype, Enum) else str(_itype) if _itype else 'unknown'
-                            
-                            # Map phase to status (handle both Enum and string)
-                            # BUGFIX: use _phase (safe access) instead of base_session.phase
-                            if isinstance(_phase, Enum):
-                                status_map = {
-                                    InterviewPhase.COMPLETED: InterviewStatus.COMPLETED,
-                                    InterviewPhase.IN_PROGRESS: InterviewStatus.IN_PROGRESS,
-                                    InterviewPhase.GREETING: InterviewStatus.PENDING
-                                }
-                                temp_status = status_map.get(_phase, InterviewStatus.PENDING)
-                            else:
-                                # If phase is already a string, map directly
-                                phase_str = str(_phase).lower() if _phase else "pending"
-                                if phase_str == "completed":
-                                    temp_status = InterviewStatus.COMPLETED
-                                elif phase_str == "in_progress":
-                                    temp_status = InterviewStatus.IN_PROGRESS
-                                else:
-                                    temp_status = InterviewStatus.PENDING
-                            
-                            # Normalize interview_type format
-                            interview_type_str = interview_type_value.lower().replace(" interview", "")
-                            
-                            # BUGFIX: Safe attribute access for all base_session fields
-                            _sid = getattr(base_session, 'session_id', None) or (base_session.get('session_id') if isinstance(base_session, dict) else session_id)
-                            _cqi = getattr(base_session, 'current_question_index', 0) if not isinstance(base_session, dict) else base_session.get('current_question_index', 0)
-                            _created = getattr(base_session, 'created_at', None) or (base_session.get('created_at') if isinstance(base_session, dict) else None)
-                            _started = getattr(base_session, 'started_at', None) or (base_session.get('started_at') if isinstance(base_session, dict) else None)
-                            _completed = getattr(base_session, 'completed_at', None) or (base_session.get('completed_at') if isinstance(base_session, dict) else None)
-                            
-                            temp_session = StoreSession(
-                                session_id=_sid,
-                                user_id=_uid,
-                                interview_type=interview_type_str,
-                                status=temp_status,
-                                current_question_index=_cqi,
-                                questions=[],
-                                responses=[],
-                                feedback_hints=[],
-                                created_at=_created or datetime.now(),
-                                started_at=_started,
-                                completed_at=_completed,
-                                last_activity=_completed or _started or _created or datetime.now(),
-                                voice_enabled=False,
-                                voice_provider="none"
-                            )
-                            all_sessions_list.append(temp_session)
+                service = service_getter(session_store=session_store)
+                for session_id, base_session in _service_sessions(service, user_id=user_id):
+                    # Convert to StoreSession format for consistency
+                    if session_store:
+                        store_session = convert_base_session_to_store(base_session, session_store)
+                        # Check if not already in list
+                        if not any(s.session_id == store_session.session_id for s in all_sessions_list):
+                            all_sessions_list.append(store_session)
+                    else:
+                        # Create temporary entry
+                        # Note: InterviewStatus is already imported globally at top of file
+                        from app.services.session_store import InterviewSession as StoreSession
+                        
+                        temp_session = StoreSession(
+                            session_id=base_session.session_id,
+                            user_id=base_session.user_id,
+                            interview_type=InterviewType(base_session.interview_type).value,
+                            status=PHASE_STATUS.get(base_session.phase, InterviewStatus.PENDING),
+                            current_question_index=base_session.current_question_index,
+                            questions=[],
+                            responses=[],
+                            feedback_hints=[],
+                            created_at=base_session.created_at,
+                            started_at=base_session.started_at,
+                            completed_at=base_session.completed_at,
+                            last_activity=base_session.completed_at or base_session.started_at or base_session.created_at,
+                            voice_enabled=False,
+                            voice_provider="none"
+                        )
+                        all_sessions_list.append(temp_session)
             except Exception as e:
                 print(f"Error getting stats from service: {e}")
                 continue
@@ -303,6 +263,49 @@ async def get_session_feedback(
     return feedback
 
 
+REPORT_SUMMARY_PROMPT = """Summarize this {interview_type} mock interview for the candidate in 3-4 sentences.
+Mention what went well and the most important thing to practice next.
+
+Score: {overall_score}
+Strengths: {strengths}
+Areas for improvement: {improvements}
+
+Conversation:
+{conversation}
+"""
+
+
+async def _generate_report_summary(report: dict) -> Optional[str]:
+    """Narrative summary of a report, or None when no LLM is available"""
+    llm = get_llm_service()
+    if not llm.is_available():
+        return None
+    
+    conversation = "\n\n".join(
+        f"Q{turn['question_index']}: {turn['question']}\nA: {turn['user_response']}"
+        for turn in report["conversation_history"]
+    )
+    prompt = REPORT_SUMMARY_PROMPT.format(
+        interview_type=report["interview_type"],
+        overall_score=report["feedback_analysis"]["overall_score"],
+        strengths="; ".join(report["strengths"]) or "none noted",
+        improvements="; ".join(report["areas_for_improvement"]) or "none noted",
+        conversation=conversation
+    )
+    try:
+        # Reports are not on a live turn: queue behind interview calls
+        summary = await llm.generate(
+            prompt=prompt,
+            temperature=0.3,
+            max_tokens=300,
+            priority=PRIORITY_BACKGROUND
+        )
+        return summary.strip()
+    except Exception as e:
+        print(f"Error generating report summary: {e}")
+        return None
+
+
 @router.get("/session/{session_id}/report")
 async def generate_interview_report(
     request: Request,
@@ -325,11 +328,11 @@ async def generate_interview_report(
     if not session and INTERVIEW_SERVICES_AVAILABLE:
         # Determine interview type from session_id
         if session_id.startswith("screening_"):
-            service = get_screening_interview_service()
+            service = get_screening_interview_service(session_store=session_store)
         elif session_id.startswith("behavioral_"):
-            service = get_behavioral_interview_service()
+            service = get_behavioral_interview_service(session_store=session_store)
         elif session_id.startswith("technical_"):
-            service = get_technical_interview_service()
+            service = get_technical_interview_service(session_store=session_store)
         else:
             service = None
         
@@ -343,33 +346,9 @@ async def generate_interview_report(
                     # Create a temporary StoreSession-like object
                     # Note: InterviewStatus is already imported globally at top of file
                     from app.services.session_store import InterviewSession as StoreSession
-                    from app.models import InterviewPhase
-                    from enum import Enum
-                    
-                    # Safely access phase (handle both Enum and string)
-                    phase_value = base_session.phase.value if isinstance(base_session.phase, Enum) else str(base_session.phase)
-                    interview_type_value = base_session.interview_type.value if isinstance(base_session.interview_type, Enum) else str(base_session.interview_type)
                     
-                    # Map phase to status (handle both Enum and string)
-                    if isinstance(base_session.phase, Enum):
-                        status_map = {
-                            InterviewPhase.COMPLETED: InterviewStatus.COMPLETED,
-                            InterviewPhase.IN_PROGRESS: InterviewStatus.IN_PROGRESS,
-                            InterviewPhase.GREETING: InterviewStatus.PENDING
-                        }
-                        status = status_map.get(base_session.phase, InterviewStatus.PENDING)
-                    else:
-                        # If phase is already a string, map directly
-                        phase_str = str(base_session.phase).lower()
-                        if phase_str == "completed":
-                            status = InterviewStatus.COMPLETED
-                        elif phase_str == "in_progress":
-                            status = InterviewStatus.IN_PROGRESS
-                        else:
-                            status = InterviewStatus.PENDING
-                    
-                    # Normalize interview_type format
-                    interview_type_str = interview_type_value.lower().replace(" interview", "")
+                    status = PHASE_STATUS.get(base_session.phase, InterviewStatus.PENDING)
+                    interview_type_str = InterviewType(base_session.interview_type).value
                     
                     # Convert questions and responses
                     questions = [{"question": q, "question_index": i, "category": "general"} 
@@ -468,7 +447,8 @@ async def generate_interview_report(
         },
         "strengths": [],
         "areas_for_improvement": [],
-        "recommendations": []
+        "recommendations": [],
+        "ai_summary": None
     }
     
     # Calculate duration
@@ -538,4 +518,6 @@ async def generate_interview_report(
         "Consider doing more mock interviews to build confidence"
     ]
     
+    report["ai_summary"] = await _generate_report_summary(report)
+    
     return report
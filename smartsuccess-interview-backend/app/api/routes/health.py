@@ -5,6 +5,13 @@ Health Check Route
 from fastapi import APIRouter
 from datetime import datetime
 
+from app.core.embedding_cache import get_embedding_cache
+from app.core.vector_store import get_vector_store
+from app.services.http_pool import get_http_pool
+from app.services.llm_service import get_llm_service
+from app.services.request_timing import get_request_metrics
+from app.services.session_write_behind import get_session_writer
+
 router = APIRouter(tags=["health"])
 
 
@@ -15,7 +22,21 @@ async def health_check():
         "status": "healthy",
         "service": "SmartSuccess Interview Backend",
         "version": "2.0.0",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow().isoformat(),
+        "vector_store": get_vector_store().get_stats(),
+        "embedding_cache": get_embedding_cache().get_stats(),
+        "http_pools": get_http_pool().get_stats(),
+        "llm_providers": get_llm_service().health.get_stats(),
+        "session_writer": get_session_writer().get_stats()
+    }
+
+
+@router.get("/metrics")
+async def request_metrics():
+    """Per-route request counts and stage latency histograms"""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        **get_request_metrics().get_stats()
     }
 
 
@@ -34,6 +34,8 @@ from fastapi import APIRouter, UploadFile, File, Form, Query, Request
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 
+from app.services.http_pool import get_http_pool
+
 load_dotenv()
 
 # ============================================================================
@@ -277,34 +279,34 @@ async def call_groq_api(prompt: str, system_prompt: str = "You are a helpful AI
     if not api_key:
         raise Exception("GROQ_API_KEY not set")
 
-    async with aiohttp.ClientSession() as session:
-        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-        data = {
-            "model": "llama-3.3-70b-versatile",
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": max_tokens,
-            "temperature": 0.2
-        }
-        if json_mode:
-            data["response_format"] = {"type": "json_object"}
-        try:
-            async with session.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers=headers, json=data,
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                if response.status == 429:
-                    raise Exception(f"Groq rate limit exceeded (429)")
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"Groq API error: {response.status} - {error_text}")
-                result = await response.json()
-                return result["choices"][0]["message"]["content"]
-        except aiohttp.ClientError as e:
-            raise Exception(f"Groq API request failed: {str(e)}")
+    session = get_http_pool().session("groq")
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    data = {
+        "model": "llama-3.3-70b-versatile",
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": max_tokens,
+        "temperature": 0.2
+    }
+    if json_mode:
+        data["response_format"] = {"type": "json_object"}
+    try:
+        async with session.post(
+            "https://api.groq.com/openai/v1/chat/completions",
+            headers=headers, json=data,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status == 429:
+                raise Exception(f"Groq rate limit exceeded (429)")
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"Groq API error: {response.status} - {error_text}")
+            result = await response.json()
+            return result["choices"][0]["message"]["content"]
+    except aiohttp.ClientError as e:
+        raise Exception(f"Groq API request failed: {str(e)}")
 
 
 async def call_gemini_api(prompt: str, system_prompt: str = "You are a helpful AI assistant specializing in job application analysis.", max_tokens: int = 2000, json_mode: bool = False) -> str:
@@ -314,34 +316,34 @@ async def call_gemini_api(prompt: str, system_prompt: str = "You are a helpful A
 
     url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={api_key}"
 
-    async with aiohttp.ClientSession() as session:
-        headers = {"Content-Type": "application/json"}
-        gen_config = {
-            "maxOutputTokens": max_tokens,
-            "temperature": 0.2,
-            # Disable thinking to prevent token budget theft.
-            # Gemini 2.5 Flash uses thinking tokens by default which consume
-            # maxOutputTokens silently (~50-65%), causing truncation on
-            # generation tasks (cover letters, summaries) that don't need CoT.
-            "thinkingConfig": {"thinkingBudget": 0},
-        }
-        if json_mode:
-            gen_config["responseMimeType"] = "application/json"
-        data = {
-            "contents": [{"parts": [{"text": f"{system_prompt}\n\n{prompt}"}]}],
-            "generationConfig": gen_config
-        }
-        try:
-            async with session.post(url, headers=headers, json=data, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                if response.status == 429:
-                    raise Exception(f"Gemini rate limit exceeded (429)")
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"Gemini API error: {response.status} - {error_text}")
-                result = await response.json()
-                return result["candidates"][0]["content"]["parts"][0]["text"]
-        except aiohttp.ClientError as e:
-            raise Exception(f"Gemini API request failed: {str(e)}")
+    session = get_http_pool().session("gemini")
+    headers = {"Content-Type": "application/json"}
+    gen_config = {
+        "maxOutputTokens": max_tokens,
+        "temperature": 0.2,
+        # Disable thinking to prevent token budget theft.
+        # Gemini 2.5 Flash uses thinking tokens by default which consume
+        # maxOutputTokens silently (~50-65%), causing truncation on
+        # generation tasks (cover letters, summaries) that don't need CoT.
+        "thinkingConfig": {"thinkingBudget": 0},
+    }
+    if json_mode:
+        gen_config["responseMimeType"] = "application/json"
+    data = {
+        "contents": [{"parts": [{"text": f"{system_prompt}\n\n{prompt}"}]}],
+        "generationConfig": gen_config
+    }
+    try:
+        async with session.post(url, headers=headers, json=data, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            if response.status == 429:
+                raise Exception(f"Gemini rate limit exceeded (429)")
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"Gemini API error: {response.status} - {error_text}")
+            result = await response.json()
+            return result["candidates"][0]["content"]["parts"][0]["text"]
+    except aiohttp.ClientError as e:
+        raise Exception(f"Gemini API request failed: {str(e)}")
 
 
 async def call_openai_api(prompt: str, system_prompt: str = "You are a helpful AI assistant specializing in job application analysis.", max_tokens: int = 2000, json_mode: bool = False) -> str:
@@ -352,34 +354,34 @@ async def call_openai_api(prompt: str, system_prompt: str = "You are a helpful A
     if not api_key:
         raise Exception("OPENAI_API_KEY not set")
 
-    async with aiohttp.ClientSession() as session:
-        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-        data = {
-            "model": "gpt-4o-mini",
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": max_tokens,
-            "temperature": 0.2
-        }
-        if json_mode:
-            data["response_format"] = {"type": "json_object"}
-        try:
-            async with session.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers, json=data,
-                timeout=aiohttp.ClientTimeout(total=60)
-            ) as response:
-                if response.status == 429:
-                    raise Exception(f"OpenAI rate limit exceeded (429)")
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"OpenAI API error: {response.status} - {error_text}")
-                result = await response.json()
-                return result["choices"][0]["message"]["content"]
-        except aiohttp.ClientError as e:
-            raise Exception(f"OpenAI API request failed: {str(e)}")
+    session = get_http_pool().session("openai")
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    data = {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": max_tokens,
+        "temperature": 0.2
+    }
+    if json_mode:
+        data["response_format"] = {"type": "json_object"}
+    try:
+        async with session.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers=headers, json=data,
+            timeout=aiohttp.ClientTimeout(total=60)
+        ) as response:
+            if response.status == 429:
+                raise Exception(f"OpenAI rate limit exceeded (429)")
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"OpenAI API error: {response.status} - {error_text}")
+            result = await response.json()
+            return result["choices"][0]["message"]["content"]
+    except aiohttp.ClientError as e:
+        raise Exception(f"OpenAI API request failed: {str(e)}")
 
 
 # OpenRouter kept as optional Layer 4 (free, less reliable)
@@ -401,38 +403,38 @@ async def call_openrouter_api(prompt: str, system_prompt: str = "You are a helpf
 
     model = OPENROUTER_FREE_MODELS[model_index]
 
-    async with aiohttp.ClientSession() as session:
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "HTTP-Referer": os.getenv("FRONTEND_URL", "https://smart-sccuss-career-intelligence-ai.vercel.app"),
-            "X-Title": "MatchWise AI (SmartSuccess)",
-            "Content-Type": "application/json"
-        }
-        data = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": max_tokens,
-            "temperature": 0.2
-        }
-        try:
-            async with session.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers, json=data,
-                timeout=aiohttp.ClientTimeout(total=45)
-            ) as response:
-                if response.status == 429:
-                    print(f"⚠️ OpenRouter model {model} rate limited, trying next...")
-                    return await call_openrouter_api(prompt, system_prompt, max_tokens, model_index + 1)
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"OpenRouter API error ({model}): {response.status} - {error_text}")
-                result = await response.json()
-                return result["choices"][0]["message"]["content"]
-        except aiohttp.ClientError as e:
-            raise Exception(f"OpenRouter API request failed ({model}): {str(e)}")
+    session = get_http_pool().session("openrouter")
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "HTTP-Referer": os.getenv("FRONTEND_URL", "https://smart-sccuss-career-intelligence-ai.vercel.app"),
+        "X-Title": "MatchWise AI (SmartSuccess)",
+        "Content-Type": "application/json"
+    }
+    data = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": max_tokens,
+        "temperature": 0.2
+    }
+    try:
+        async with session.post(
+            "https://openrouter.ai/api/v1/chat/completions",
+            headers=headers, json=data,
+            timeout=aiohttp.ClientTimeout(total=45)
+        ) as response:
+            if response.status == 429:
+                print(f"⚠️ OpenRouter model {model} rate limited, trying next...")
+                return await call_openrouter_api(prompt, system_prompt, max_tokens, model_index + 1)
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"OpenRouter API error ({model}): {response.status} - {error_text}")
+            result = await response.json()
+            return result["choices"][0]["message"]["content"]
+    except aiohttp.ClientError as e:
+        raise Exception(f"OpenRouter API request failed ({model}): {str(e)}")
 
 
 async def call_ai_api(
@@ -4,6 +4,7 @@ First impression assessment endpoints
 """
 
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
 from app.models import (
@@ -16,6 +17,7 @@ from app.interview.screening_interview import (
     ScreeningInterviewService,
     get_screening_interview_service
 )
+from app.utils.sse import SSE_HEADERS, message_event_stream
 
 router = APIRouter(
     prefix="/api/interview/screening",
@@ -104,6 +106,33 @@ async def send_screening_message(request: MessageRequest, http_request: Request)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/message/stream")
+async def stream_screening_message(request: MessageRequest, http_request: Request):
+    """
+    Send a message in the screening interview and stream the reply (SSE)
+    
+    Emits `delta` events with the next question as it is generated,
+    then a `done` event carrying the full MessageResponse.
+    
+    - **session_id**: Session identifier from start endpoint
+    - **message**: User's response text
+    """
+    service = get_service(http_request)
+    
+    session = service.get_session(request.session_id)
+    if not session:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Session {request.session_id} not found"
+        )
+    
+    return StreamingResponse(
+        message_event_stream(service, request.session_id, request.message),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 @router.get("/session/{session_id}")
 async def get_screening_session(session_id: str, http_request: Request):
     """Get screening session details"""
@@ -38,12 +38,25 @@ class Settings(BaseSettings):
     cost_optimized_mode: bool = False  # True = use Gemini + GPU, False = use OpenAI (default)
     
     # Embedding Configuration
-    embedding_provider: str = "openai"  # openai, xai
+    embedding_provider: str = "openai"  # openai, xai, stub
     embedding_model: str = "text-embedding-3-small"
     embedding_dimension: int = 1536
+    embedding_cache_size: int = 4096  # In-memory LRU entries
+    embedding_cache_path: Optional[str] = "data/embedding_cache.db"  # SQLite tier ("" = memory only)
+    embedding_cache_disk_max_rows: int = 100000  # SQLite tier row cap, oldest dropped (0 = none)
+    embedding_cache_ttl_seconds: int = 2592000  # SQLite tier row lifetime, 30 days (0 = none)
+    embedding_batch_max_tokens: int = 20000  # Estimated tokens per embed_batch request
+    embedding_batch_max_items: int = 256  # Inputs per embed_batch request
+    embedding_max_concurrency: int = 4  # Concurrent embed_batch requests per service
+    vector_precision: str = "float32"  # float32, float16, int8
+    vector_rerank: bool = False  # Exact float32 re-rank for float16/int8
+    vector_ann_min_rows: int = 2048  # Collections this large use an IVF index
+    vector_ann_nprobe: int = 8  # IVF clusters probed per query (recall vs latency)
+    vector_memory_budget_mb: int = 0  # LRU-evict collections above this (0 = unlimited)
+    vector_spill_dir: Optional[str] = None  # Spill evicted collections here instead of dropping
     
     # LLM Configuration
-    llm_provider: str = "openai"  # openai, groq, anthropic, gemini, auto
+    llm_provider: str = "openai"  # openai, groq, anthropic, gemini, auto, stub
     llm_model: str = "gpt-4o-mini"
     llm_temperature: float = 0.7
     llm_max_tokens: int = 1024
@@ -55,11 +68,39 @@ class Settings(BaseSettings):
     gemini_model_primary: str = "gemini-2.5-flash"
     gemini_model_fallback: str = "gemini-2.0-flash"
     
+    # LLM fallback chain health (circuit breakers + adaptive routing)
+    llm_adaptive_routing: bool = True  # Order chain by success rate / p95 latency
+    llm_breaker_window: int = 20  # Recent calls per provider/model considered
+    llm_breaker_min_calls: int = 4  # Calls needed before a breaker may open
+    llm_breaker_failure_rate: float = 0.5  # Open at this failure rate
+    llm_breaker_slow_call_ms: float = 10000.0  # Calls slower than this count as slow
+    llm_breaker_open_seconds: float = 30.0  # Skip an open provider this long, then probe
+    llm_hedge_enabled: bool = False  # Race the next provider when the primary is slow
+    llm_hedge_percentile: float = 95.0  # Hedge after this percentile of primary latency
+    llm_hedge_default_delay_ms: float = 3000.0  # Delay before latency samples exist
+    llm_hedge_max_per_minute: int = 20  # Hedge budget
+    llm_hedge_allow_openai: bool = False  # Allow hedging to paid OpenAI
+    llm_rate_limit_enabled: bool = True  # Per-model RPM/TPM buckets (COST_OPTIMIZED_CONFIG)
+    llm_queue_max_wait_seconds: float = 10.0  # Then fall through to the next provider
+    llm_cache_enabled: bool = True  # Response cache for deterministic prompts
+    llm_cache_max_temperature: float = 0.3  # Cache calls at or below this (or opt-in)
+    llm_cache_size: int = 1024  # In-memory LRU entries
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_path: Optional[str] = "data/llm_cache.db"  # SQLite tier ("" = memory only)
+    
     # Phase 2: GPU Server Configuration (optional)
     gpu_server_url: Optional[str] = None
     gpu_server_timeout: int = 30
     gpu_health_check_interval: int = 60  # Health check cache TTL in seconds
     use_gpu_voice: bool = False  # True = GPU STT/TTS, False = OpenAI (default)
+
+    # Offline stub providers (LLM_PROVIDER=stub / EMBEDDING_PROVIDER=stub)
+    stub_seed: int = 0  # Same seed + same prompts = same transcript
+    stub_llm_latency_ms: float = 0.0  # Median latency per LLM call
+    stub_embedding_latency_ms: float = 0.0  # Median latency per embedding request
+    stub_gpu_latency_ms: float = 0.0  # Median latency per fake GPU server request
+    stub_latency_sigma: float = 0.0  # Log-normal spread (0 = constant latency)
+    stub_error_rate: float = 0.0  # Fraction of stub calls that fail
     
     # Phase 2: Conversation Engine (natural conversation mode)
     use_conversation_engine: bool = True  # Enable natural conversation style
@@ -71,6 +112,23 @@ class Settings(BaseSettings):
     session_timeout_minutes: int = 60
     max_concurrent_sessions: int = 50
     
+    # Interview session persistence
+    session_backend: str = "files"  # files (data/sessions JSON + journal) or sqlite
+    session_sqlite_path: str = "data/sessions.db"  # Shared by all workers on one box
+    session_cache_max_sessions: int = 500  # Session bodies kept in memory per store (LRU); 0 = no cap
+    session_journal_enabled: bool = True  # Append per-turn deltas instead of rewriting
+    session_journal_compact_every: int = 50  # Journal records before re-snapshotting
+    session_write_behind: bool = True  # Defer and coalesce writes (background flush)
+    session_flush_interval_ms: int = 200
+    session_flush_max_batch: int = 100  # Sessions per worker-thread job
+    session_flush_on_complete: bool = True  # Completed sessions are written before responding
+    
+    # Shared HTTP client pool (LLM/embedding providers)
+    http_pool_max_connections: int = 20  # Per provider
+    http_pool_max_keepalive: int = 10  # Idle connections kept per provider
+    http_pool_keepalive_expiry: float = 30.0  # Seconds an idle connection is kept
+    http_pool_http2: bool = False  # Requires the h2 package
+    
     # Voice Configuration
     whisper_model: str = "whisper-1"
     tts_model: str = "tts-1"
@@ -87,6 +145,15 @@ class Settings(BaseSettings):
     # Data paths
     data_dir: str = "data"
     
+    # Vector store snapshots (memory-mapped restore across restarts)
+    vector_snapshot_enabled: bool = False
+    vector_snapshot_dir: str = "data/vector_snapshots"
+    vector_snapshot_interval_seconds: int = 300
+    
+    # Request stage timing (Server-Timing header, GET /metrics histograms)
+    request_timing_enabled: bool = True
+    server_timing_header: bool = True  # False = histograms only, no header
+    
     @property
     def allowed_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.allowed_origins.split(",") if origin.strip()]
@@ -106,22 +173,30 @@ COST_OPTIMIZED_CONFIG = {
             "provider": "gemini",
             "model": "gemini-2.5-flash",       # HOTFIX: was gemini-2.0-flash-exp (404)
             "cost_per_1m_tokens": 0,  # Free tier: 1500 req/day
-            "daily_limit": 1500
+            "daily_limit": 1500,
+            "rpm": 10,  # Requests per minute
+            "tpm": 250000  # Tokens per minute
         },
         "fallback": {
             "provider": "gemini",
             "model": "gemini-2.0-flash",        # HOTFIX: was gemini-1.5-flash (404)
-            "cost_per_1m_tokens": 0.075  # ~$0.075/1M
+            "cost_per_1m_tokens": 0.075,  # ~$0.075/1M
+            "rpm": 15,  # Requests per minute
+            "tpm": 1000000  # Tokens per minute
         },
         "groq_fallback": {
             "provider": "groq",
             "model": "llama-3.3-70b-versatile",
             "cost_per_1m_tokens": 0,  # Free tier: 14400 req/day, 30 req/min
+            "rpm": 30,  # Requests per minute
+            "tpm": 12000  # Tokens per minute
         },
         "emergency": {
             "provider": "openai",
             "model": "gpt-4o-mini",
-            "cost_per_1m_tokens": 0.15
+            "cost_per_1m_tokens": 0.15,
+            "rpm": 500,  # Requests per minute
+            "tpm": 200000  # Tokens per minute
         }
     }
 }
@@ -19,7 +19,7 @@ from datetime import datetime
 from enum import Enum
 
 from app.config import settings
-from app.services.llm_service import get_llm_service
+from app.services.llm_service import get_llm_service, PRIORITY_BACKGROUND
 
 
 class InterviewPhase(Enum):
@@ -372,7 +372,8 @@ Respond with ONLY JSON."""
             result = await self.llm_service.generate(
                 prompt=prompt,
                 temperature=0.3,
-                max_tokens=80
+                max_tokens=80,
+                priority=PRIORITY_BACKGROUND  # UI hint, not the live turn
             )
             
             text = result.strip()
@@ -0,0 +1,244 @@
+"""
+Embedding Cache for SmartSuccess Interview Backend
+Content-addressed (model + text) vectors: memory LRU plus an optional SQLite tier
+"""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(model: str, text: str) -> str:
+    """Cache key for already-normalized text"""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier (memory LRU + SQLite) embedding cache
+
+    Usage:
+        cache = EmbeddingCache(max_entries=4096, db_path="data/embedding_cache.db")
+        vector = await cache.get("text-embedding-3-small", text)
+        await cache.put("text-embedding-3-small", text, vector)
+
+    The disk tier keeps at most `disk_max_rows` rows (oldest dropped first)
+    no older than `ttl_seconds`; 0 disables either bound.
+    """
+
+    # Rows stored between disk prunes
+    PRUNE_EVERY = 100
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        db_path: Optional[str] = None,
+        disk_max_rows: int = 100_000,
+        ttl_seconds: float = 30 * 86400.0
+    ):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.disk_max_rows = disk_max_rows
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._unpruned = 0  # Rows stored since the last prune
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    async def get(self, model: str, text: str) -> Optional[np.ndarray]:
+        """Vector `model` produced for `text`, if cached"""
+        return (await self.get_many(model, [text]))[0]
+
+    async def get_many(
+        self, model: str, texts: List[str]
+    ) -> List[Optional[np.ndarray]]:
+        """Cached vectors for `texts` (None where missing), in input order"""
+        results: List[Optional[np.ndarray]] = []
+        missing: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            key = cache_key(model, text)
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            else:
+                missing.setdefault(key, []).append(i)
+            results.append(vector)
+
+        if missing and self.db_path:
+            found = await asyncio.to_thread(self._disk_get_many, list(missing))
+            for key, vector in found.items():
+                self._remember(key, vector)
+                for i in missing.pop(key):
+                    results[i] = vector
+                    self.disk_hits += 1
+
+        self.misses += sum(len(indexes) for indexes in missing.values())
+        return results
+
+    async def put(self, model: str, text: str, vector: List[float]) -> None:
+        await self.put_many(model, [(text, vector)])
+
+    async def put_many(self, model: str, items: List[Tuple[str, List[float]]]) -> None:
+        """Store (text, vector) pairs produced by `model`"""
+        rows = []
+        for text, vector in items:
+            array = np.asarray(vector, dtype=np.float32)
+            if not array.any():
+                continue
+            key = cache_key(model, text)
+            self._remember(key, array)
+            rows.append((key, model, array.shape[0], array.tobytes(), time.time()))
+
+        if rows:
+            self.stores += len(rows)
+            if self.db_path:
+                await asyncio.to_thread(self._disk_put, rows)
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and self.db_path:
+            try:
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, model TEXT, dimension INTEGER, "
+                    "vector BLOB, created_at REAL)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS embeddings_created_at "
+                    "ON embeddings (created_at)"
+                )
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache disk tier disabled: {e}")
+                self.db_path = None
+        return self._conn
+
+    def _disk_get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        rows = []
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return {}
+            try:
+                # Stay below SQLite's bound-parameter limit
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    rows += conn.execute(
+                        "SELECT key, vector FROM embeddings WHERE created_at >= ? "
+                        f"AND key IN ({','.join('?' * len(chunk))})",
+                        [self._expired_before(), *chunk]
+                    ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+                return {}
+        return {key: np.frombuffer(blob, dtype=np.float32) for key, blob in rows}
+
+    def _disk_put(self, rows: List[Tuple]) -> None:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)", rows
+                )
+                # Prune now and then so the file stays bounded
+                self._unpruned += len(rows)
+                if self._unpruned >= self.PRUNE_EVERY:
+                    self._unpruned = 0
+                    self._prune(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+
+    def _expired_before(self) -> float:
+        return time.time() - self.ttl_seconds if self.ttl_seconds else 0.0
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Drop expired rows, then the oldest rows over `disk_max_rows`"""
+        if self.ttl_seconds:
+            conn.execute(
+                "DELETE FROM embeddings WHERE created_at < ?", (self._expired_before(),)
+            )
+        if self.disk_max_rows:
+            conn.execute(
+                "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings "
+                "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.disk_max_rows,)
+            )
+
+    def clear(self) -> None:
+        """Drop both tiers"""
+        self._memory.clear()
+        with self._lock:
+            conn = self._connect()
+            if conn is not None:
+                conn.execute("DELETE FROM embeddings")
+                conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, object]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "entries_in_memory": len(self._memory),
+            "max_entries": self.max_entries,
+            "disk_path": self.db_path,
+            "disk_max_rows": self.disk_max_rows,
+            "ttl_seconds": self.ttl_seconds,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_ratio": (
+                round((self.memory_hits + self.disk_hits) / lookups, 4)
+                if lookups else None
+            ),
+        }
+
+
+# Singleton instance shared by all EmbeddingService instances
+_embedding_cache_instance: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the singleton embedding cache"""
+    global _embedding_cache_instance
+    if _embedding_cache_instance is None:
+        from app.config import settings
+        _embedding_cache_instance = EmbeddingCache(
+            max_entries=settings.embedding_cache_size,
+            db_path=settings.embedding_cache_path or None,
+            disk_max_rows=settings.embedding_cache_disk_max_rows,
+            ttl_seconds=settings.embedding_cache_ttl_seconds
+        )
+    return _embedding_cache_instance
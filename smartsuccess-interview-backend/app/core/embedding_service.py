@@ -7,17 +7,22 @@ Features:
 - Batch processing for efficiency
 - Section-aware text chunking for resumes/JDs
 - Automatic retry and error handling
+- Content-hash cache (memory LRU + SQLite) so repeated texts cost no calls
+- EMBEDDING_PROVIDER=stub for offline, deterministic embeddings (app/stubs)
 """
 
 import os
 import re
 import asyncio
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-import httpx
 from openai import AsyncOpenAI
 
 from app.config import settings
+from app.core.embedding_cache import EmbeddingCache, get_embedding_cache
+from app.services.http_pool import get_http_pool
+from app.services.request_timing import STAGE_EMBEDDING, timed
+from app.stubs import STUB_EMBEDDING_MODEL, get_stub_embeddings
 
 
 @dataclass
@@ -39,7 +44,7 @@ class EmbeddingService:
         embeddings = await service.embed_batch(["text1", "text2"])
     """
     
-    def __init__(self):
+    def __init__(self, cache: Optional[EmbeddingCache] = None):
         self.openai_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
         self.xai_key = settings.xai_api_key or os.getenv("XAI_API_KEY")
         
@@ -52,9 +57,38 @@ class EmbeddingService:
         self.model = settings.embedding_model
         self.dimension = settings.embedding_dimension
         
+        # Offline stub (same client surface as AsyncOpenAI, no fallback)
+        if settings.embedding_provider == "stub":
+            self.openai_client = get_stub_embeddings()
+            self.model = STUB_EMBEDDING_MODEL
+            self.xai_key = None
+        
         # xAI endpoint for fallback
         self.xai_endpoint = "https://api.x.ai/v1/embeddings"
+        self.xai_model = "embedding-beta"
+        
+        # Shared content-hash cache (see embedding_cache.py)
+        self.cache = cache if cache is not None else get_embedding_cache()
+        
+        # Batching limits for embed_many
+        self.batch_max_tokens = settings.embedding_batch_max_tokens
+        self.batch_max_items = settings.embedding_batch_max_items
+        self._batch_semaphore = asyncio.Semaphore(settings.embedding_max_concurrency)
+    
+    def _cache_model(self) -> Optional[str]:
+        """
+        Model of the primary provider, the only one cached and served
+        
+        Fallback vectors are in another embedding space, so they are neither
+        stored nor served: after an outage, callers get primary vectors again.
+        """
+        if self.openai_client:
+            return self.model
+        if self.xai_key:
+            return self.xai_model
+        return None
     
+    @timed(STAGE_EMBEDDING)
     async def embed_text(self, text: str) -> List[float]:
         """
         Generate embedding for a single text
@@ -71,6 +105,18 @@ class EmbeddingService:
         # Clean text
         text = self._clean_text(text)
         
+        cache_model = self._cache_model()
+        cached = await self.cache.get(cache_model, text) if cache_model else None
+        if cached is not None:
+            return cached.tolist()
+        
+        embedding, model = await self._embed_uncached(text)
+        if model and model == cache_model:
+            await self.cache.put(model, text, embedding)
+        return embedding
+    
+    async def _embed_uncached(self, text: str) -> Tuple[List[float], Optional[str]]:
+        """Embed one cleaned text; returns (embedding, model that produced it)"""
         # Try OpenAI first
         if self.openai_client:
             try:
@@ -78,25 +124,29 @@ class EmbeddingService:
                     model=self.model,
                     input=text
                 )
-                return response.data[0].embedding
+                return response.data[0].embedding, self.model
             except Exception as e:
                 print(f"OpenAI embedding error: {e}, falling back to xAI")
         
         # Fallback to xAI
         if self.xai_key:
             try:
-                return await self._embed_with_xai(text)
+                return await self._embed_with_xai(text), self.xai_model
             except Exception as e:
                 print(f"xAI embedding error: {e}")
         
         # Return zero vector if all providers fail
         print("Warning: All embedding providers failed, returning zero vector")
-        return [0.0] * self.dimension
+        return [0.0] * self.dimension, None
     
+    @timed(STAGE_EMBEDDING)
     async def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts efficiently
         
+        Cached texts are served from the cache; the remaining distinct texts
+        are embedded in a single provider call.
+        
         Args:
             texts: List of texts to embed
             
@@ -109,6 +159,87 @@ class EmbeddingService:
         # Clean texts
         cleaned_texts = [self._clean_text(t) for t in texts]
         
+        cache_model = self._cache_model()
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        indexes = []
+        for i, text in enumerate(cleaned_texts):
+            if text:
+                indexes.append(i)
+            else:
+                results[i] = [0.0] * self.dimension
+        
+        # One cache lookup (and at most one disk query) for the whole batch
+        texts_to_look_up = [cleaned_texts[i] for i in indexes]
+        cached = (
+            await self.cache.get_many(cache_model, texts_to_look_up)
+            if cache_model else [None] * len(indexes)
+        )
+        missing: Dict[str, List[int]] = {}
+        for i, vector in zip(indexes, cached):
+            if vector is not None:
+                results[i] = vector.tolist()
+            else:
+                missing.setdefault(cleaned_texts[i], []).append(i)
+        
+        if missing:
+            unique_texts = list(missing)
+            embeddings, model = await self._embed_batch_uncached(unique_texts)
+            if model and model == cache_model:
+                await self.cache.put_many(model, list(zip(unique_texts, embeddings)))
+            for text, embedding in zip(unique_texts, embeddings):
+                for i in missing[text]:
+                    results[i] = embedding
+        
+        return results
+    
+    @timed(STAGE_EMBEDDING)
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed any number of texts with bounded, concurrent batch calls
+        
+        Texts are packed in order into batches of at most
+        `batch_max_tokens` estimated tokens and `batch_max_items` inputs;
+        batches run concurrently (at most `embedding_max_concurrency` at a
+        time) through `embed_batch`. Results are in input order.
+        """
+        batches = self._pack_batches(texts)
+        
+        async def run(batch: List[str]) -> List[List[float]]:
+            async with self._batch_semaphore:
+                return await self.embed_batch(batch)
+        
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        return [embedding for batch in results for embedding in batch]
+    
+    def _pack_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts (in order) into token- and size-budgeted batches"""
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for text in texts:
+            tokens = self._estimate_tokens(text)
+            if current and (
+                current_tokens + tokens > self.batch_max_tokens
+                or len(current) >= self.batch_max_items
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+    
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token count (~4 characters per token for English)"""
+        return len(text) // 4 + 1
+    
+    async def _embed_batch_uncached(
+        self,
+        cleaned_texts: List[str]
+    ) -> Tuple[List[List[float]], Optional[str]]:
+        """Embed cleaned texts; returns (embeddings, model that produced them)"""
         # Try OpenAI batch embedding
         if self.openai_client:
             try:
@@ -118,7 +249,7 @@ class EmbeddingService:
                 )
                 # Sort by index to maintain order
                 sorted_embeddings = sorted(response.data, key=lambda x: x.index)
-                return [e.embedding for e in sorted_embeddings]
+                return [e.embedding for e in sorted_embeddings], self.model
             except Exception as e:
                 print(f"OpenAI batch embedding error: {e}")
         
@@ -126,31 +257,31 @@ class EmbeddingService:
         if self.xai_key:
             try:
                 tasks = [self._embed_with_xai(t) for t in cleaned_texts]
-                return await asyncio.gather(*tasks)
+                return list(await asyncio.gather(*tasks)), self.xai_model
             except Exception as e:
                 print(f"xAI batch embedding error: {e}")
         
         # Return zero vectors if all fail
-        return [[0.0] * self.dimension for _ in texts]
+        return [[0.0] * self.dimension for _ in cleaned_texts], None
     
     async def _embed_with_xai(self, text: str) -> List[float]:
         """Generate embedding using xAI API"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.xai_endpoint,
-                headers={
-                    "Authorization": f"Bearer {self.xai_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "embedding-beta",
-                    "input": text
-                },
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["data"][0]["embedding"]
+        client = get_http_pool().client("xai")
+        response = await client.post(
+            self.xai_endpoint,
+            headers={
+                "Authorization": f"Bearer {self.xai_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": self.xai_model,
+                "input": text
+            },
+            timeout=30.0
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data["data"][0]["embedding"]
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text for embedding"""
@@ -0,0 +1,160 @@
+"""
+IVF-Flat Index for SmartSuccess Interview Backend
+Approximate nearest-neighbour search for large VectorStore collections
+
+Pure NumPy spherical k-means; a query scores only its `nprobe` nearest clusters.
+"""
+
+from typing import Any, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .vector_store import VectorCollection, VectorStore
+
+
+class IVFIndex:
+    """
+    Inverted-file index over a VectorCollection's rows
+
+    Usage:
+        index = IVFIndex.build(collection)
+        rows = index.candidates(query_vec, nprobe=8)
+    """
+
+    KMEANS_ITERATIONS = 10
+    # k-means trains on at most this many rows per list
+    SAMPLES_PER_LIST = 64
+    # Rows assigned per block (bounds the rows x lists score temporary)
+    _ASSIGN_BLOCK = 4096
+    _MIN_LIST_CAPACITY = 16
+
+    def __init__(self, centroids: np.ndarray):
+        self.centroids = centroids  # (n_lists, dim), L2-normalized
+        # Inverted lists: ascending row ids per cluster, over-allocated
+        # like VectorCollection's matrix so appends are amortized O(1)
+        self._lists = [
+            np.empty(self._MIN_LIST_CAPACITY, dtype=np.int64)
+            for _ in range(self.n_lists)
+        ]
+        self._list_sizes = np.zeros(self.n_lists, dtype=np.int64)
+        self.size = 0  # Rows assigned, including tombstones
+        self.built_size = 0
+
+    @property
+    def n_lists(self) -> int:
+        return self.centroids.shape[0]
+
+    @classmethod
+    def build(
+        cls,
+        collection: "VectorCollection",
+        n_lists: Optional[int] = None,
+        seed: int = 0
+    ) -> "IVFIndex":
+        """Train centroids on (a sample of) live rows and assign every row"""
+        live = collection.live_rows()
+        if live is None:
+            live = np.arange(collection.size)
+        if n_lists is None:
+            n_lists = int(round(np.sqrt(len(live))))
+        n_lists = max(1, min(n_lists, len(live)))
+
+        rng = np.random.default_rng(seed)
+        sample_size = n_lists * cls.SAMPLES_PER_LIST
+        sample = live
+        if len(live) > sample_size:
+            sample = np.sort(rng.choice(live, sample_size, replace=False))
+
+        centroids = _spherical_kmeans(
+            collection.dense_rows(sample), n_lists, cls.KMEANS_ITERATIONS, rng
+        )
+        index = cls(centroids)
+        index.add(collection, 0, collection.size)
+        index.built_size = collection.count
+        return index
+
+    def add(self, collection: "VectorCollection", start: int, end: int) -> None:
+        """Append rows [start, end) to the lists of their nearest centroids"""
+        labels = np.empty(end - start, dtype=np.int64)
+        for block_start in range(start, end, self._ASSIGN_BLOCK):
+            block_end = min(block_start + self._ASSIGN_BLOCK, end)
+            scores = collection.scores(
+                self.centroids.T, np.arange(block_start, block_end)
+            )
+            labels[block_start - start:block_end - start] = scores.argmax(axis=1)
+
+        # Group by list; the stable sort keeps each group's rows ascending
+        order = np.argsort(labels, kind="stable")
+        list_ids, firsts = np.unique(labels[order], return_index=True)
+        for list_id, rows in zip(list_ids, np.split(order + start, firsts[1:])):
+            self._append(list_id, rows)
+        self.size = end
+
+    def _append(self, list_id: int, rows: np.ndarray) -> None:
+        storage = self._lists[list_id]
+        size = self._list_sizes[list_id]
+        needed = size + len(rows)
+        if needed > len(storage):
+            grown = np.empty(max(needed, 2 * len(storage)), dtype=np.int64)
+            grown[:size] = storage[:size]
+            self._lists[list_id] = storage = grown
+        storage[size:needed] = rows
+        self._list_sizes[list_id] = needed
+
+    def list_rows(self, list_id: int) -> np.ndarray:
+        """Row ids assigned to one list, ascending (view)"""
+        return self._lists[list_id][:self._list_sizes[list_id]]
+
+    def candidates(self, query_vec: np.ndarray, nprobe: int) -> np.ndarray:
+        """Ascending row ids in the `nprobe` lists closest to the query"""
+        nprobe = max(1, min(nprobe, self.n_lists))
+        probe = np.argpartition(-(self.centroids @ query_vec), nprobe - 1)[:nprobe]
+        return np.sort(np.concatenate([self.list_rows(list_id) for list_id in probe]))
+
+
+def _spherical_kmeans(
+    points: np.ndarray,
+    n_clusters: int,
+    iterations: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """k-means on the unit sphere (cosine); empty clusters keep their centroid"""
+    centroids = points[rng.choice(len(points), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        labels = (points @ centroids.T).argmax(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, points)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        np.divide(sums, norms, out=centroids, where=norms > 0)
+    return centroids
+
+
+def recall_at_k(
+    store: "VectorStore",
+    collection_id: str,
+    query_embeddings: Any,
+    k: int = 10,
+    nprobe: Optional[int] = None,
+    metadata_filter: Optional[dict] = None
+) -> float:
+    """
+    Mean recall@k of (possibly approximate) search against brute force
+
+    Returns:
+        Fraction of the exact top-k ids that the indexed search also
+        returned, averaged over queries (1.0 = identical)
+    """
+    recalls: List[float] = []
+    for query in query_embeddings:
+        exact = store.search(
+            collection_id, query, k=k, metadata_filter=metadata_filter, exact=True
+        )
+        if not exact:
+            continue
+        approx = store.search(
+            collection_id, query, k=k, metadata_filter=metadata_filter, nprobe=nprobe
+        )
+        expected = {r.document.id for r in exact}
+        recalls.append(len(expected & {r.document.id for r in approx}) / len(expected))
+    return float(np.mean(recalls)) if recalls else 1.0
@@ -0,0 +1,323 @@
+"""
+Vector Store Snapshots for SmartSuccess Interview Backend
+Persists VectorStore collections as .npy files, restored as memory maps
+
+One directory per collection: vectors.npy, scales.npy (int8 only),
+exact.npy (rerank only) and documents.json.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .vector_store import VectorCollection, VectorDocument, VectorStore
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.npy"
+SCALES_FILE = "scales.npy"
+EXACT_FILE = "exact.npy"
+DOCUMENTS_FILE = "documents.json"
+SNAPSHOT_VERSION = 1
+
+
+def _collection_dirname(collection_id: str) -> str:
+    """Filesystem-safe, collision-free directory name for a collection"""
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", collection_id)[:80]
+    digest = hashlib.sha1(collection_id.encode("utf-8")).hexdigest()[:10]
+    return f"{safe}-{digest}"
+
+
+def _capture(
+    collection_id: str,
+    collection: VectorCollection
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Copy a collection's live rows and document fields (event-loop side)"""
+    documents = collection.live_documents()
+    rows = collection.live_rows()
+
+    arrays = {}
+    for filename, array in (
+        (VECTORS_FILE, collection.vectors),
+        (SCALES_FILE, collection.scales),
+        (EXACT_FILE, collection.exact_vectors),
+    ):
+        if array is not None:
+            arrays[filename] = np.array(array if rows is None else array[rows], copy=True)
+
+    sidecar = {
+        "version": SNAPSHOT_VERSION,
+        "collection_id": collection_id,
+        "count": len(documents),
+        "dimension": collection.dimension,
+        "precision": collection.precision,
+        "ids": [doc.id for doc in documents],
+        "contents": [doc.content for doc in documents],
+        "metadata": [doc.metadata for doc in documents],
+        "created_at": [doc.created_at.isoformat() for doc in documents],
+    }
+    return arrays, sidecar
+
+
+def _write_collection(
+    directory: Path,
+    arrays: Dict[str, np.ndarray],
+    sidecar: Dict[str, Any]
+) -> None:
+    """Write one collection atomically file-by-file (thread side)"""
+    target = directory / _collection_dirname(sidecar["collection_id"])
+    target.mkdir(parents=True, exist_ok=True)
+
+    for filename in (VECTORS_FILE, SCALES_FILE, EXACT_FILE):
+        if filename not in arrays:
+            (target / filename).unlink(missing_ok=True)
+            continue
+        tmp = target / (filename + ".tmp")
+        with open(tmp, "wb") as fp:
+            np.save(fp, arrays[filename])
+        os.replace(tmp, target / filename)
+
+    documents_tmp = target / (DOCUMENTS_FILE + ".tmp")
+    with open(documents_tmp, "w", encoding="utf-8") as fp:
+        json.dump(sidecar, fp, separators=(",", ":"), default=str)
+    os.replace(documents_tmp, target / DOCUMENTS_FILE)
+
+
+def _remove_collection(directory: Path, collection_id: str) -> None:
+    shutil.rmtree(directory / _collection_dirname(collection_id), ignore_errors=True)
+
+
+def _collect_changes(
+    store: VectorStore,
+    dirty: Set[str],
+    dropped: Set[str]
+) -> Tuple[List[Tuple[Dict[str, np.ndarray], Dict[str, Any]]], Set[str]]:
+    """Capture changed collections; returns (captured, ids to remove)"""
+    captured = []
+    removed = set(dropped)
+    for collection_id in dirty:
+        # Spilled collections are read from their spill files
+        collection = store.peek_collection(collection_id)
+        if collection is None or collection.count == 0:
+            removed.add(collection_id)
+        else:
+            captured.append(_capture(collection_id, collection))
+    return captured, removed
+
+
+def write_snapshot(store: VectorStore, directory: Path, full: bool = False) -> int:
+    """
+    Synchronously snapshot changed collections (or all, if `full`)
+
+    Returns:
+        Number of collections written
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    dirty, dropped = store.take_changes()
+    if full:
+        dirty |= set(store.collections)
+
+    captured, removed = _collect_changes(store, dirty, dropped)
+    for collection_id in removed:
+        _remove_collection(directory, collection_id)
+    for arrays, sidecar in captured:
+        _write_collection(directory, arrays, sidecar)
+    return len(captured)
+
+
+def restore_snapshot(store: VectorStore, directory: Path) -> int:
+    """
+    Load every snapshotted collection into `store` as memory-mapped matrices
+
+    Collections already present in the store are left untouched.
+
+    Returns:
+        Number of collections restored
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return 0
+
+    restored = 0
+    for entry in sorted(directory.iterdir()):
+        sidecar = _read_sidecar(entry)
+        if sidecar is None or sidecar["collection_id"] in store.collections:
+            continue
+        collection = _load_entry(entry, sidecar)
+        if collection is not None:
+            store.collections[sidecar["collection_id"]] = collection
+            restored += 1
+
+    if restored:
+        logger.info(f"Restored {restored} vector collections from {directory}")
+    return restored
+
+
+def save_collection(directory: Path, collection_id: str, collection: VectorCollection) -> None:
+    """Write a single collection in snapshot format (used to spill evictions)"""
+    arrays, sidecar = _capture(collection_id, collection)
+    _write_collection(Path(directory), arrays, sidecar)
+
+
+def load_collection(directory: Path, collection_id: str) -> Optional[VectorCollection]:
+    """Load a single collection written by `save_collection`/`write_snapshot`"""
+    entry = Path(directory) / _collection_dirname(collection_id)
+    sidecar = _read_sidecar(entry)
+    if sidecar is None or sidecar["collection_id"] != collection_id:
+        return None
+    return _load_entry(entry, sidecar)
+
+
+def remove_collection(directory: Path, collection_id: str) -> None:
+    """Delete a collection's files, if any"""
+    _remove_collection(Path(directory), collection_id)
+
+
+def _read_sidecar(entry: Path) -> Optional[Dict[str, Any]]:
+    documents_path = entry / DOCUMENTS_FILE
+    if not (documents_path.is_file() and (entry / VECTORS_FILE).is_file()):
+        return None
+    try:
+        with open(documents_path, encoding="utf-8") as fp:
+            return json.load(fp)
+    except Exception as e:
+        logger.warning(f"Skipping unreadable vector snapshot {entry.name}: {e}")
+        return None
+
+
+def _load_entry(entry: Path, sidecar: Dict[str, Any]) -> Optional[VectorCollection]:
+    """Memory-map one snapshot directory back into a collection"""
+    try:
+        vectors = np.load(entry / VECTORS_FILE, mmap_mode="r")
+        scales = _load_optional(entry / SCALES_FILE)
+        exact = _load_optional(entry / EXACT_FILE)
+        count = sidecar["count"]
+        if (
+            vectors.ndim != 2
+            or vectors.shape[0] != count
+            or (scales is not None and scales.shape[0] != count)
+            or (exact is not None and exact.shape[0] != count)
+        ):
+            logger.warning(f"Skipping inconsistent vector snapshot {entry.name}")
+            return None
+
+        documents = [
+            VectorDocument(
+                id=doc_id,
+                content=content,
+                embedding=None,
+                metadata=metadata,
+                created_at=datetime.fromisoformat(created_at)
+            )
+            for doc_id, content, metadata, created_at in zip(
+                sidecar["ids"],
+                sidecar["contents"],
+                sidecar["metadata"],
+                sidecar["created_at"],
+            )
+        ]
+        return VectorCollection.from_snapshot(
+            documents,
+            vectors,
+            precision=sidecar.get("precision", "float32"),
+            scales=scales,
+            exact=exact
+        )
+    except Exception as e:
+        logger.warning(f"Skipping unreadable vector snapshot {entry.name}: {e}")
+        return None
+
+
+def _load_optional(path: Path) -> Optional[np.ndarray]:
+    return np.load(path, mmap_mode="r") if path.is_file() else None
+
+
+class VectorSnapshotter:
+    """
+    Periodically snapshots a VectorStore in the background
+
+    Usage (FastAPI lifespan):
+        snapshotter = VectorSnapshotter(get_vector_store(), "data/vector_snapshots")
+        snapshotter.restore()
+        snapshotter.start()
+        ...
+        await snapshotter.stop()  # final snapshot on shutdown
+    """
+
+    def __init__(self, store: VectorStore, directory: str, interval_seconds: float = 300):
+        self.store = store
+        self.directory = Path(directory)
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self.snapshots_written = 0
+        self.last_snapshot_at: Optional[datetime] = None
+
+    def restore(self) -> int:
+        return restore_snapshot(self.store, self.directory)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background loop and write a final snapshot"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.snapshot()
+
+    async def snapshot(self) -> int:
+        """Snapshot changed collections, doing file I/O off the event loop"""
+        dirty, dropped = self.store.take_changes()
+        captured, removed = _collect_changes(self.store, dirty, dropped)
+
+        if not captured and not removed:
+            return 0
+
+        def _write():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for collection_id in removed:
+                _remove_collection(self.directory, collection_id)
+            for arrays, sidecar in captured:
+                _write_collection(self.directory, arrays, sidecar)
+
+        try:
+            await asyncio.to_thread(_write)
+        except Exception as e:
+            logger.warning(f"Vector snapshot failed: {e}")
+            self.store.restore_changes(dirty, dropped | removed)
+            return 0
+
+        self.snapshots_written += len(captured)
+        self.last_snapshot_at = datetime.utcnow()
+        return len(captured)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.snapshot()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "directory": str(self.directory),
+            "interval_seconds": self.interval_seconds,
+            "collections_written": self.snapshots_written,
+            "last_snapshot_at": (
+                self.last_snapshot_at.isoformat() if self.last_snapshot_at else None
+            ),
+        }
@@ -7,23 +7,502 @@ Features:
 - Collection-based organization (per user/session)
 - Metadata filtering support
 - Top-k similarity search
+- One pre-normalized matrix per collection: a search is one matrix product
+- Inverted metadata index for filters
+- O(1) lookup, delete and upsert by document id
+- Snapshots restored as memory maps (see vector_snapshot.py)
+- float16 / int8 storage with optional exact re-ranking
+- IVF-flat index for large collections (see ivf_index.py)
+- LRU eviction of whole collections under a memory budget
 """
 
 import numpy as np
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from typing import List, Dict, Optional, Any, Set, Tuple
+from dataclasses import InitVar, dataclass, field
 from datetime import datetime
+import logging
+import time
 import uuid
+import weakref
+
+from .ivf_index import IVFIndex
+from app.services.request_timing import STAGE_VECTOR_SEARCH, timed
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class VectorDocument:
-    """A document with its embedding and metadata"""
+    """
+    A document with its embedding and metadata
+    
+    Once stored, `embedding` is read from the collection's row on access
+    (normalized, see VectorStore.get_embedding) instead of being kept as a
+    list. The document holds only a weak reference to that collection, so
+    it is None once the document is replaced or deleted or the collection
+    is gone.
+    """
     id: str
     content: str
-    embedding: List[float]
+    embedding: InitVar[Optional[List[float]]]
     metadata: Dict[str, Any] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.utcnow)
+    
+    def __post_init__(self, embedding: Optional[List[float]]):
+        # Omitted, the InitVar default is the property defined below
+        self._embedding = None if isinstance(embedding, property) else embedding
+        self._owner: Optional["weakref.ReferenceType[VectorCollection]"] = None
+    
+    @property
+    def embedding(self) -> Optional[List[float]]:
+        collection = self._owner() if self._owner is not None else None
+        if self._embedding is None and collection is not None:
+            row = collection._id_to_row.get(self.id)
+            if row is not None and collection.documents[row] is self:
+                return collection.embedding(row).tolist()
+        return self._embedding
+    
+    @embedding.setter
+    def embedding(self, value: Optional[List[float]]) -> None:
+        self._embedding = value
+
+
+class VectorCollection:
+    """
+    Storage for a single collection
+    
+    Documents are kept in insertion order alongside a contiguous float32
+    matrix whose rows are the L2-normalized embeddings (zero vectors stay
+    zero). The matrix is over-allocated and doubled when full, so appends
+    are amortized O(dim) and `vectors` is always a view, never a copy.
+    
+    Deleted or replaced documents are tombstoned (row marked dead, slot set
+    to None) and physically dropped by `compact()` once enough accumulate.
+    
+    Storage precision:
+    - "float32": exact (4 bytes/dim)
+    - "float16": half precision (2 bytes/dim), ~1e-3 score error
+    - "int8": symmetric scalar quantization with a float32 scale per row
+      (1 byte/dim), ~1e-2 score error
+    With `rerank=True` a quantized collection also keeps the float32 rows;
+    the quantized matrix picks `RERANK_FACTOR * k` candidates and only those
+    are rescored exactly. Restored from a snapshot, that float32 copy stays
+    memory-mapped on disk, so only the candidates' pages are read.
+    """
+    
+    PRECISIONS = ("float32", "float16", "int8")
+    RERANK_FACTOR = 4
+    
+    # Rows dequantized per block when scoring a quantized matrix
+    _SCORE_BLOCK = 4096
+    _MIN_CAPACITY = 16
+    
+    # Compact once tombstones reach this count AND this fraction of rows
+    COMPACT_MIN_TOMBSTONES = 16
+    COMPACT_TOMBSTONE_RATIO = 0.25
+    
+    def __init__(self, precision: str = "float32", rerank: bool = False):
+        if precision not in self.PRECISIONS:
+            raise ValueError(
+                f"Unknown vector precision {precision!r}, "
+                f"expected one of {self.PRECISIONS}"
+            )
+        self.precision = precision
+        self.rerank = rerank and precision != "float32"
+        
+        self.documents: List[Optional[VectorDocument]] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None  # int8 only
+        self._exact: Optional[np.ndarray] = None  # float32 rows, rerank only
+        self._alive: np.ndarray = np.zeros(0, dtype=bool)
+        self.size = 0  # Rows used, including tombstones
+        self.deleted = 0  # Tombstoned rows not yet compacted
+        self._content_bytes = 0  # Approximate size of live document text
+        self.last_access = time.time()
+        
+        # Document id -> row
+        self._id_to_row: Dict[str, int] = {}
+        
+        # Inverted metadata index: key -> value -> row ids (ascending)
+        self._postings: Dict[str, Dict[Any, List[int]]] = {}
+        # Keys holding unhashable values; filters on these fall back to a scan
+        self._unindexed_keys: Set[str] = set()
+        
+        # Approximate index, built on demand by `ann_index`
+        self._ann: Optional[IVFIndex] = None
+    
+    @classmethod
+    def from_snapshot(
+        cls,
+        documents: List[VectorDocument],
+        vectors: np.ndarray,
+        precision: str = "float32",
+        scales: Optional[np.ndarray] = None,
+        exact: Optional[np.ndarray] = None
+    ) -> "VectorCollection":
+        """
+        Rebuild a collection around already-normalized (and encoded) rows
+        
+        Arrays are used as-is (typically read-only np.memmaps), so no
+        embedding data is read until a search touches it.
+        """
+        collection = cls(precision=precision, rerank=exact is not None)
+        collection._matrix = vectors
+        collection._scales = scales
+        collection._exact = exact
+        collection._alive = np.ones(len(documents), dtype=bool)
+        collection.documents = list(documents)
+        collection.size = len(documents)
+        collection._content_bytes = sum(len(doc.content) for doc in documents)
+        for row, document in enumerate(collection.documents):
+            collection._id_to_row[document.id] = row
+            collection._index_metadata(row, document.metadata)
+            document._owner = weakref.ref(collection)
+        return collection
+    
+    @property
+    def dimension(self) -> Optional[int]:
+        return None if self._matrix is None else self._matrix.shape[1]
+    
+    @property
+    def count(self) -> int:
+        """Number of live documents"""
+        return self.size - self.deleted
+    
+    @property
+    def vectors(self) -> np.ndarray:
+        """Stored (encoded) rows, including tombstoned rows (view)"""
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._matrix[:self.size]
+    
+    @property
+    def scales(self) -> Optional[np.ndarray]:
+        """Per-row int8 scales (view), None for float collections"""
+        return None if self._scales is None else self._scales[:self.size]
+    
+    @property
+    def exact_vectors(self) -> Optional[np.ndarray]:
+        """float32 rows kept for re-ranking (view), if enabled"""
+        return None if self._exact is None else self._exact[:self.size]
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the embedding arrays (including spare capacity)"""
+        return sum(
+            a.nbytes for a in (self._matrix, self._scales, self._exact)
+            if a is not None
+        )
+    
+    @property
+    def resident_bytes(self) -> int:
+        """Approximate RAM held: in-memory arrays plus document text"""
+        return self._content_bytes + sum(
+            a.nbytes for a in (self._matrix, self._scales, self._exact)
+            if a is not None and not isinstance(a, np.memmap)
+        )
+    
+    def embedding(self, row: int) -> np.ndarray:
+        """Normalized float32 embedding of a row (dequantized if needed)"""
+        if self._exact is not None:
+            return np.array(self._exact[row], dtype=np.float32)
+        vector = np.array(self._matrix[row], dtype=np.float32)
+        if self._scales is not None:
+            vector = vector * self._scales[row]
+        return vector
+    
+    def dense_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Normalized float32 embeddings of several rows (dequantized if needed)"""
+        if self._exact is not None:
+            return np.array(self._exact[rows], dtype=np.float32)
+        dense = np.array(self._matrix[rows], dtype=np.float32)
+        if self._scales is not None:
+            dense *= self._scales[rows][:, None]
+        return dense
+    
+    def ann_index(self, min_rows: int) -> Optional[IVFIndex]:
+        """
+        The collection's IVF index, or None when it should be searched exactly
+        
+        Built once the collection reaches `min_rows` live rows and rebuilt
+        after it has doubled (centroids drift as rows are appended).
+        """
+        if self.count < min_rows:
+            return None
+        if self._ann is None or self.count >= 2 * self._ann.built_size:
+            self._ann = IVFIndex.build(self)
+        return self._ann
+    
+    def scores(self, query_vec: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Cosine similarity of normalized queries against rows (all if None)
+        
+        `query_vec` is one query of shape (dim,) -> scores (rows,), or
+        several stacked as columns (dim, m) -> scores (rows, m).
+        Quantized matrices are dequantized in blocks so the float32
+        temporary never exceeds `_SCORE_BLOCK` rows.
+        """
+        matrix = self.vectors if rows is None else self._matrix[rows]
+        if self.precision == "float32":
+            return matrix @ query_vec
+        
+        scores = np.empty((matrix.shape[0],) + query_vec.shape[1:], dtype=np.float32)
+        for start in range(0, matrix.shape[0], self._SCORE_BLOCK):
+            block = matrix[start:start + self._SCORE_BLOCK]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query_vec
+        if self._scales is not None:
+            scales = self.scales if rows is None else self._scales[rows]
+            scores *= scales if scores.ndim == 1 else scales[:, None]
+        return scores
+    
+    def exact_scores(self, query_vec: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """float32 similarity for a few candidate rows (rerank only)"""
+        return self._exact[rows] @ query_vec
+    
+    def live_rows(self) -> Optional[np.ndarray]:
+        """Row ids of live documents, or None when every row is live"""
+        if self.deleted == 0:
+            return None
+        return np.flatnonzero(self._alive[:self.size])
+    
+    def live_documents(self) -> List[VectorDocument]:
+        """Live documents in insertion order"""
+        if self.deleted == 0:
+            return self.documents
+        return [doc for doc in self.documents if doc is not None]
+    
+    def get(self, document_id: str) -> Optional[VectorDocument]:
+        """O(1) lookup by document id"""
+        row = self._id_to_row.get(document_id)
+        return None if row is None else self.documents[row]
+    
+    def append(self, documents: List[VectorDocument], embeddings: np.ndarray) -> None:
+        """
+        Append documents with their (unnormalized) embedding rows
+        
+        A document whose id already exists replaces it: the old row is
+        tombstoned and the id is pointed at the new row.
+        """
+        if len(documents) == 0:
+            return
+        
+        rows = _normalize_rows(embeddings)
+        self._reserve(self.size + len(rows), rows.shape[1])
+        
+        start = self.size
+        end = start + len(rows)
+        if self.precision == "int8":
+            self._matrix[start:end], self._scales[start:end] = _quantize_int8(rows)
+        else:
+            self._matrix[start:end] = rows
+        if self._exact is not None:
+            self._exact[start:end] = rows
+        self._alive[start:start + len(rows)] = True
+        self.documents.extend(documents)
+        self._content_bytes += sum(len(doc.content) for doc in documents)
+        self.size += len(rows)
+        if self._ann is not None:
+            self._ann.add(self, start, end)
+        
+        for offset, document in enumerate(documents):
+            row = start + offset
+            previous = self._id_to_row.get(document.id)
+            if previous is not None:
+                self._tombstone(previous)
+            self._id_to_row[document.id] = row
+            self._index_metadata(row, document.metadata)
+            document._owner = weakref.ref(self)
+    
+    def remove(self, document_id: str) -> bool:
+        """Tombstone a document by id"""
+        row = self._id_to_row.pop(document_id, None)
+        if row is None:
+            return False
+        self._tombstone(row)
+        return True
+    
+    def _tombstone(self, row: int) -> None:
+        if self._alive[row]:
+            self._alive[row] = False
+            self._content_bytes -= len(self.documents[row].content)
+            self.documents[row] = None
+            self.deleted += 1
+    
+    def needs_compaction(self) -> bool:
+        return (
+            self.deleted >= self.COMPACT_MIN_TOMBSTONES
+            and self.deleted >= self.size * self.COMPACT_TOMBSTONE_RATIO
+        )
+    
+    def compact(self) -> None:
+        """Drop tombstoned rows and rebuild the id and metadata indexes"""
+        if self.deleted == 0:
+            return
+        
+        keep = np.flatnonzero(self._alive[:self.size])
+        documents = [self.documents[row] for row in keep]
+        
+        capacity = max(self._MIN_CAPACITY, len(keep))
+        self._allocate(capacity, self._matrix.shape[1], keep)
+        self._ann = None  # Row ids changed
+        self.documents = documents
+        self.size = len(keep)
+        self.deleted = 0
+        
+        self._id_to_row = {}
+        self._postings = {}
+        self._unindexed_keys = set()
+        for row, document in enumerate(documents):
+            self._id_to_row[document.id] = row
+            self._index_metadata(row, document.metadata)
+    
+    def _index_metadata(self, row: int, metadata: Dict[str, Any]) -> None:
+        """Add a row to the postings of each of its metadata values"""
+        for key, value in metadata.items():
+            try:
+                self._postings.setdefault(key, {}).setdefault(value, []).append(row)
+            except TypeError:
+                self._unindexed_keys.add(key)
+    
+    def filter_rows(self, filter_dict: Dict[str, Any]) -> np.ndarray:
+        """
+        Resolve a metadata filter to the ascending live row ids that match it
+        
+        Conditions on different keys are intersected; a list value matches
+        any of its elements, so it resolves to the union of their postings.
+        Postings may still reference tombstoned rows, so the result is also
+        masked by liveness.
+        """
+        mask = self._alive[:self.size].copy()
+        
+        for key, value in filter_dict.items():
+            if key in self._unindexed_keys or not _is_hashable(value):
+                mask &= self._scan_mask(key, value)
+                continue
+            
+            values = value if isinstance(value, list) else [value]
+            postings = self._postings.get(key, {})
+            key_mask = np.zeros(self.size, dtype=bool)
+            for v in values:
+                try:
+                    rows = postings.get(v)
+                except TypeError:
+                    rows = None
+                if rows:
+                    key_mask[rows] = True
+            mask &= key_mask
+        
+        return np.flatnonzero(mask)
+    
+    def _scan_mask(self, key: str, value: Any) -> np.ndarray:
+        """Per-document fallback for keys the index cannot answer"""
+        return np.fromiter(
+            (
+                doc is not None
+                and VectorStore._matches_filter(doc.metadata, {key: value})
+                for doc in self.documents
+            ),
+            dtype=bool,
+            count=self.size
+        )
+    
+    def _reserve(self, needed: int, dimension: int) -> None:
+        """Ensure capacity for `needed` rows, doubling the allocation"""
+        if self._matrix is None:
+            self._allocate(max(self._MIN_CAPACITY, needed), dimension)
+            return
+        
+        if dimension != self._matrix.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {dimension} does not match "
+                f"collection dimension {self._matrix.shape[1]}"
+            )
+        
+        capacity = self._matrix.shape[0]
+        if needed <= capacity and self._matrix.flags.writeable:
+            return
+        
+        # Grow (or copy a read-only snapshot map into memory before writing)
+        capacity = max(capacity, self._MIN_CAPACITY)
+        while capacity < needed:
+            capacity *= 2
+        self._allocate(capacity, dimension, np.arange(self.size))
+    
+    def _allocate(
+        self,
+        capacity: int,
+        dimension: int,
+        keep: Optional[np.ndarray] = None
+    ) -> None:
+        """Replace the row arrays with fresh ones, copying `keep` rows first"""
+        matrix = np.zeros((capacity, dimension), dtype=np.dtype(self.precision))
+        scales = np.zeros(capacity, dtype=np.float32) if self.precision == "int8" else None
+        exact = np.zeros((capacity, dimension), dtype=np.float32) if self.rerank else None
+        alive = np.zeros(capacity, dtype=bool)
+        
+        if keep is not None and len(keep):
+            n = len(keep)
+            matrix[:n] = self._matrix[keep]
+            if scales is not None:
+                scales[:n] = self._scales[keep]
+            if exact is not None:
+                exact[:n] = self._exact[keep]
+            alive[:n] = self._alive[keep]
+        
+        self._matrix = matrix
+        self._scales = scales
+        self._exact = exact
+        self._alive = alive
+
+
+def _is_hashable(value: Any) -> bool:
+    """Whether a filter value (or every element of a list value) is hashable"""
+    items = value if isinstance(value, list) else [value]
+    try:
+        for item in items:
+            hash(item)
+    except TypeError:
+        return False
+    return True
+
+
+def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize rows as float32, leaving zero vectors at zero"""
+    rows = np.atleast_2d(np.array(embeddings, dtype=np.float32))
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    np.divide(rows, norms, out=rows, where=norms > 0)
+    return rows
+
+
+def _quantize_int8(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization: row ~= q * scale"""
+    scales = np.abs(rows).max(axis=1) / 127.0
+    safe = np.where(scales > 0, scales, 1.0)
+    quantized = np.rint(rows / safe[:, None]).clip(-127, 127).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first
+
+    Uses argpartition so only the selected candidates are sorted. Equal
+    scores keep index order, matching the stable sort of the original loop:
+    every row tied with the k-th score stays a candidate, since argpartition
+    picks arbitrarily among them.
+    """
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.intp)
+
+    if k < scores.size:
+        kth = np.argpartition(-scores, k - 1)[k - 1]
+        candidates = np.flatnonzero(scores >= scores[kth])
+    else:
+        candidates = np.arange(scores.size)
+
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:k]]
 
 
 @dataclass
@@ -42,48 +521,214 @@ class VectorStore:
         store = VectorStore()
         store.add_documents("user_123", documents)
         results = store.search("user_123", query_embedding, k=5)
+    
+    `precision` and `rerank` are the defaults for new collections (see
+    VectorCollection). Collections with at least `ann_min_rows` live rows
+    are searched through an IVF index probing `ann_nprobe` clusters
+    (higher = better recall, slower); `search(..., exact=True)` bypasses it.
+    
+    With `memory_budget_bytes`, writes that push resident bytes over the
+    budget evict least-recently-used collections (searches and reads count
+    as use). Evicted collections are written to `spill_dir` if set and
+    transparently memory-mapped back on next access; otherwise they are
+    dropped and must be rebuilt (as after a restart), and the next snapshot
+    removes them if they had changes it had not captured yet.
     """
     
-    def __init__(self):
-        # Collections organized by collection_id (e.g., user_id, session_id)
-        self.collections: Dict[str, List[VectorDocument]] = {}
+    ANN_MIN_ROWS = 2048
+    ANN_NPROBE = 8
     
-    def create_collection(self, collection_id: str) -> None:
+    def __init__(
+        self,
+        precision: str = "float32",
+        rerank: bool = False,
+        ann_min_rows: int = ANN_MIN_ROWS,
+        ann_nprobe: int = ANN_NPROBE,
+        memory_budget_bytes: Optional[int] = None,
+        spill_dir: Optional[str] = None
+    ):
+        if precision not in VectorCollection.PRECISIONS:
+            raise ValueError(
+                f"Unknown vector precision {precision!r}, "
+                f"expected one of {VectorCollection.PRECISIONS}"
+            )
+        self.precision = precision
+        self.rerank = rerank
+        self.ann_min_rows = ann_min_rows
+        self.ann_nprobe = ann_nprobe
+        
+        self.memory_budget_bytes = memory_budget_bytes or None
+        self.spill_dir = spill_dir
+        
+        # Collections organized by collection_id (e.g., user_id, session_id),
+        # least recently used first
+        self.collections: Dict[str, VectorCollection] = OrderedDict()
+        
+        # Changes since the last snapshot (see vector_snapshot.py)
+        self._dirty: Set[str] = set()
+        self._dropped: Set[str] = set()
+        
+        # Eviction state and counters
+        self._spilled: Set[str] = set()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._reloads = 0
+    
+    def create_collection(
+        self,
+        collection_id: str,
+        precision: Optional[str] = None,
+        rerank: Optional[bool] = None
+    ) -> None:
         """Create a new collection if it doesn't exist"""
-        if collection_id not in self.collections:
-            self.collections[collection_id] = []
+        if self._resident(collection_id) is None:
+            self.collections[collection_id] = VectorCollection(
+                precision=precision or self.precision,
+                rerank=self.rerank if rerank is None else rerank
+            )
     
     def delete_collection(self, collection_id: str) -> bool:
         """Delete a collection and all its documents"""
-        if collection_id in self.collections:
-            del self.collections[collection_id]
+        spilled = collection_id in self._spilled
+        if spilled:
+            self._spilled.discard(collection_id)
+            from .vector_snapshot import remove_collection
+            remove_collection(self.spill_dir, collection_id)
+        
+        if collection_id in self.collections or spilled:
+            self.collections.pop(collection_id, None)
+            self._dirty.discard(collection_id)
+            self._dropped.add(collection_id)
             return True
         return False
     
+    def _resident(self, collection_id: str) -> Optional[VectorCollection]:
+        """
+        Look up a collection, reloading it if spilled, and mark it used
+        
+        Every store operation goes through here, so the OrderedDict order
+        is the LRU order used for eviction.
+        """
+        collection = self.collections.get(collection_id)
+        if collection is not None:
+            self._hits += 1
+        else:
+            self._misses += 1
+            if collection_id not in self._spilled:
+                return None
+            collection = self._reload(collection_id)
+            if collection is None:
+                return None
+        
+        self.collections.move_to_end(collection_id)
+        collection.last_access = time.time()
+        return collection
+    
+    def _reload(self, collection_id: str) -> Optional[VectorCollection]:
+        """Memory-map a spilled collection back into the store"""
+        from .vector_snapshot import load_collection
+        
+        self._spilled.discard(collection_id)
+        collection = load_collection(self.spill_dir, collection_id)
+        if collection is None:
+            logger.warning(f"Spilled vector collection {collection_id} could not be reloaded")
+            return None
+        self.collections[collection_id] = collection
+        self._reloads += 1
+        return collection
+    
+    def _enforce_budget(self, keep: str) -> None:
+        """Evict least-recently-used collections until under the budget"""
+        if self.memory_budget_bytes is None:
+            return
+        
+        resident = self.resident_bytes
+        for collection_id in list(self.collections):
+            if resident <= self.memory_budget_bytes:
+                break
+            if collection_id == keep:
+                continue
+            resident -= self.collections[collection_id].resident_bytes
+            self._evict(collection_id)
+    
+    def _evict(self, collection_id: str) -> None:
+        collection = self.collections.pop(collection_id)
+        self._evictions += 1
+        if self.spill_dir and collection.count > 0:
+            from .vector_snapshot import save_collection
+            try:
+                save_collection(self.spill_dir, collection_id, collection)
+                self._spilled.add(collection_id)
+                return
+            except Exception as e:
+                logger.warning(f"Failed to spill vector collection {collection_id}: {e}")
+        
+        # Dropped with unsnapshotted changes: its last snapshot is stale
+        if collection_id in self._dirty:
+            self._dirty.discard(collection_id)
+            self._dropped.add(collection_id)
+    
+    def peek_collection(self, collection_id: str) -> Optional[VectorCollection]:
+        """A resident or spilled collection, without reloading it or marking it used"""
+        collection = self.collections.get(collection_id)
+        if collection is None and collection_id in self._spilled:
+            from .vector_snapshot import load_collection
+            collection = load_collection(self.spill_dir, collection_id)
+        return collection
+    
+    @property
+    def resident_bytes(self) -> int:
+        """Approximate RAM held by all resident collections"""
+        return sum(c.resident_bytes for c in self.collections.values())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Memory and eviction statistics"""
+        lookups = self._hits + self._misses
+        return {
+            "collections_resident": len(self.collections),
+            "collections_spilled": len(self._spilled),
+            "bytes_resident": self.resident_bytes,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "evictions": self._evictions,
+            "reloads": self._reloads,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else None,
+        }
+    
     def add_document(
         self,
         collection_id: str,
         content: str,
         embedding: List[float],
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        document_id: Optional[str] = None
     ) -> str:
         """
         Add a single document to a collection
         
+        If `document_id` already exists in the collection, the existing
+        document is replaced (see `upsert_document`).
+        
         Returns:
             Document ID
         """
         self.create_collection(collection_id)
         
-        doc_id = str(uuid.uuid4())
+        doc_id = document_id or str(uuid.uuid4())
         document = VectorDocument(
             id=doc_id,
             content=content,
-            embedding=embedding,
+            embedding=None,
             metadata=metadata or {}
         )
         
-        self.collections[collection_id].append(document)
+        collection = self.collections[collection_id]
+        collection.append([document], np.asarray([embedding], dtype=np.float32))
+        self._maybe_compact(collection)
+        self._mark_dirty(collection_id)
+        self._enforce_budget(keep=collection_id)
         return doc_id
     
     def add_documents(
@@ -96,31 +741,105 @@ class VectorStore:
         
         Args:
             collection_id: Collection identifier
-            documents: List of dicts with 'content', 'embedding', and optional 'metadata'
+            documents: List of dicts with 'content', 'embedding', and optional
+                'metadata' and 'id' (an existing id is replaced)
             
         Returns:
             List of document IDs
         """
         self.create_collection(collection_id)
         
-        doc_ids = []
-        for doc in documents:
-            doc_id = self.add_document(
-                collection_id=collection_id,
+        if not documents:
+            return []
+        
+        new_docs = [
+            VectorDocument(
+                id=doc.get("id") or str(uuid.uuid4()),
                 content=doc["content"],
-                embedding=doc["embedding"],
-                metadata=doc.get("metadata", {})
+                embedding=None,
+                metadata=doc.get("metadata", {}) or {}
             )
-            doc_ids.append(doc_id)
+            for doc in documents
+        ]
+        
+        # One copy into the collection matrix for the whole batch
+        embeddings = np.asarray(
+            [doc["embedding"] for doc in documents], dtype=np.float32
+        )
+        collection = self.collections[collection_id]
+        collection.append(new_docs, embeddings)
+        self._maybe_compact(collection)
+        self._mark_dirty(collection_id)
+        self._enforce_budget(keep=collection_id)
+        
+        return [doc.id for doc in new_docs]
+    
+    def upsert_document(
+        self,
+        collection_id: str,
+        document_id: str,
+        content: str,
+        embedding: List[float],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Insert a document, or replace the document with the same ID
+        
+        Returns:
+            Document ID
+        """
+        return self.add_document(
+            collection_id=collection_id,
+            content=content,
+            embedding=embedding,
+            metadata=metadata,
+            document_id=document_id
+        )
+    
+    def delete_document(self, collection_id: str, document_id: str) -> bool:
+        """Delete a single document by ID"""
+        collection = self._resident(collection_id)
+        if collection is None or not collection.remove(document_id):
+            return False
+        self._maybe_compact(collection)
+        self._mark_dirty(collection_id)
+        return True
+    
+    def _mark_dirty(self, collection_id: str) -> None:
+        self._dirty.add(collection_id)
+        self._dropped.discard(collection_id)
+    
+    def take_changes(self) -> Tuple[Set[str], Set[str]]:
+        """
+        Return and reset (dirty, dropped) collection ids since the last call
         
-        return doc_ids
+        Used by the snapshotter; callers that fail to persist the changes
+        should hand them back with `restore_changes`.
+        """
+        dirty, dropped = self._dirty, self._dropped
+        self._dirty, self._dropped = set(), set()
+        return dirty, dropped
+    
+    def restore_changes(self, dirty: Set[str], dropped: Set[str]) -> None:
+        """Re-queue changes that could not be persisted"""
+        known = set(self.collections) | self._spilled
+        self._dirty |= {cid for cid in dirty if cid in known}
+        self._dropped |= {cid for cid in dropped if cid not in known}
     
+    def _maybe_compact(self, collection: VectorCollection) -> None:
+        """Compact a collection once its tombstones cross the threshold"""
+        if collection.needs_compaction():
+            collection.compact()
+    
+    @timed(STAGE_VECTOR_SEARCH)
     def search(
         self,
         collection_id: str,
         query_embedding: List[float],
         k: int = 5,
-        metadata_filter: Optional[Dict[str, Any]] = None
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+        exact: bool = False
     ) -> List[SearchResult]:
         """
         Search for similar documents using cosine similarity
@@ -130,44 +849,147 @@ class VectorStore:
             query_embedding: Query vector
             k: Number of results to return
             metadata_filter: Optional filter on metadata fields
+            nprobe: IVF clusters to probe (defaults to `ann_nprobe`)
+            exact: Score every row even if the collection has an IVF index
             
         Returns:
             List of SearchResult objects, sorted by similarity (highest first)
         """
-        if collection_id not in self.collections:
+        collection = self._resident(collection_id)
+        if collection is None or collection.count == 0:
             return []
         
-        documents = self.collections[collection_id]
-        
-        # Apply metadata filter if provided
+        # Apply metadata filter if provided (otherwise just skip tombstones)
         if metadata_filter:
-            documents = [
-                doc for doc in documents
-                if self._matches_filter(doc.metadata, metadata_filter)
+            rows = collection.filter_rows(metadata_filter)
+        else:
+            rows = collection.live_rows()
+        if rows is not None and rows.size == 0:
+            return []
+        
+        query_vec = self._query_matrix(collection, query_embedding)[0]
+        
+        eligible = collection.count if rows is None else rows.size
+        if not exact and eligible >= self.ann_min_rows:
+            index = collection.ann_index(self.ann_min_rows)
+            if index is not None:
+                candidates = index.candidates(query_vec, nprobe or self.ann_nprobe)
+                if rows is None:
+                    candidates = candidates[collection._alive[candidates]]
+                else:
+                    candidates = np.intersect1d(candidates, rows, assume_unique=True)
+                # Too few candidates in the probed clusters: stay exact
+                if candidates.size >= k:
+                    rows = candidates
+        
+        # Single BLAS call for all cosine similarities
+        scores = collection.scores(query_vec, rows)
+        if rows is None:
+            rows = np.arange(scores.size)
+        
+        return self._rank(collection, query_vec, rows, scores, k)
+    
+    @timed(STAGE_VECTOR_SEARCH)
+    def search_many(
+        self,
+        collection_id: str,
+        query_embeddings: List[List[float]],
+        k: int = 5,
+        metadata_filters: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Search for several queries at once
+        
+        All queries are scored against the collection in one matrix-matrix
+        product; each query's filter then selects its rows from the shared
+        score matrix. Collections large enough for an IVF index are
+        searched per query through `search` instead.
+        
+        Args:
+            collection_id: Collection to search
+            query_embeddings: Query vectors (list of lists or 2-D array)
+            k: Number of results per query
+            metadata_filters: Optional per-query filters (None entries = no filter)
+            
+        Returns:
+            One list of SearchResult objects per query, in query order
+        """
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        n_queries = len(queries) if len(query_embeddings) else 0
+        filters = metadata_filters or [None] * n_queries
+        if len(filters) != n_queries:
+            raise ValueError("metadata_filters must have one entry per query")
+        
+        collection = self._resident(collection_id) if n_queries else None
+        if n_queries == 0 or collection is None or collection.count == 0:
+            return [[] for _ in range(n_queries)]
+        
+        query_matrix = self._query_matrix(collection, queries)
+        if collection.ann_index(self.ann_min_rows) is not None:
+            return [
+                self.search(collection_id, query, k=k, metadata_filter=metadata_filter)
+                for query, metadata_filter in zip(query_matrix, filters)
             ]
         
-        if not documents:
-            return []
+        live = collection.live_rows()
+        if live is None:
+            live = np.arange(collection.size)
         
-        # Convert to numpy for efficient computation
-        query_vec = np.array(query_embedding)
+        # One BLAS call for every (row, query) pair
+        scores = collection.scores(query_matrix.T, None if collection.deleted == 0 else live)
         
-        # Calculate similarities
         results = []
-        for doc in documents:
-            doc_vec = np.array(doc.embedding)
-            similarity = self._cosine_similarity(query_vec, doc_vec)
-            distance = 1 - similarity
-            
+        for j, metadata_filter in enumerate(filters):
+            column = scores[:, j]
+            rows = live
+            if metadata_filter:
+                # Filtered rows are a subset of the (ascending) live rows
+                rows = collection.filter_rows(metadata_filter)
+                column = column[np.searchsorted(live, rows)]
+            if rows.size == 0:
+                results.append([])
+                continue
+            results.append(self._rank(collection, query_matrix[j], rows, column, k))
+        return results
+    
+    @staticmethod
+    def _query_matrix(collection: VectorCollection, queries: Any) -> np.ndarray:
+        """Normalize query rows and check them against the collection dimension"""
+        query_matrix = _normalize_rows(queries)
+        if query_matrix.shape[1] != collection.dimension:
+            raise ValueError(
+                f"Query dimension {query_matrix.shape[1]} does not match "
+                f"collection dimension {collection.dimension}"
+            )
+        return query_matrix
+    
+    @staticmethod
+    def _rank(
+        collection: VectorCollection,
+        query_vec: np.ndarray,
+        rows: np.ndarray,
+        scores: np.ndarray,
+        k: int
+    ) -> List[SearchResult]:
+        """Select the top-k of scored rows (re-ranking exactly if enabled)"""
+        if collection.rerank:
+            # Shortlist on the quantized scores, then rescore exactly
+            shortlist = _top_k(scores, k * collection.RERANK_FACTOR)
+            rows = rows[shortlist]
+            scores = collection.exact_scores(query_vec, rows)
+        top = _top_k(scores, k)
+        
+        results = []
+        for i in top:
+            similarity = float(scores[i])
+            row = int(rows[i])
             results.append(SearchResult(
-                document=doc,
+                document=collection.documents[row],
                 score=similarity,
-                distance=distance
+                distance=1 - similarity
             ))
         
-        # Sort by score (descending) and return top k
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:k]
+        return results
     
     def get_document(
         self,
@@ -175,14 +997,27 @@ class VectorStore:
         document_id: str
     ) -> Optional[VectorDocument]:
         """Get a specific document by ID"""
-        if collection_id not in self.collections:
+        collection = self._resident(collection_id)
+        if collection is None:
             return None
+        return collection.get(document_id)
+    
+    def get_embedding(
+        self,
+        collection_id: str,
+        document_id: str
+    ) -> Optional[np.ndarray]:
+        """
+        Get a document's stored embedding (L2-normalized float32)
         
-        for doc in self.collections[collection_id]:
-            if doc.id == document_id:
-                return doc
-        
-        return None
+        Quantized collections return the dequantized row, or the exact
+        float32 row when re-ranking is enabled.
+        """
+        collection = self._resident(collection_id)
+        if collection is None:
+            return None
+        row = collection._id_to_row.get(document_id)
+        return None if row is None else collection.embedding(row)
     
     def get_all_documents(
         self,
@@ -190,38 +1025,25 @@ class VectorStore:
         metadata_filter: Optional[Dict[str, Any]] = None
     ) -> List[VectorDocument]:
         """Get all documents in a collection, optionally filtered"""
-        if collection_id not in self.collections:
+        collection = self._resident(collection_id)
+        if collection is None:
             return []
         
-        documents = self.collections[collection_id]
-        
         if metadata_filter:
-            documents = [
-                doc for doc in documents
-                if self._matches_filter(doc.metadata, metadata_filter)
+            return [
+                collection.documents[row]
+                for row in collection.filter_rows(metadata_filter)
             ]
         
-        return documents
+        return collection.live_documents()
     
     def count_documents(self, collection_id: str) -> int:
         """Count documents in a collection"""
-        if collection_id not in self.collections:
-            return 0
-        return len(self.collections[collection_id])
-    
-    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors"""
-        # Handle zero vectors
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
-        
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        
-        return float(np.dot(a, b) / (norm_a * norm_b))
+        collection = self._resident(collection_id)
+        return 0 if collection is None else collection.count
     
+    @staticmethod
     def _matches_filter(
-        self,
         metadata: Dict[str, Any],
         filter_dict: Dict[str, Any]
     ) -> bool:
@@ -242,6 +1064,13 @@ class VectorStore:
     
     def clear_all(self) -> None:
         """Clear all collections (use with caution)"""
+        if self.spill_dir:
+            from .vector_snapshot import remove_collection
+            for collection_id in self._spilled:
+                remove_collection(self.spill_dir, collection_id)
+        self._dropped |= set(self.collections) | self._spilled
+        self._dirty.clear()
+        self._spilled.clear()
         self.collections.clear()
 
 
@@ -253,5 +1082,13 @@ def get_vector_store() -> VectorStore:
     """Get the singleton vector store instance"""
     global _vector_store_instance
     if _vector_store_instance is None:
-        _vector_store_instance = VectorStore()
+        from app.config import settings
+        _vector_store_instance = VectorStore(
+            precision=settings.vector_precision,
+            rerank=settings.vector_rerank,
+            ann_min_rows=settings.vector_ann_min_rows,
+            ann_nprobe=settings.vector_ann_nprobe,
+            memory_budget_bytes=settings.vector_memory_budget_mb * 1024 * 1024,
+            spill_dir=settings.vector_spill_dir
+        )
     return _vector_store_instance
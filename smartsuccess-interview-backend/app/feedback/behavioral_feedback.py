@@ -3,11 +3,9 @@ Behavioral Feedback Service
 STAR method evaluation
 """
 
-import os
 from typing import Dict, Any, List, Optional
-from openai import AsyncOpenAI
 
-from app.config import settings
+from app.services.llm_service import PRIORITY_BACKGROUND, get_llm_service
 from app.prompts.behavioral_prompts import BEHAVIORAL_STAR_EVALUATION
 
 
@@ -24,8 +22,7 @@ class BehavioralFeedbackService:
     """
     
     def __init__(self):
-        api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-        self.llm_client = AsyncOpenAI(api_key=api_key) if api_key else None
+        self.llm = get_llm_service()
     
     async def evaluate_response(
         self,
@@ -38,7 +35,7 @@ class BehavioralFeedbackService:
         
         Returns STAR scores, competencies, and feedback
         """
-        if not self.llm_client:
+        if not self.llm.is_available():
             return self._default_evaluation()
         
         try:
@@ -47,15 +44,16 @@ class BehavioralFeedbackService:
                 response=response
             )
             
-            result = await self.llm_client.chat.completions.create(
-                model=settings.llm_model,
-                messages=[{"role": "user", "content": prompt}],
+            # Scoring is not on the live turn: queue behind interactive calls
+            result = await self.llm.generate(
+                prompt=prompt,
                 temperature=0.3,
-                max_tokens=500
+                max_tokens=500,
+                priority=PRIORITY_BACKGROUND
             )
             
             import json
-            content = result.choices[0].message.content.strip()
+            content = result.strip()
             
             # Clean JSON
             if content.startswith("```"):
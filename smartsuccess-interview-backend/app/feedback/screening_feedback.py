@@ -3,11 +3,9 @@ Screening Feedback Service
 First impression evaluation
 """
 
-import os
 from typing import Dict, Any, List, Optional
-from openai import AsyncOpenAI
 
-from app.config import settings
+from app.services.llm_service import PRIORITY_BACKGROUND, get_llm_service
 from app.prompts.screening_prompts import SCREENING_EVALUATION_PROMPT
 
 
@@ -24,8 +22,7 @@ class ScreeningFeedbackService:
     """
     
     def __init__(self):
-        api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-        self.llm_client = AsyncOpenAI(api_key=api_key) if api_key else None
+        self.llm = get_llm_service()
     
     async def evaluate_response(
         self,
@@ -38,7 +35,7 @@ class ScreeningFeedbackService:
         
         Returns scores and feedback on communication and fit
         """
-        if not self.llm_client:
+        if not self.llm.is_available():
             return self._default_evaluation()
         
         criteria = criteria or [
@@ -55,15 +52,16 @@ class ScreeningFeedbackService:
                 response=response
             )
             
-            result = await self.llm_client.chat.completions.create(
-                model=settings.llm_model,
-                messages=[{"role": "user", "content": prompt}],
+            # Scoring is not on the live turn: queue behind interactive calls
+            result = await self.llm.generate(
+                prompt=prompt,
                 temperature=0.3,
-                max_tokens=400
+                max_tokens=400,
+                priority=PRIORITY_BACKGROUND
             )
             
             import json
-            content = result.choices[0].message.content.strip()
+            content = result.strip()
             
             # Clean JSON if wrapped in code blocks
             if content.startswith("```"):
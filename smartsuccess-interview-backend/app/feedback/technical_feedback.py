@@ -3,11 +3,9 @@ Technical Feedback Service
 AI/ML Engineering skills evaluation
 """
 
-import os
 from typing import Dict, Any, List, Optional
-from openai import AsyncOpenAI
 
-from app.config import settings
+from app.services.llm_service import PRIORITY_BACKGROUND, get_llm_service
 from app.prompts.technical_prompts import TECHNICAL_EVALUATION_PROMPT
 
 
@@ -26,8 +24,7 @@ class TechnicalFeedbackService:
     HIRE_SIGNALS = ["strong", "moderate", "weak", "no"]
     
     def __init__(self):
-        api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-        self.llm_client = AsyncOpenAI(api_key=api_key) if api_key else None
+        self.llm = get_llm_service()
     
     async def evaluate_response(
         self,
@@ -41,8 +38,8 @@ class TechnicalFeedbackService:
         
         Returns scores, knowledge gaps, and hire signal
         """
-        if not self.llm_client:
-            return self._default_evaluation(domain)
+        if not self.llm.is_available():
+            return self._default_evaluation()
         
         try:
             prompt = TECHNICAL_EVALUATION_PROMPT.format(
@@ -51,15 +48,16 @@ class TechnicalFeedbackService:
                 response=response
             )
             
-            result = await self.llm_client.chat.completions.create(
-                model=settings.llm_model,
-                messages=[{"role": "user", "content": prompt}],
+            # Scoring is not on the live turn: queue behind interactive calls
+            result = await self.llm.generate(
+                prompt=prompt,
                 temperature=0.3,
-                max_tokens=500
+                max_tokens=500,
+                priority=PRIORITY_BACKGROUND
             )
             
             import json
-            content = result.choices[0].message.content.strip()
+            content = result.strip()
             
             # Clean JSON
             if content.startswith("```"):
@@ -14,8 +14,9 @@ FIXES APPLIED:
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, AsyncIterator, Callable, Awaitable
 from datetime import datetime
+import asyncio
 import uuid
 import logging
 
@@ -51,6 +52,15 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Turns still running after their stream's client disconnected
+_detached_turns: "set[asyncio.Task]" = set()
+
+
+def _finish_detached_turn(task: asyncio.Task) -> None:
+    _detached_turns.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Turn failed after client disconnect: {task.exception()}")
+
 
 class BaseInterviewService(ABC):
     """
@@ -97,32 +107,17 @@ class BaseInterviewService(ABC):
         Includes up to last 3 Q&A pairs for consistency and progression
         assessment. Keeps token cost low (~200-400 extra tokens).
         
-        BUGFIX: Defensive access for sessions loaded from disk as raw dicts
-        via PersistentSessionStore._load_existing().
+        Sessions loaded from disk are InterviewSession models too
+        (session_codec), so fields are accessed directly.
         """
         history_lines = []
         start = max(0, current_index - 3)
-        
-        questions = getattr(session, "questions_asked", []) or []
-        responses = getattr(session, "responses", []) or []
+        questions = session.questions_asked
+        responses = session.responses
         
         for i in range(start, current_index):
-            # Defensive question access
-            q = ""
-            if isinstance(questions, list) and i < len(questions):
-                q = str(questions[i]) if questions[i] else ""
-            
-            # Defensive response access — handle both list[dict] and edge cases
-            r = ""
-            if isinstance(responses, list) and i < len(responses):
-                resp = responses[i]
-                if isinstance(resp, dict):
-                    r = resp.get("response", "")
-                elif isinstance(resp, str):
-                    r = resp
-                else:
-                    r = str(resp) if resp else ""
-            
+            q = questions[i] if i < len(questions) else ""
+            r = responses[i].get("response", "") if i < len(responses) else ""
             if q or r:
                 history_lines.append(f"Q{i+1}: {q}\nA{i+1}: {r}")
         
@@ -218,9 +213,15 @@ class BaseInterviewService(ABC):
     async def process_message(
         self,
         session_id: str,
-        user_message: str
+        user_message: str,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
     ) -> MessageResponse:
-        """Process a user message and return the response"""
+        """
+        Process a user message and return the response
+        
+        `on_delta`, if given, receives text deltas of the next question
+        while it is being generated.
+        """
         session = self.get_session(session_id)
         if not session:
             return MessageResponse(
@@ -255,12 +256,16 @@ class BaseInterviewService(ABC):
         if session.phase == InterviewPhase.GREETING:
             session.phase = InterviewPhase.IN_PROGRESS
             session.started_at = datetime.utcnow()
-            result = await self._handle_first_response(session, user_message)
+            result = await self._handle_first_response(
+                session, user_message, on_delta
+            )
             self._persist_session(session)  # FIX: F-A1
             return result
         
         elif session.phase == InterviewPhase.IN_PROGRESS:
-            result = await self._handle_interview_response(session, user_message)
+            result = await self._handle_interview_response(
+                session, user_message, on_delta
+            )
             self._persist_session(session)  # FIX: F-A1
             return result
         
@@ -278,7 +283,8 @@ class BaseInterviewService(ABC):
     async def _handle_first_response(
         self,
         session: InterviewSession,
-        user_message: str
+        user_message: str,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
     ) -> MessageResponse:
         """Handle the first response after greeting"""
         # Evaluate the response
@@ -298,7 +304,7 @@ class BaseInterviewService(ABC):
         session.current_question_index = 1
         
         # Get next question
-        next_question = await self._get_next_question(session)
+        next_question = await self._get_next_question(session, on_delta)
         session.questions_asked.append(next_question)
         
         # Record assistant message
@@ -319,7 +325,8 @@ class BaseInterviewService(ABC):
     async def _handle_interview_response(
         self,
         session: InterviewSession,
-        user_message: str
+        user_message: str,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
     ) -> MessageResponse:
         """Handle responses during the interview"""
         # Check if user wants to end interview early
@@ -379,7 +386,7 @@ class BaseInterviewService(ABC):
             return await self._complete_interview(session)
         
         # Get next question
-        next_question = await self._get_next_question(session)
+        next_question = await self._get_next_question(session, on_delta)
         session.questions_asked.append(next_question)
         
         # Record assistant message
@@ -397,6 +404,49 @@ class BaseInterviewService(ABC):
             evaluation=evaluation
         )
     
+    async def process_message_stream(
+        self,
+        session_id: str,
+        user_message: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of process_message()
+        
+        Yields {"event": "delta", "text": ...} for each chunk of the next
+        question as the LLM produces it, then a single
+        {"event": "done", "response": MessageResponse}. Deltas are cleaned
+        question text (see BaseRAGService._generate_question); the final
+        response stays authoritative, e.g. when a provider fails mid-stream
+        and the base question is used instead.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(
+            self.process_message(session_id, user_message, on_delta=queue.put)
+        )
+        
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {getter, task}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter in done:
+                    yield {"event": "delta", "text": getter.result()}
+                    continue
+                getter.cancel()
+                break
+            
+            while not queue.empty():
+                yield {"event": "delta", "text": queue.get_nowait()}
+            yield {"event": "done", "response": task.result()}
+        finally:
+            # Client disconnected mid-stream: the turn may already have
+            # recorded the answer and advanced the session, so let it finish
+            # and persist; only the remaining deltas are dropped
+            if not task.done():
+                _detached_turns.add(task)
+                task.add_done_callback(_finish_detached_turn)
+    
     def _should_complete(self, session: InterviewSession) -> bool:
         """Check if the interview should complete"""
         if session.current_question_index >= self.max_questions:
@@ -443,6 +493,8 @@ class BaseInterviewService(ABC):
         
         # FIX: F-A1 — Persist completed session
         self._persist_session(session)
+        if self.sessions.flush_on_complete:
+            await self.sessions.flush(session.session_id)
         
         return MessageResponse(
             type="completion",
@@ -466,8 +518,12 @@ class BaseInterviewService(ABC):
         pass
     
     @abstractmethod
-    async def _get_next_question(self, session: InterviewSession) -> str:
-        """Get the next question"""
+    async def _get_next_question(
+        self,
+        session: InterviewSession,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> str:
+        """Get the next question, streaming deltas to `on_delta` if given"""
         pass
     
     @abstractmethod
@@ -18,7 +18,7 @@ FIXES APPLIED:
 """
 
 import logging
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Callable, Awaitable
 from datetime import datetime
 from functools import lru_cache
 
@@ -108,7 +108,11 @@ Tell me about a challenge you faced working in a team. How did you handle it?"""
             job_description=session.job_description
         )
 
-    async def _get_next_question(self, session: InterviewSession) -> str:
+    async def _get_next_question(
+        self,
+        session: InterviewSession,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> str:
         """
         Get the next behavioral question.
 
@@ -128,7 +132,8 @@ Tell me about a challenge you faced working in a team. How did you handle it?"""
         if session.resume_text or session.job_description:
             return await self.rag_service.get_personalized_question(
                 session,
-                session.current_question_index
+                session.current_question_index,
+                on_delta=on_delta
             )
 
         # Otherwise use standard question
@@ -17,7 +17,7 @@ FIXES APPLIED:
 """
 
 import logging
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Callable, Awaitable
 from datetime import datetime
 from functools import lru_cache
 
@@ -95,13 +95,18 @@ class ScreeningInterviewService(BaseInterviewService):
             job_description=session.job_description
         )
     
-    async def _get_next_question(self, session: InterviewSession) -> str:
+    async def _get_next_question(
+        self,
+        session: InterviewSession,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> str:
         """Get the next screening question"""
         # Use personalized question if we have context
         if session.resume_text or session.job_description:
             return await self.rag_service.get_personalized_question(
                 session,
-                session.current_question_index
+                session.current_question_index,
+                on_delta=on_delta
             )
         
         # Otherwise use standard question
@@ -19,7 +19,7 @@ FIXES APPLIED:
 """
 
 import logging
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Callable, Awaitable
 from datetime import datetime
 from functools import lru_cache
 
@@ -124,7 +124,11 @@ Let's start:
             job_description=session.job_description
         )
 
-    async def _get_next_question(self, session: InterviewSession) -> str:
+    async def _get_next_question(
+        self,
+        session: InterviewSession,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> str:
         """
         Get the next technical question.
 
@@ -152,7 +156,8 @@ Let's start:
             return await self.rag_service.get_personalized_question(
                 session,
                 q_idx,
-                domain=domain_for_q
+                domain=domain_for_q,
+                on_delta=on_delta
             )
 
         # Fallback to domain-specific questions
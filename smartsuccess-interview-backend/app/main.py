@@ -47,6 +47,44 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting SmartSuccess Interview Backend...")
     print(f"📍 Environment: {os.getenv('ENVIRONMENT', 'development')}")
     
+    # Restore vector collections from the last snapshot (memory-mapped)
+    from app.config import settings
+    app.state.vector_snapshotter = None
+    if settings.vector_snapshot_enabled:
+        try:
+            from app.core.vector_store import get_vector_store
+            from app.core.vector_snapshot import VectorSnapshotter
+            
+            snapshotter = VectorSnapshotter(
+                get_vector_store(),
+                settings.vector_snapshot_dir,
+                settings.vector_snapshot_interval_seconds
+            )
+            restored = snapshotter.restore()
+            snapshotter.start()
+            app.state.vector_snapshotter = snapshotter
+            print(f"✅ Vector snapshots enabled ({restored} collections restored)")
+        except Exception as e:
+            print(f"⚠️  Vector snapshots not enabled: {e}")
+    
+    # Background, coalesced session writes
+    from app.services.session_write_behind import get_session_writer
+    if settings.session_write_behind:
+        get_session_writer().start()
+        print(f"✅ Session write-behind enabled ({settings.session_flush_interval_ms}ms flush)")
+    
+    # Shared keep-alive HTTP clients for LLM/embedding providers
+    from app.services.http_pool import get_http_pool
+    app.state.http_pool = get_http_pool()
+    app.state.http_pool.warm(
+        provider for provider, api_key in (
+            ("gemini", settings.gemini_api_key),
+            ("groq", settings.groq_api_key),
+            ("openai", settings.openai_api_key),
+            ("xai", settings.xai_api_key),
+        ) if api_key
+    )
+    
     # Initialize RAG question banks
     from app.rag.screening_rag import ScreeningRAGService
     from app.rag.behavioral_rag import BehavioralRAGService
@@ -76,6 +114,19 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("👋 Shutting down SmartSuccess Interview Backend...")
+    if app.state.vector_snapshotter is not None:
+        await app.state.vector_snapshotter.stop()
+        print("✅ Vector snapshot flushed")
+    
+    await get_session_writer().stop()
+    print("✅ Session writes flushed")
+    
+    from app.core.embedding_cache import get_embedding_cache
+    get_embedding_cache().close()
+    from app.services.llm_cache import get_llm_cache
+    get_llm_cache().close()
+    await app.state.http_pool.aclose()
+    print("✅ HTTP client pool closed")
 
 # Create FastAPI app
 app = FastAPI(
@@ -128,6 +179,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request stage timing (Server-Timing header + GET /metrics)
+from app.config import settings
+if settings.request_timing_enabled:
+    from app.services.request_timing import StageTimingMiddleware
+    app.add_middleware(
+        StageTimingMiddleware,
+        header=settings.server_timing_header
+    )
+    print("✅ Request stage timing enabled (GET /metrics)")
+
 # Include routers
 app.include_router(health.router)
 app.include_router(screening.router)
@@ -155,6 +216,7 @@ async def root():
         "status": "running",
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
             "screening": "/api/interview/screening",
             "behavioral": "/api/interview/behavioral",
             "technical": "/api/interview/technical",
@@ -4,9 +4,11 @@ Provides common functionality for specialized RAG services
 """
 
 import os
+import re
 import json
+import hashlib
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union, Callable, Awaitable
 from pathlib import Path
 
 from app.core.embedding_service import EmbeddingService
@@ -14,6 +16,15 @@ from app.core.vector_store import VectorStore, get_vector_store
 from app.config import settings
 
 
+# Whitespace and quotes at the end of a partial reply (may still be stripped)
+_UNSETTLED_TAIL = re.compile(r"[\s\"']+$")
+
+
+def _clean_question(text: str) -> str:
+    """Generated question without surrounding whitespace or quotes"""
+    return text.strip().strip("\"'")
+
+
 class BaseRAGService(ABC):
     """
     Base class for interview-specific RAG services
@@ -24,6 +35,10 @@ class BaseRAGService(ABC):
     - Personalized question generation
     """
     
+    # Canned queries for the resume/JD context sections of prompts
+    RESUME_CONTEXT_QUERY = "skills experience education projects achievements"
+    JOB_CONTEXT_QUERY = "requirements responsibilities qualifications skills"
+    
     def __init__(self, interview_type: str):
         self.interview_type = interview_type
         self.embedding_service = EmbeddingService()
@@ -89,44 +104,59 @@ class BaseRAGService(ABC):
         """
         collection_id = f"{self.collection_prefix}_{user_id}"
         
-        # Clear existing context for this user
-        self.vector_store.delete_collection(collection_id)
-        
-        documents = []
-        
-        # Process resume
+        chunks = []
         if resume_text:
-            chunks = self.embedding_service.chunk_text_by_sections(
+            chunks.extend(self.embedding_service.chunk_text_by_sections(
                 resume_text, source="resume"
-            )
-            for chunk_text, metadata in chunks:
-                embedding = await self.embedding_service.embed_text(chunk_text)
-                documents.append({
-                    "content": chunk_text,
-                    "embedding": embedding,
-                    "metadata": {
-                        "source": metadata.source,
-                        "section": metadata.section,
-                        "type": "resume"
-                    }
-                })
-        
-        # Process job description
+            ))
         if job_description:
-            chunks = self.embedding_service.chunk_text_by_sections(
+            chunks.extend(self.embedding_service.chunk_text_by_sections(
                 job_description, source="job_description"
-            )
-            for chunk_text, metadata in chunks:
-                embedding = await self.embedding_service.embed_text(chunk_text)
-                documents.append({
-                    "content": chunk_text,
-                    "embedding": embedding,
-                    "metadata": {
-                        "source": metadata.source,
-                        "section": metadata.section,
-                        "type": "job_description"
-                    }
-                })
+            ))
+        
+        # Incremental update: chunks are keyed by a content hash, so chunks
+        # already in the user's collection keep their embeddings and only
+        # new or changed chunks are embedded. Zero vectors (all providers
+        # failed last time) are re-embedded and replaced.
+        existing = self.vector_store.get_all_documents(collection_id)
+        existing_ids = {doc.id for doc in existing}
+        reusable_ids = {
+            doc.id for doc in existing
+            if self.vector_store.get_embedding(collection_id, doc.id).any()
+        }
+        wanted_ids = set()
+        documents = []
+        
+        for chunk_text, metadata in chunks:
+            doc_metadata = {
+                "source": metadata.source,
+                "section": metadata.section,
+                "type": metadata.source
+            }
+            doc_id = self._chunk_id(chunk_text, doc_metadata)
+            if doc_id in wanted_ids:
+                continue
+            wanted_ids.add(doc_id)
+            if doc_id in reusable_ids:
+                continue
+            
+            documents.append({
+                "id": doc_id,
+                "content": chunk_text,
+                "metadata": doc_metadata
+            })
+        
+        # Embed every new chunk at once: token-budgeted batches sent
+        # concurrently, so this costs about one provider round-trip
+        embeddings = await self.embedding_service.embed_many(
+            [doc["content"] for doc in documents]
+        )
+        for doc, embedding in zip(documents, embeddings):
+            doc["embedding"] = embedding
+        
+        # Drop chunks that are no longer part of the resume/JD
+        for stale_id in existing_ids - wanted_ids:
+            self.vector_store.delete_document(collection_id, stale_id)
         
         # Add to vector store
         if documents:
@@ -134,6 +164,12 @@ class BaseRAGService(ABC):
         
         return collection_id
     
+    @staticmethod
+    def _chunk_id(chunk_text: str, metadata: Dict[str, Any]) -> str:
+        """Stable document ID for a context chunk (content + placement)"""
+        key = f"{metadata['type']}|{metadata['section']}|{chunk_text}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+    
     async def query_context(
         self,
         user_id: str,
@@ -175,10 +211,60 @@ class BaseRAGService(ABC):
             metadata_filter=metadata_filter
         )
         
-        if not results:
-            return ""
+        return self._format_context(results)
+    
+    async def query_context_many(
+        self,
+        user_id: str,
+        queries: List[str],
+        source_filters: Optional[List[Optional[str]]] = None,
+        k: Union[int, List[int]] = 4
+    ) -> List[str]:
+        """
+        Query the user's context for several queries at once
+        
+        Embeds every query in one `embed_batch` call and scores them in one
+        `VectorStore.search_many` pass.
+        
+        Args:
+            user_id: User identifier
+            queries: Search queries
+            source_filters: Optional per-query filter ("resume",
+                "job_description" or None)
+            k: Number of results, shared or per query
+            
+        Returns:
+            Concatenated relevant context for each query, in query order
+        """
+        collection_id = f"{self.collection_prefix}_{user_id}"
         
-        # Format context
+        if not queries or self.vector_store.count_documents(collection_id) == 0:
+            return ["" for _ in queries]
+        
+        ks = k if isinstance(k, list) else [k] * len(queries)
+        metadata_filters = [
+            {"type": source} if source else None
+            for source in (source_filters or [None] * len(queries))
+        ]
+        
+        query_embeddings = await self.embedding_service.embed_batch(queries)
+        
+        # One search at the largest k; smaller k's are prefixes of it
+        results = self.vector_store.search_many(
+            collection_id=collection_id,
+            query_embeddings=query_embeddings,
+            k=max(ks),
+            metadata_filters=metadata_filters
+        )
+        
+        return [
+            self._format_context(query_results[:query_k])
+            for query_results, query_k in zip(results, ks)
+        ]
+    
+    @staticmethod
+    def _format_context(results) -> str:
+        """Format search results as a prompt context block"""
         context_parts = []
         for result in results:
             source = result.document.metadata.get("source", "unknown").upper()
@@ -192,7 +278,7 @@ class BaseRAGService(ABC):
         """Get context specifically from the resume"""
         return await self.query_context(
             user_id,
-            "skills experience education projects achievements",
+            self.RESUME_CONTEXT_QUERY,
             source_filter="resume",
             k=4
         )
@@ -201,11 +287,59 @@ class BaseRAGService(ABC):
         """Get context specifically from the job description"""
         return await self.query_context(
             user_id,
-            "requirements responsibilities qualifications skills",
+            self.JOB_CONTEXT_QUERY,
             source_filter="job_description",
             k=4
         )
     
+    async def _generate_question(
+        self,
+        prompt: str,
+        max_tokens: int,
+        min_length: int,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Optional[str]:
+        """
+        Run a question-generation prompt through the LLMService chain
+
+        Returns the question without surrounding whitespace or quotes, or
+        None if it is not longer than `min_length` (callers fall back to the
+        base question). With `on_delta` the reply is streamed from the same
+        provider, and `on_delta` receives only text of the returned
+        question: nothing until it is long enough to be kept, and no
+        trailing quotes that the cleanup would strip.
+        """
+        from app.services.llm_service import get_llm_service
+        
+        llm = get_llm_service()
+        if on_delta is None:
+            question = _clean_question(await llm.generate(
+                prompt=prompt,
+                temperature=0.7,
+                max_tokens=max_tokens
+            ))
+            return question if len(question) > min_length else None
+        
+        text = ""
+        emitted = 0
+        async for delta in llm.generate_stream(
+            prompt=prompt,
+            temperature=0.7,
+            max_tokens=max_tokens
+        ):
+            text += delta
+            safe = _UNSETTLED_TAIL.sub("", _clean_question(text))
+            if len(safe) > min_length and len(safe) > emitted:
+                await on_delta(safe[emitted:])
+                emitted = len(safe)
+        
+        question = _clean_question(text)
+        if len(question) <= min_length:
+            return None
+        if len(question) > emitted:
+            await on_delta(question[emitted:])
+        return question
+    
     @abstractmethod
     async def get_question(self, index: int) -> str:
         """Get a question by index - implemented by subclasses"""
@@ -215,7 +349,8 @@ class BaseRAGService(ABC):
     async def get_personalized_question(
         self,
         session,
-        index: int
+        index: int,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
     ) -> str:
         """Get a personalized question based on context - implemented by subclasses"""
         pass
@@ -3,13 +3,12 @@ Behavioral Interview RAG Service
 Specialized for STAR method behavioral questions
 """
 
-import os
 import random
-from typing import Optional, Dict, List
-from openai import AsyncOpenAI
+from typing import Optional, Dict, List, Callable, Awaitable
 
 from .base_rag import BaseRAGService
 from app.config import settings
+from app.services.llm_service import get_chat_client
 
 
 class BehavioralRAGService(BaseRAGService):
@@ -45,8 +44,7 @@ class BehavioralRAGService(BaseRAGService):
         super().__init__("behavioral")
         
         # Initialize LLM
-        api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-        self.llm_client = AsyncOpenAI(api_key=api_key) if api_key else None
+        self.llm_client = get_chat_client()
         
         # Build category index
         self._build_category_index()
@@ -90,10 +88,13 @@ class BehavioralRAGService(BaseRAGService):
     async def get_personalized_question(
         self,
         session,
-        index: int
+        index: int,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
     ) -> str:
         """
         Generate a personalized behavioral question based on resume/JD context
+        
+        `on_delta` receives streamed text deltas (SSE message endpoints).
         """
         # Get base question
         base_question = await self.get_question(index)
@@ -103,14 +104,18 @@ class BehavioralRAGService(BaseRAGService):
             return base_question
         
         try:
-            # Get relevant context
-            resume_context = await self.query_context(
-                session.user_id,
-                "experience projects leadership teamwork achievements challenges",
-                k=4
-            )
+            # Get relevant context (one embedding call and one search pass)
+            queries = ["experience projects leadership teamwork achievements challenges"]
+            source_filters = [None]
+            if session.job_description:
+                queries.append(self.JOB_CONTEXT_QUERY)
+                source_filters.append("job_description")
             
-            job_context = await self.get_job_context(session.user_id) if session.job_description else ""
+            contexts = await self.query_context_many(
+                session.user_id, queries, source_filters, k=4
+            )
+            resume_context = contexts[0]
+            job_context = contexts[1] if session.job_description else ""
             
             # Get questions already asked
             asked = session.questions_asked if hasattr(session, 'questions_asked') else []
@@ -141,20 +146,11 @@ Generate ONE behavioral question that:
 
 Return ONLY the question, nothing else."""
 
-            response = await self.llm_client.chat.completions.create(
-                model=settings.llm_model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=150
+            personalized = await self._generate_question(
+                prompt, max_tokens=150, min_length=10, on_delta=on_delta
             )
             
-            personalized = response.choices[0].message.content.strip()
-            personalized = personalized.strip('"\'')
-            
-            if personalized and len(personalized) > 10:
-                return personalized
-            
-            return base_question
+            return personalized or base_question
             
         except Exception as e:
             print(f"Error generating personalized behavioral question: {e}")
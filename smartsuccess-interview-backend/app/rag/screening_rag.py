@@ -3,12 +3,11 @@ Screening Interview RAG Service
 Specialized for first-impression assessment questions
 """
 
-import os
-from typing import Optional
-from openai import AsyncOpenAI
+from typing import Optional, Callable, Awaitable
 
 from .base_rag import BaseRAGService
 from app.config import settings
+from app.services.llm_service import get_chat_client
 
 
 class ScreeningRAGService(BaseRAGService):
@@ -26,8 +25,7 @@ class ScreeningRAGService(BaseRAGService):
         super().__init__("screening")
         
         # Initialize LLM for personalized question generation
-        api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-        self.llm_client = AsyncOpenAI(api_key=api_key) if api_key else None
+        self.llm_client = get_chat_client()
     
     async def get_question(self, index: int) -> str:
         """Get a screening question by index"""
@@ -49,10 +47,13 @@ class ScreeningRAGService(BaseRAGService):
     async def get_personalized_question(
         self,
         session,
-        index: int
+        index: int,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
     ) -> str:
         """
         Generate a personalized screening question based on resume/JD context
+        
+        `on_delta` receives streamed text deltas (SSE message endpoints).
         """
         # Get base question
         base_question = await self.get_question(index)
@@ -95,23 +96,11 @@ Generate ONE screening question that:
 
 Return ONLY the question, nothing else."""
 
-            response = await self.llm_client.chat.completions.create(
-                model=settings.llm_model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=150
+            personalized = await self._generate_question(
+                prompt, max_tokens=150, min_length=10, on_delta=on_delta
             )
             
-            personalized = response.choices[0].message.content.strip()
-            
-            # Clean up the response
-            personalized = personalized.strip('"\'')
-            
-            # Validate it looks like a question
-            if personalized and len(personalized) > 10:
-                return personalized
-            
-            return base_question
+            return personalized or base_question
             
         except Exception as e:
             print(f"Error generating personalized screening question: {e}")
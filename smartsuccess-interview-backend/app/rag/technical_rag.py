@@ -3,13 +3,12 @@ Technical Interview RAG Service
 Specialized for AI/ML engineering technical questions
 """
 
-import os
 import random
-from typing import Optional, Dict, List
-from openai import AsyncOpenAI
+from typing import Optional, Dict, List, Callable, Awaitable
 
 from .base_rag import BaseRAGService
 from app.config import settings
+from app.services.llm_service import get_chat_client
 
 
 class TechnicalRAGService(BaseRAGService):
@@ -43,8 +42,7 @@ class TechnicalRAGService(BaseRAGService):
         super().__init__("technical")
         
         # Initialize LLM
-        api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-        self.llm_client = AsyncOpenAI(api_key=api_key) if api_key else None
+        self.llm_client = get_chat_client()
         
         # Build domain index
         self._build_domain_index()
@@ -101,10 +99,13 @@ class TechnicalRAGService(BaseRAGService):
         self,
         session,
         index: int,
-        domain: Optional[str] = None
+        domain: Optional[str] = None,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None
     ) -> str:
         """
         Generate a personalized technical question based on resume/JD context
+        
+        `on_delta` receives streamed text deltas (SSE message endpoints).
         """
         # Get base question
         base_question = await self.get_question(index, domain)
@@ -114,14 +115,20 @@ class TechnicalRAGService(BaseRAGService):
             return base_question
         
         try:
-            # Get technical context from resume
-            technical_context = await self.query_context(
-                session.user_id,
-                "technical skills programming languages frameworks tools technologies experience projects",
-                k=5
-            )
+            # Get technical context from resume (and JD) in one batched query
+            queries = ["technical skills programming languages frameworks tools technologies experience projects"]
+            source_filters = [None]
+            ks = [5]
+            if session.job_description:
+                queries.append(self.JOB_CONTEXT_QUERY)
+                source_filters.append("job_description")
+                ks.append(4)
             
-            job_context = await self.get_job_context(session.user_id) if session.job_description else ""
+            contexts = await self.query_context_many(
+                session.user_id, queries, source_filters, k=ks
+            )
+            technical_context = contexts[0]
+            job_context = contexts[1] if session.job_description else ""
             
             # Get skills from MatchWise analysis if available
             skills = []
@@ -161,20 +168,11 @@ Generate ONE technical question that:
 
 Return ONLY the question, nothing else."""
 
-            response = await self.llm_client.chat.completions.create(
-                model=settings.llm_model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=200
+            personalized = await self._generate_question(
+                prompt, max_tokens=200, min_length=15, on_delta=on_delta
             )
             
-            personalized = response.choices[0].message.content.strip()
-            personalized = personalized.strip('"\'')
-            
-            if personalized and len(personalized) > 15:
-                return personalized
-            
-            return base_question
+            return personalized or base_question
             
         except Exception as e:
             print(f"Error generating personalized technical question: {e}")
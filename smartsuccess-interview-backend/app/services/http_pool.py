@@ -0,0 +1,262 @@
+"""
+Shared HTTP Client Pool
+One keep-alive client per upstream provider (Gemini, Groq, OpenAI, xAI, ...)
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolMetrics:
+    """Request counters for one provider's client"""
+    requests: int = 0
+    errors: int = 0  # Transport errors and HTTP status >= 400
+    clients_created: int = 0
+    total_latency_ms: float = 0.0  # Time to response headers
+    status_counts: Dict[int, int] = field(default_factory=dict)
+
+    def record(self, status: Optional[int], latency_ms: float) -> None:
+        self.requests += 1
+        self.total_latency_ms += latency_ms
+        if status is None or status >= 400:
+            self.errors += 1
+        if status is not None:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "clients_created": self.clients_created,
+            "avg_latency_ms": (
+                round(self.total_latency_ms / self.requests, 1)
+                if self.requests else None
+            ),
+            "status_counts": dict(self.status_counts),
+        }
+
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    """Records status and time-to-headers of every request, including failures"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, metrics: PoolMetrics):
+        self._transport = transport
+        self._metrics = metrics
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            self._metrics.record(None, (time.perf_counter() - started) * 1000)
+            raise
+        self._metrics.record(response.status_code, (time.perf_counter() - started) * 1000)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HTTPClientPool:
+    """
+    Lifecycle-managed keep-alive clients keyed by provider name
+
+    Usage:
+        pool = get_http_pool()
+        pool.warm(["groq"])  # on startup
+        response = await pool.client("groq").post(url, json=payload)
+        async with pool.session("groq").post(url, json=payload) as response:
+            ...
+        await pool.aclose()  # on shutdown
+
+    Clients are bound to the event loop that created them. One requested
+    from a different loop is replaced, and the old one is closed (see
+    _retire) rather than left holding its connections.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2 and _h2_available()
+
+        self._clients: Dict[str, Tuple[httpx.AsyncClient, Any]] = {}
+        self._sessions: Dict[str, Tuple[Any, Any]] = {}
+        self.metrics: Dict[str, PoolMetrics] = {}
+        self._closing: Set[asyncio.Task] = set()  # Retired clients being closed
+        self.retired = 0
+
+    def _metrics(self, provider: str) -> PoolMetrics:
+        if provider not in self.metrics:
+            self.metrics[provider] = PoolMetrics()
+        return self.metrics[provider]
+
+    def client(self, provider: str) -> httpx.AsyncClient:
+        """Shared httpx client for `provider` (created on first use)"""
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(provider)
+        if entry is not None:
+            if entry[1] is loop and not entry[0].is_closed:
+                return entry[0]
+            if entry[1] is not loop:
+                self._retire(entry[1], entry[0].aclose)
+
+        metrics = self._metrics(provider)
+        transport = httpx.AsyncHTTPTransport(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            )
+        )
+        client = httpx.AsyncClient(transport=_MeteredTransport(transport, metrics))
+        self._clients[provider] = (client, loop)
+        metrics.clients_created += 1
+        return client
+
+    def session(self, provider: str):
+        """Shared aiohttp session for `provider` (created on first use)"""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(provider)
+        if entry is not None:
+            if entry[1] is loop and not entry[0].closed:
+                return entry[0]
+            if entry[1] is not loop:
+                self._retire(entry[1], entry[0].close)
+
+        metrics = self._metrics(provider)
+
+        async def on_request_start(session, context, params):
+            context.started_at = time.perf_counter()
+
+        async def on_request_end(session, context, params):
+            metrics.record(
+                params.response.status,
+                (time.perf_counter() - context.started_at) * 1000
+            )
+
+        async def on_request_exception(session, context, params):
+            metrics.record(None, (time.perf_counter() - context.started_at) * 1000)
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_expiry
+            ),
+            trace_configs=[trace_config]
+        )
+        self._sessions[provider] = (session, loop)
+        metrics.clients_created += 1
+        return session
+
+    def warm(self, providers: Iterable[str]) -> None:
+        """Create the httpx clients for `providers` on the running loop"""
+        for provider in providers:
+            self.client(provider)
+
+    def _retire(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        close: Callable[[], Awaitable[None]]
+    ) -> None:
+        """
+        Close a client or session created on another event loop
+
+        If that loop is still running (another thread), the close runs
+        there. Otherwise it runs on the current loop, and aclose() waits
+        for it.
+        """
+        self.retired += 1
+        if loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_close_quietly(close), loop)
+            return
+        task = asyncio.get_running_loop().create_task(_close_quietly(close))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def aclose(self) -> None:
+        """Close every client and session (those of other loops via _retire)"""
+        loop = asyncio.get_running_loop()
+        for provider, (client, client_loop) in list(self._clients.items()):
+            if client_loop is loop:
+                await client.aclose()
+            else:
+                self._retire(client_loop, client.aclose)
+            self._clients.pop(provider, None)
+        for provider, (session, session_loop) in list(self._sessions.items()):
+            if session_loop is loop:
+                await session.close()
+            else:
+                self._retire(session_loop, session.close)
+            self._sessions.pop(provider, None)
+        if self._closing:
+            await asyncio.gather(*self._closing)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "clients_retired": self.retired,
+            "providers": {
+                provider: metrics.to_dict()
+                for provider, metrics in self.metrics.items()
+            },
+        }
+
+
+async def _close_quietly(close: Callable[[], Awaitable[None]]) -> None:
+    try:
+        await close()
+    except Exception as e:  # E.g. its event loop is already closed
+        logger.debug(f"Closing a retired HTTP client failed: {e}")
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("HTTP/2 requested but the h2 package is not installed")
+        return False
+
+
+# Singleton
+_http_pool_instance: Optional[HTTPClientPool] = None
+
+
+def get_http_pool() -> HTTPClientPool:
+    """Get the singleton HTTP client pool"""
+    global _http_pool_instance
+    if _http_pool_instance is None:
+        _http_pool_instance = HTTPClientPool(
+            max_connections=settings.http_pool_max_connections,
+            max_keepalive_connections=settings.http_pool_max_keepalive,
+            keepalive_expiry=settings.http_pool_keepalive_expiry,
+            http2=settings.http_pool_http2
+        )
+    return _http_pool_instance
@@ -0,0 +1,229 @@
+"""
+LLM Response Cache
+Memory LRU plus optional SQLite tier (with TTL) for low-temperature responses
+"""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def response_key(
+    prompt: str,
+    system_prompt: Optional[str],
+    temperature: float,
+    max_tokens: int,
+    scope: str = ""
+) -> str:
+    """Cache key of one generate() request to the provider chain `scope`"""
+    bucket = f"{round(temperature, 1):.1f}"
+    material = "\0".join(
+        [prompt, system_prompt or "", bucket, str(max_tokens), scope]
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier (memory LRU + SQLite) response cache with TTL
+
+    Usage:
+        cache = LLMResponseCache(max_entries=1024, ttl_seconds=86400)
+        if cache.should_cache(temperature, opt_in):
+            key = response_key(prompt, system_prompt, temperature, max_tokens, scope)
+            text = await cache.get(key)
+            ...
+            await cache.put(key, text)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400.0,
+        db_path: Optional[str] = None,
+        max_temperature: float = 0.3,
+        enabled: bool = True
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.max_temperature = max_temperature
+        self.enabled = enabled
+        # key -> (created_at, response)
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expired = 0
+
+    def should_cache(self, temperature: float, opt_in: Optional[bool] = None) -> bool:
+        """Explicit opt-in/out wins; otherwise only low-temperature calls"""
+        if not self.enabled or opt_in is False:
+            return False
+        return bool(opt_in) or temperature <= self.max_temperature
+
+    async def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            if now - entry[0] < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+            del self._memory[key]
+            self.expired += 1
+
+        entry = await asyncio.to_thread(self._disk_get, key) if self.db_path else None
+        if entry is not None:
+            if now - entry[0] < self.ttl_seconds:
+                self._remember(key, entry)
+                self.disk_hits += 1
+                return entry[1]
+            self.expired += 1
+            await asyncio.to_thread(self._disk_delete, key)
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, response: str) -> None:
+        if not response or not response.strip():
+            return
+        entry = (time.time(), response)
+        self._remember(key, entry)
+        self.stores += 1
+        if self.db_path:
+            await asyncio.to_thread(self._disk_put, key, entry)
+
+    def _remember(self, key: str, entry: Tuple[float, str]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and self.db_path:
+            try:
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, response TEXT, created_at REAL)"
+                )
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache disk tier disabled: {e}")
+                self.db_path = None
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT created_at, response FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache read failed: {e}")
+                return None
+        return None if row is None else (row[0], row[1])
+
+    def _disk_put(self, key: str, entry: Tuple[float, str]) -> None:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                    (key, entry[1], entry[0])
+                )
+                # Prune expired rows now and then so the file stays bounded
+                if self.stores % 100 == 0:
+                    conn.execute(
+                        "DELETE FROM responses WHERE created_at < ?",
+                        (time.time() - self.ttl_seconds,)
+                    )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed: {e}")
+
+    def _disk_delete(self, key: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache delete failed: {e}")
+
+    def clear(self) -> None:
+        """Drop both tiers"""
+        self._memory.clear()
+        with self._lock:
+            conn = self._connect()
+            if conn is not None:
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, object]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries_in_memory": len(self._memory),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "max_temperature": self.max_temperature,
+            "disk_path": self.db_path,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "expired": self.expired,
+            "hit_ratio": (
+                round((self.memory_hits + self.disk_hits) / lookups, 4)
+                if lookups else None
+            ),
+        }
+
+
+# Singleton instance shared by all LLMService instances
+_llm_cache_instance: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the singleton LLM response cache"""
+    global _llm_cache_instance
+    if _llm_cache_instance is None:
+        from app.config import settings
+        _llm_cache_instance = LLMResponseCache(
+            max_entries=settings.llm_cache_size,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            db_path=settings.llm_cache_path or None,
+            max_temperature=settings.llm_cache_max_temperature,
+            enabled=settings.llm_cache_enabled
+        )
+    return _llm_cache_instance
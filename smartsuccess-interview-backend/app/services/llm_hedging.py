@@ -0,0 +1,111 @@
+"""
+Hedged LLM Requests
+Race a second provider when the primary is slower than its usual latency
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from app.services.provider_health import ProviderHealth
+
+
+@dataclass
+class HedgeStats:
+    """Counters for hedge rate / win rate reporting"""
+    eligible: int = 0  # Calls that had a hedge candidate
+    hedged: int = 0  # Calls where the hedge request was fired
+    hedge_wins: int = 0  # Hedged calls answered by the hedge request
+    primary_wins: int = 0  # Hedged calls answered by the primary anyway
+    budget_denied: int = 0  # Hedges skipped because the budget was spent
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "eligible": self.eligible,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "primary_wins": self.primary_wins,
+            "budget_denied": self.budget_denied,
+            "hedge_rate": (
+                round(self.hedged / self.eligible, 4) if self.eligible else None
+            ),
+            "win_rate": (
+                round(self.hedge_wins / self.hedged, 4) if self.hedged else None
+            ),
+        }
+
+
+class HedgePolicy:
+    """When, and to which provider, a request may be hedged"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 95.0,
+        default_delay_ms: float = 3000.0,
+        min_delay_ms: float = 250.0,
+        min_samples: int = 5,
+        max_per_minute: int = 20,
+        allow_openai: bool = False
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.default_delay_ms = default_delay_ms
+        self.min_delay_ms = min_delay_ms
+        self.min_samples = min_samples
+        self.max_per_minute = max_per_minute
+        self.allow_openai = allow_openai
+
+        self.stats = HedgeStats()
+        self._fired: Deque[float] = deque()
+
+    def candidate(
+        self,
+        providers: List[Dict[str, Any]],
+        primary: Dict[str, Any],
+        exclude: List[Dict[str, Any]],
+        health: ProviderHealth
+    ) -> Optional[Dict[str, Any]]:
+        """Next provider after `primary` that may receive a hedge"""
+        if not self.enabled:
+            return None
+        later = providers[providers.index(primary) + 1:]
+        eligible = [
+            p for p in later
+            if p not in exclude
+            and (self.allow_openai or p["provider"] != "openai")
+            and health.breaker(p).available()
+        ]
+        for p in eligible:
+            if p["provider"] != primary["provider"]:
+                return p
+        return eligible[0] if eligible else None
+
+    def delay_seconds(self, primary: Dict[str, Any], health: ProviderHealth) -> float:
+        """How long to wait for the primary before hedging"""
+        breaker = health.breaker(primary)
+        delay_ms = self.default_delay_ms
+        if breaker.success_count() >= self.min_samples:
+            delay_ms = breaker.latency_percentile_ms(self.percentile)
+        return max(delay_ms, self.min_delay_ms) / 1000
+
+    def acquire(self, now: Optional[float] = None) -> bool:
+        """Spend one hedge from the per-minute budget"""
+        now = time.monotonic() if now is None else now
+        while self._fired and now - self._fired[0] >= 60:
+            self._fired.popleft()
+        if len(self._fired) >= self.max_per_minute:
+            self.stats.budget_denied += 1
+            return False
+        self._fired.append(now)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "percentile": self.percentile,
+            "max_per_minute": self.max_per_minute,
+            "allow_openai": self.allow_openai,
+            **self.stats.to_dict(),
+        }
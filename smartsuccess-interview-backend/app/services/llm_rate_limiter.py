@@ -0,0 +1,222 @@
+"""
+LLM Provider Rate Limiting
+RPM/TPM token buckets per provider/model (COST_OPTIMIZED_CONFIG) with a priority wait queue
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Lower value is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+class RateLimitTimeout(Exception):
+    """Waited longer than allowed for provider capacity"""
+
+
+class TokenBucket:
+    """Continuous-refill bucket holding up to `per_minute` units"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (0 if available now)"""
+        self._refill(now)
+        # A request larger than the bucket only needs a full bucket
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued: float = field(compare=False)
+
+
+@dataclass
+class LimiterMetrics:
+    """Queue depth and wait-time counters for one provider/model"""
+    acquired: int = 0
+    queued: int = 0  # Acquisitions that had to wait
+    timeouts: int = 0
+    max_depth: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    def record_wait(self, wait_ms: float) -> None:
+        self.acquired += 1
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+
+class ProviderLimiter:
+    """RPM + TPM buckets and the wait queue for one provider/model"""
+
+    def __init__(self, rpm: Optional[int], tpm: Optional[int]):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.waiters: List[_Waiter] = []
+        self.metrics = LimiterMetrics()
+        self._drainer: Optional[asyncio.Task] = None
+
+    def wait_time(self, tokens: float, now: float) -> float:
+        waits = [0.0]
+        if self.requests:
+            waits.append(self.requests.wait_time(1, now))
+        if self.tokens:
+            waits.append(self.tokens.wait_time(tokens, now))
+        return max(waits)
+
+    def take(self, tokens: float, now: float) -> None:
+        if self.requests:
+            self.requests.take(1, now)
+        if self.tokens:
+            self.tokens.take(tokens, now)
+
+    def depth(self) -> int:
+        return sum(1 for w in self.waiters if not w.future.done())
+
+    def to_dict(self) -> Dict[str, Any]:
+        m = self.metrics
+        return {
+            "rpm": self.requests.capacity if self.requests else None,
+            "tpm": self.tokens.capacity if self.tokens else None,
+            "queue_depth": self.depth(),
+            "max_queue_depth": m.max_depth,
+            "acquired": m.acquired,
+            "queued": m.queued,
+            "timeouts": m.timeouts,
+            "avg_wait_ms": round(m.total_wait_ms / m.acquired, 1) if m.acquired else None,
+            "max_wait_ms": round(m.max_wait_ms, 1),
+        }
+
+
+class LLMRateLimiter:
+    """
+    Per provider/model limiter registry
+
+    Usage:
+        limiter = LLMRateLimiter(max_wait=10.0)
+        await limiter.acquire(provider_config, tokens=1200,
+                              priority=PRIORITY_INTERACTIVE)
+    """
+
+    def __init__(self, enabled: bool = True, max_wait: float = 10.0):
+        self.enabled = enabled
+        self.max_wait = max_wait
+        self.limiters: Dict[str, ProviderLimiter] = {}
+        self._seq = itertools.count()
+
+    def limiter(self, provider_config: Dict[str, Any]) -> Optional[ProviderLimiter]:
+        rpm = provider_config.get("rpm")
+        tpm = provider_config.get("tpm")
+        if not (rpm or tpm):
+            return None
+        key = f"{provider_config['provider']}/{provider_config['model']}"
+        if key not in self.limiters:
+            self.limiters[key] = ProviderLimiter(rpm, tpm)
+        return self.limiters[key]
+
+    async def acquire(
+        self,
+        provider_config: Dict[str, Any],
+        tokens: float,
+        priority: int = PRIORITY_INTERACTIVE,
+        max_wait: Optional[float] = None
+    ) -> float:
+        """Wait for capacity; returns the seconds spent waiting"""
+        limiter = self.limiter(provider_config) if self.enabled else None
+        if limiter is None:
+            return 0.0
+
+        now = time.monotonic()
+        if not limiter.depth() and limiter.wait_time(tokens, now) == 0:
+            limiter.take(tokens, now)
+            limiter.metrics.record_wait(0.0)
+            return 0.0
+
+        waiter = _Waiter(
+            priority, next(self._seq), tokens,
+            asyncio.get_running_loop().create_future(), now
+        )
+        heapq.heappush(limiter.waiters, waiter)
+        limiter.metrics.queued += 1
+        limiter.metrics.max_depth = max(limiter.metrics.max_depth, limiter.depth())
+        self._ensure_drainer(limiter)
+
+        timeout = self.max_wait if max_wait is None else max_wait
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                limiter.metrics.timeouts += 1
+                raise RateLimitTimeout(
+                    f"No {provider_config['provider']}/{provider_config['model']} "
+                    f"capacity within {timeout:.1f}s"
+                )
+        except asyncio.CancelledError:
+            waiter.future.cancel()
+            raise
+
+        waited = time.monotonic() - waiter.enqueued
+        limiter.metrics.record_wait(waited * 1000)
+        return waited
+
+    def _ensure_drainer(self, limiter: ProviderLimiter) -> None:
+        if limiter._drainer is None or limiter._drainer.done():
+            limiter._drainer = asyncio.get_running_loop().create_task(
+                self._drain(limiter)
+            )
+
+    async def _drain(self, limiter: ProviderLimiter) -> None:
+        """Grant capacity to queued waiters in priority order"""
+        while limiter.waiters:
+            head = limiter.waiters[0]
+            if head.future.done():  # Timed out or cancelled
+                heapq.heappop(limiter.waiters)
+                continue
+            now = time.monotonic()
+            wait = limiter.wait_time(head.tokens, now)
+            if wait > 0:
+                # Re-check at least every 100 ms so abandoned heads are dropped
+                await asyncio.sleep(min(wait, 0.1))
+                continue
+            heapq.heappop(limiter.waiters)
+            limiter.take(head.tokens, now)
+            head.future.set_result(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_wait_seconds": self.max_wait,
+            "providers": {key: l.to_dict() for key, l in self.limiters.items()},
+        }
+
+
+def estimate_tokens(prompt: str, system_prompt: Optional[str], max_tokens: int) -> int:
+    """Rough token cost of a request (~4 characters per token plus the completion)"""
+    chars = len(prompt) + len(system_prompt or "")
+    return chars // 4 + max_tokens
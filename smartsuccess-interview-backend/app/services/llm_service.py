@@ -10,15 +10,39 @@ FIXES APPLIED:
                     All agents use base._call_llm() which routes through here.
 - E-A2 (Sprint 1): Graceful degradation when GPU/LLM unavailable
 - F-A3 (Sprint 5): Usage logging for cost tracking
+
+Features:
+- Pooled keep-alive HTTP clients (http_pool.py)
+- generate_stream() for SSE endpoints
+- Circuit breakers and latency-aware routing (provider_health.py)
+- Optional hedged requests (llm_hedging.py)
+- Per-model rate limits with priority queueing (llm_rate_limiter.py)
+- Response cache for low-temperature calls (llm_cache.py)
+- LLM_PROVIDER=stub for offline, deterministic responses (app/stubs)
 """
 
 import os
+import json
+import time
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 from datetime import date
-import httpx
+from openai import AsyncOpenAI
 
 from app.config import settings
+from app.services.http_pool import get_http_pool
+from app.services.llm_cache import get_llm_cache, response_key
+from app.services.llm_hedging import HedgePolicy
+from app.services.llm_rate_limiter import (
+    LLMRateLimiter,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    estimate_tokens
+)
+from app.services.provider_health import BreakerConfig, Permit, ProviderHealth
+from app.services.request_timing import STAGE_LLM, timed
+from app.stubs import get_stub_llm
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +60,7 @@ class LLMService:
         self.openai_api_key = settings.openai_api_key
         self.groq_api_key = settings.groq_api_key
         self.cost_optimized = settings.cost_optimized_mode
+        self.stub = get_stub_llm() if settings.llm_provider == "stub" else None
 
         # Track daily usage for Gemini free tier
         self._daily_requests = 0
@@ -54,100 +79,478 @@ class LLMService:
             "https://generativelanguage.googleapis.com/v1beta"
         )
 
+        # Circuit breakers + adaptive ordering for the fallback chain
+        self.health = ProviderHealth(
+            BreakerConfig(
+                window_size=settings.llm_breaker_window,
+                min_calls=settings.llm_breaker_min_calls,
+                failure_rate_threshold=settings.llm_breaker_failure_rate,
+                slow_call_ms=settings.llm_breaker_slow_call_ms,
+                open_seconds=settings.llm_breaker_open_seconds
+            ),
+            adaptive=settings.llm_adaptive_routing
+        )
+        self.hedging = HedgePolicy(
+            enabled=settings.llm_hedge_enabled,
+            percentile=settings.llm_hedge_percentile,
+            default_delay_ms=settings.llm_hedge_default_delay_ms,
+            max_per_minute=settings.llm_hedge_max_per_minute,
+            allow_openai=settings.llm_hedge_allow_openai
+        )
+        self.rate_limiter = LLMRateLimiter(
+            enabled=settings.llm_rate_limit_enabled,
+            max_wait=settings.llm_queue_max_wait_seconds
+        )
+        self.cache = get_llm_cache()
+
+    @timed(STAGE_LLM)
     async def generate(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 1024,
-        force_provider: Optional[str] = None
+        force_provider: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        cache: Optional[bool] = None
     ) -> str:
         """
         Generate text using configured provider
 
         Default: OpenAI (existing behavior)
         Cost-optimized: Gemini (when cost_optimized_mode=True)
+
+        `priority` orders this call in provider rate-limit queues
+        (PRIORITY_INTERACTIVE for live turns, PRIORITY_BACKGROUND otherwise).
+        `cache` opts in/out of the response cache; by default only calls at
+        or below LLM_CACHE_MAX_TEMPERATURE are cached.
         """
-        # Default behavior: Use OpenAI (existing)
-        if not self.cost_optimized and not force_provider:
-            return await self._generate_openai(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                model=settings.llm_model,
-                temperature=temperature,
-                max_tokens=max_tokens
+        scope = self._cache_scope(force_provider)
+        use_cache = scope is not None and self.cache.should_cache(temperature, cache)
+        if use_cache:
+            key = response_key(
+                prompt, system_prompt, temperature, max_tokens, scope
+            )
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        result = await self._generate_uncached(
+            prompt, system_prompt, temperature, max_tokens,
+            force_provider, priority
+        )
+        if use_cache:
+            await self.cache.put(key, result)
+        return result
+
+    async def _generate_uncached(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        force_provider: Optional[str],
+        priority: int
+    ) -> str:
+        request = {
+            "prompt": prompt,
+            "system_prompt": system_prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+
+        tokens = estimate_tokens(prompt, system_prompt, max_tokens)
+
+        # Default behavior: Use OpenAI (existing), within its rate limits
+        if not self._routed(force_provider):
+            return await self._attempt(
+                self._default_provider(), request, tokens, priority
             )
 
         # Cost-optimized mode: Try Gemini first
         self._check_daily_reset()
-        providers = self._get_provider_order(force_provider)
+        providers = self.health.route(self._get_provider_order(force_provider))
 
         last_error = None
+        tried: List[Dict] = []
         for provider_config in providers:
+            if provider_config in tried:
+                continue
+            permit = self.health.allow(provider_config)
+            if permit is None:
+                continue
+            tried.append(provider_config)
+
+            backup = self.hedging.candidate(
+                providers, provider_config, tried, self.health
+            )
             try:
-                provider = provider_config["provider"]
-                model = provider_config["model"]
-
-                if provider == "gemini":
-                    result = await self._generate_gemini(
-                        prompt=prompt,
-                        system_prompt=system_prompt,
-                        model=model,
-                        temperature=temperature,
-                        max_tokens=max_tokens
-                    )
-                elif provider == "groq":
-                    result = await self._generate_groq(
-                        prompt=prompt,
-                        system_prompt=system_prompt,
-                        model=model,
-                        temperature=temperature,
-                        max_tokens=max_tokens
-                    )
-                elif provider == "openai":
-                    result = await self._generate_openai(
-                        prompt=prompt,
-                        system_prompt=system_prompt,
-                        model=model,
-                        temperature=temperature,
-                        max_tokens=max_tokens
+                if backup is None:
+                    return await self._attempt(
+                        provider_config, request, tokens, priority, permit
                     )
-                else:
-                    continue
+                self.hedging.stats.eligible += 1
+                return await self._hedged(
+                    provider_config, permit, backup, request, tried, tokens, priority
+                )
+            except Exception as e:
+                last_error = e
+                continue
+
+        # FIX: E-A2 (Sprint 1) — Graceful error message
+        raise Exception(
+            f"All LLM providers failed. "
+            f"Last error: {last_error or 'circuit open for every provider'}. "
+            f"Tried {len(providers)} providers. "
+            f"Check API keys and rate limits."
+        )
+
+    async def _attempt(
+        self,
+        provider_config: Dict,
+        request: Dict[str, Any],
+        tokens: int,
+        priority: int,
+        permit: Optional[Permit] = None
+    ) -> str:
+        """
+        One call to one provider: waits for rate-limit capacity, then
+        records the outcome in the provider's circuit breaker under the
+        `permit` from health.allow()
+        """
+        provider = provider_config["provider"]
+        model = provider_config["model"]
+        try:
+            await self.rate_limiter.acquire(provider_config, tokens, priority)
+        except BaseException:
+            self.health.release(provider_config, permit)
+            raise
+
+        started = time.perf_counter()
+        try:
+            if provider == "gemini":
+                result = await self._generate_gemini(model=model, **request)
+            elif provider == "groq":
+                result = await self._generate_groq(model=model, **request)
+            elif provider == "openai":
+                result = await self._generate_openai(model=model, **request)
+            elif provider == "stub":
+                result = await self.stub.generate(**request)
+            else:
+                raise Exception(f"Unknown LLM provider: {provider}")
+        except asyncio.CancelledError:
+            self.health.release(provider_config, permit)
+            raise
+        except Exception as e:
+            self.health.record(
+                provider_config, False, (time.perf_counter() - started) * 1000, permit
+            )
+            logger.warning(f"LLM {provider}/{model} failed: {e}")
+            raise
 
-                # FIX: F-A3 — Track usage
-                self._provider_usage[provider] = (
-                    self._provider_usage.get(provider, 0) + 1
+        self.health.record(
+            provider_config, True, (time.perf_counter() - started) * 1000, permit
+        )
+        # FIX: F-A3 — Track usage
+        self._provider_usage[provider] = (
+            self._provider_usage.get(provider, 0) + 1
+        )
+        return result
+
+    async def _hedged(
+        self,
+        primary: Dict,
+        primary_permit: Permit,
+        backup: Dict,
+        request: Dict[str, Any],
+        tried: List[Dict],
+        tokens: int,
+        priority: int
+    ) -> str:
+        """
+        Call `primary`; if it is still running after its hedge delay, also
+        call `backup` and return the first success, cancelling the other
+        """
+        primary_task = asyncio.create_task(
+            self._attempt(primary, request, tokens, priority, primary_permit)
+        )
+        pending = {primary_task}
+        try:
+            done, _ = await asyncio.wait(
+                pending, timeout=self.hedging.delay_seconds(primary, self.health)
+            )
+            if done:
+                return await primary_task
+            # Budget is only spent on hedges that are actually sent
+            backup_permit = self.health.allow(backup)
+            if backup_permit is None:
+                return await primary_task
+            if not self.hedging.acquire():
+                self.health.release(backup, backup_permit)
+                return await primary_task
+
+            tried.append(backup)
+            self.hedging.stats.hedged += 1
+            backup_task = asyncio.create_task(
+                self._attempt(backup, request, tokens, priority, backup_permit)
+            )
+            pending.add(backup_task)
+            logger.info(
+                f"Hedging slow LLM {primary['provider']}/{primary['model']} "
+                f"with {backup['provider']}/{backup['model']}"
+            )
+
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
                 )
-                return result
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup_task:
+                            self.hedging.stats.hedge_wins += 1
+                        else:
+                            self.hedging.stats.primary_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @timed(STAGE_LLM)
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        force_provider: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        cache: Optional[bool] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream text deltas using the same provider selection as generate()
 
+        A provider that fails before producing any text falls through to
+        the next one in the chain. Once a delta has been yielded the error
+        is raised instead, since the caller has already shown the text.
+        A cached response is yielded as a single delta.
+        """
+        scope = self._cache_scope(force_provider)
+        use_cache = scope is not None and self.cache.should_cache(temperature, cache)
+        if use_cache:
+            key = response_key(
+                prompt, system_prompt, temperature, max_tokens, scope
+            )
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        parts = []
+        async for delta in self._stream_uncached(
+            prompt, system_prompt, temperature, max_tokens,
+            force_provider, priority
+        ):
+            parts.append(delta)
+            yield delta
+        if use_cache:
+            await self.cache.put(key, "".join(parts))
+
+    async def _stream_uncached(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        force_provider: Optional[str],
+        priority: int
+    ) -> AsyncIterator[str]:
+        routed = self._routed(force_provider)
+        if not routed:
+            providers = [self._default_provider()]
+        else:
+            self._check_daily_reset()
+            providers = self.health.route(
+                self._get_provider_order(force_provider)
+            )
+
+        tokens = estimate_tokens(prompt, system_prompt, max_tokens)
+
+        last_error = None
+        for provider_config in providers:
+            provider = provider_config["provider"]
+            model = provider_config["model"]
+            permit = None
+            if routed:
+                permit = self.health.allow(provider_config)
+                if permit is None:
+                    continue
+            try:
+                await self.rate_limiter.acquire(provider_config, tokens, priority)
             except Exception as e:
+                self.health.release(provider_config, permit)
                 last_error = e
-                logger.warning(
-                    f"LLM {provider_config['provider']}/{provider_config['model']} "
-                    f"failed: {e}"
+                continue
+
+            if provider == "gemini":
+                stream = self._stream_gemini(
+                    prompt, system_prompt, model, temperature, max_tokens
+                )
+            elif provider in ("groq", "openai"):
+                stream = self._stream_chat_completions(
+                    provider, prompt, system_prompt, model, temperature, max_tokens
+                )
+            elif provider == "stub":
+                stream = self.stub.stream(
+                    prompt, system_prompt, temperature, max_tokens
                 )
+            else:
                 continue
 
-        # FIX: E-A2 (Sprint 1) — Graceful error message
+            started = False
+            started_at = time.perf_counter()
+            try:
+                async for delta in stream:
+                    started = True
+                    yield delta
+            except (asyncio.CancelledError, GeneratorExit):
+                self.health.release(provider_config, permit)
+                raise
+            except Exception as e:
+                self.health.record(
+                    provider_config, False, (time.perf_counter() - started_at) * 1000,
+                    permit
+                )
+                if started:
+                    raise
+                last_error = e
+                logger.warning(f"LLM stream {provider}/{model} failed: {e}")
+                continue
+            finally:
+                await stream.aclose()
+
+            self.health.record(
+                provider_config, True, (time.perf_counter() - started_at) * 1000,
+                permit
+            )
+
+            # FIX: F-A3 — Track usage
+            self._provider_usage[provider] = (
+                self._provider_usage.get(provider, 0) + 1
+            )
+            if provider == "gemini":
+                self._daily_requests += 1
+            return
+
         raise Exception(
-            f"All LLM providers failed. Last error: {last_error}. "
+            f"All LLM providers failed. "
+            f"Last error: {last_error or 'circuit open for every provider'}. "
             f"Tried {len(providers)} providers. "
             f"Check API keys and rate limits."
         )
 
-    async def _generate_gemini(
+    async def _stream_chat_completions(
         self,
+        provider: str,
         prompt: str,
         system_prompt: Optional[str],
         model: str,
         temperature: float,
         max_tokens: int
-    ) -> str:
-        """Generate using Gemini API"""
+    ) -> AsyncIterator[str]:
+        """Stream from an OpenAI-compatible endpoint (OpenAI, Groq)"""
+        if provider == "openai":
+            api_key = self.openai_api_key
+            url = "https://api.openai.com/v1/chat/completions"
+        else:
+            api_key = self.groq_api_key
+            url = "https://api.groq.com/openai/v1/chat/completions"
+        if not api_key:
+            raise Exception(f"{provider} API key not configured")
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        client = get_http_pool().client(provider)
+        async with client.stream(
+            "POST",
+            url,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "stream": True
+            },
+            timeout=30.0
+        ) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                raise Exception(
+                    f"{provider} API error {response.status_code}: "
+                    f"{body[:200].decode('utf-8', 'replace')}"
+                )
+            async for data in _sse_data(response):
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or []
+                if choices:
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+
+    async def _stream_gemini(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        model: str,
+        temperature: float,
+        max_tokens: int
+    ) -> AsyncIterator[str]:
+        """Stream using Gemini streamGenerateContent (SSE)"""
         if not self.gemini_api_key:
             raise Exception("Gemini API key not configured")
 
+        url = f"{self.gemini_base_url}/models/{model}:streamGenerateContent"
+        client = get_http_pool().client("gemini")
+        async with client.stream(
+            "POST",
+            url,
+            params={"key": self.gemini_api_key, "alt": "sse"},
+            json=self._gemini_payload(
+                prompt, system_prompt, temperature, max_tokens
+            ),
+            timeout=30.0
+        ) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                raise Exception(
+                    f"Gemini API error {response.status_code}: "
+                    f"{body[:200].decode('utf-8', 'replace')}"
+                )
+            async for data in _sse_data(response):
+                chunk = json.loads(data)
+                for candidate in chunk.get("candidates", [])[:1]:
+                    for part in candidate.get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
+
+    def _gemini_payload(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int
+    ) -> Dict[str, Any]:
+        """Request body shared by generateContent and streamGenerateContent"""
         contents = []
 
         if system_prompt:
@@ -165,9 +568,7 @@ class LLMService:
             "parts": [{"text": prompt}]
         })
 
-        url = f"{self.gemini_base_url}/models/{model}:generateContent"
-
-        payload = {
+        return {
             "contents": contents,
             "generationConfig": {
                 "temperature": temperature,
@@ -187,30 +588,47 @@ class LLMService:
             ]
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                params={"key": self.gemini_api_key},
-                json=payload,
-                timeout=30.0
-            )
+    async def _generate_gemini(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        model: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """Generate using Gemini API"""
+        if not self.gemini_api_key:
+            raise Exception("Gemini API key not configured")
 
-            if response.status_code != 200:
-                raise Exception(
-                    f"Gemini API error {response.status_code}: "
-                    f"{response.text[:200]}"
-                )
+        url = f"{self.gemini_base_url}/models/{model}:generateContent"
+        payload = self._gemini_payload(
+            prompt, system_prompt, temperature, max_tokens
+        )
 
-            data = response.json()
+        client = get_http_pool().client("gemini")
+        response = await client.post(
+            url,
+            params={"key": self.gemini_api_key},
+            json=payload,
+            timeout=30.0
+        )
 
-            try:
-                text = data["candidates"][0]["content"]["parts"][0]["text"]
-                self._daily_requests += 1
-                return text
-            except (KeyError, IndexError):
-                raise Exception(
-                    f"Failed to parse Gemini response: {data}"
-                )
+        if response.status_code != 200:
+            raise Exception(
+                f"Gemini API error {response.status_code}: "
+                f"{response.text[:200]}"
+            )
+
+        data = response.json()
+
+        try:
+            text = data["candidates"][0]["content"]["parts"][0]["text"]
+            self._daily_requests += 1
+            return text
+        except (KeyError, IndexError):
+            raise Exception(
+                f"Failed to parse Gemini response: {data}"
+            )
 
     async def _generate_openai(
         self,
@@ -229,33 +647,29 @@ class LLMService:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.openai_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": model,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens
-                },
-                timeout=30.0
-            )
-
-            if response.status_code != 200:
-                raise Exception(
-                    f"OpenAI API error: {response.text[:200]}"
-                )
+        client = get_http_pool().client("openai")
+        response = await client.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {self.openai_api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            },
+            timeout=30.0
+        )
 
-            data = response.json()
-            # FIX: F-A3 — Track usage
-            self._provider_usage["openai"] = (
-                self._provider_usage.get("openai", 0) + 1
+        if response.status_code != 200:
+            raise Exception(
+                f"OpenAI API error: {response.text[:200]}"
             )
-            return data["choices"][0]["message"]["content"]
+
+        data = response.json()
+        return data["choices"][0]["message"]["content"]
 
     async def _generate_groq(
         self,
@@ -274,29 +688,66 @@ class LLMService:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.groq_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": model,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens
-                },
-                timeout=30.0
+        client = get_http_pool().client("groq")
+        response = await client.post(
+            "https://api.groq.com/openai/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {self.groq_api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            },
+            timeout=30.0
+        )
+
+        if response.status_code != 200:
+            raise Exception(
+                f"Groq API error: {response.text[:200]}"
             )
 
-            if response.status_code != 200:
-                raise Exception(
-                    f"Groq API error: {response.text[:200]}"
-                )
+        data = response.json()
+        return data["choices"][0]["message"]["content"]
+
+    def is_available(self) -> bool:
+        """Whether generate() has any provider (or the stub) to call"""
+        if not self._routed(None):
+            return bool(self.openai_api_key)
+        return bool(self._get_provider_order(None))
+
+    def _routed(self, force_provider: Optional[str]) -> bool:
+        """Whether calls go through the provider chain (breakers, routing)"""
+        return bool(self.cost_optimized or force_provider or self.stub)
+
+    def _default_provider(self) -> Dict[str, Any]:
+        """OpenAI with LLM_MODEL, rate-limited like the chain's OpenAI entry"""
+        from app.config import COST_OPTIMIZED_CONFIG
+
+        return {**COST_OPTIMIZED_CONFIG["llm"]["emergency"], "model": settings.llm_model}
+
+    def _cache_scope(self, force_provider: Optional[str]) -> Optional[str]:
+        """
+        Identity of the provider chain a call may be served by, for
+        response-cache keys; None when the call must not be cached
 
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
+        Stub responses are never cached, so a stub run cannot leave text in
+        the disk tier for later runs against real providers.
+        """
+        if self.stub:
+            return None
+        if not self._routed(force_provider):
+            return f"openai/{settings.llm_model}"
+
+        from app.config import COST_OPTIMIZED_CONFIG
+
+        chain = ",".join(
+            f"{config['provider']}/{config['model']}"
+            for config in COST_OPTIMIZED_CONFIG["llm"].values()
+        )
+        return f"{force_provider or 'cost_optimized'}:{chain}"
 
     def _get_provider_order(
         self, force_provider: Optional[str]
@@ -314,6 +765,10 @@ class LLMService:
 
         config = COST_OPTIMIZED_CONFIG["llm"]
 
+        # Offline stub replaces every provider, including forced ones
+        if self.stub:
+            return [{"provider": "stub", "model": "stub"}]
+
         if force_provider == "openai":
             return [config["emergency"]] if self.openai_api_key else []
 
@@ -364,7 +819,9 @@ class LLMService:
         self._check_daily_reset()
 
         # Determine current primary provider
-        if self.cost_optimized:
+        if self.stub:
+            primary = "stub"
+        elif self.cost_optimized:
             if self.gemini_api_key:
                 primary = "gemini"
             elif self.groq_api_key:
@@ -390,10 +847,23 @@ class LLMService:
             "groq_configured": bool(self.groq_api_key),
             "openai_configured": bool(self.openai_api_key),
             # FIX: F-A3 — Per-provider usage breakdown
-            "provider_usage": dict(self._provider_usage)
+            "provider_usage": dict(self._provider_usage),
+            "provider_health": self.health.get_stats(),
+            "hedging": self.hedging.get_stats(),
+            "rate_limits": self.rate_limiter.get_stats(),
+            "response_cache": self.cache.get_stats()
         }
 
 
+async def _sse_data(response) -> AsyncIterator[str]:
+    """Yield the payload of each `data:` line of a server-sent event stream"""
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            data = line[5:].strip()
+            if data:
+                yield data
+
+
 # Singleton
 _llm_instance: Optional[LLMService] = None
 
@@ -404,3 +874,15 @@ def get_llm_service() -> LLMService:
     if _llm_instance is None:
         _llm_instance = LLMService()
     return _llm_instance
+
+
+def get_chat_client():
+    """
+    Client for direct `chat.completions.create` calls (RAG question
+    generation): the offline stub when
+    LLM_PROVIDER=stub, otherwise AsyncOpenAI, or None without a key
+    """
+    if settings.llm_provider == "stub":
+        return get_stub_llm()
+    api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
+    return AsyncOpenAI(api_key=api_key) if api_key else None
@@ -0,0 +1,248 @@
+"""
+LLM Provider Health Tracking
+Per provider/model circuit breakers and latency-aware routing
+"""
+
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class BreakerConfig:
+    """Thresholds shared by every provider's breaker"""
+    window_size: int = 20  # Most recent outcomes considered
+    window_seconds: float = 300.0  # Outcomes older than this are dropped
+    min_calls: int = 4  # Outcomes needed before the breaker may open
+    failure_rate_threshold: float = 0.5
+    slow_call_ms: float = 10000.0  # Successful calls slower than this count as slow
+    slow_call_rate_threshold: float = 0.8
+    open_seconds: float = 30.0  # Cool-down before a half-open probe
+
+
+@dataclass(frozen=True)
+class Permit:
+    """Claim returned by allow(); `probe` is set when it holds the half-open probe"""
+    probe: Optional[int] = None
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a window of recent outcomes"""
+
+    def __init__(self, config: BreakerConfig):
+        self.config = config
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self._probe: Optional[int] = None  # Permit.probe of the probe in flight
+        self._probe_ids = itertools.count(1)
+        # (timestamp, ok, latency_ms)
+        self._outcomes: Deque[Tuple[float, bool, float]] = deque(
+            maxlen=config.window_size
+        )
+
+    def available(self, now: Optional[float] = None) -> bool:
+        """Whether a request could be sent now (does not claim the probe)"""
+        now = time.monotonic() if now is None else now
+        if self.state == OPEN:
+            return now - self.opened_at >= self.config.open_seconds
+        if self.state == HALF_OPEN:
+            return self._probe is None
+        return True
+
+    def allow(self, now: Optional[float] = None) -> Optional[Permit]:
+        """A permit if a request may be sent (claims the probe when half-open)"""
+        now = time.monotonic() if now is None else now
+        if not self.available(now):
+            return None
+        if self.state == CLOSED:
+            return Permit()
+        self.state = HALF_OPEN
+        self._probe = next(self._probe_ids)
+        return Permit(probe=self._probe)
+
+    def release(self, permit: Optional[Permit]) -> None:
+        """Give back a half-open probe that ended without an outcome"""
+        if permit is not None and permit.probe is not None and permit.probe == self._probe:
+            self._probe = None
+
+    def record(
+        self,
+        ok: bool,
+        latency_ms: float,
+        now: Optional[float] = None,
+        permit: Optional[Permit] = None
+    ) -> None:
+        """Add an outcome; while half-open only the probe's permit decides the state"""
+        now = time.monotonic() if now is None else now
+        self._outcomes.append((now, ok, latency_ms))
+
+        if self.state == HALF_OPEN:
+            if permit is None or permit.probe is None or permit.probe != self._probe:
+                return  # Started before the probe
+            self._probe = None
+            if ok:
+                self.state = CLOSED
+                self._outcomes.clear()
+                self._outcomes.append((now, ok, latency_ms))
+            else:
+                self._open(now)
+            return
+
+        if self.state == CLOSED and self._should_open(now):
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened_at = now
+        self.times_opened += 1
+
+    def _window(self, now: float) -> List[Tuple[float, bool, float]]:
+        cutoff = now - self.config.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+        return list(self._outcomes)
+
+    def _should_open(self, now: float) -> bool:
+        window = self._window(now)
+        if len(window) < self.config.min_calls:
+            return False
+        failures = sum(1 for _, ok, _ in window if not ok)
+        slow = sum(
+            1 for _, ok, latency in window
+            if ok and latency >= self.config.slow_call_ms
+        )
+        return (
+            failures / len(window) >= self.config.failure_rate_threshold
+            or slow / len(window) >= self.config.slow_call_rate_threshold
+        )
+
+    def success_rate(self, now: Optional[float] = None) -> Optional[float]:
+        window = self._window(time.monotonic() if now is None else now)
+        if not window:
+            return None
+        return sum(1 for _, ok, _ in window if ok) / len(window)
+
+    def success_count(self, now: Optional[float] = None) -> int:
+        window = self._window(time.monotonic() if now is None else now)
+        return sum(1 for _, ok, _ in window if ok)
+
+    def latency_percentile_ms(
+        self, percentile: float, now: Optional[float] = None
+    ) -> Optional[float]:
+        """Nearest-rank percentile of successful-call latency"""
+        window = self._window(time.monotonic() if now is None else now)
+        latencies = sorted(latency for _, ok, latency in window if ok)
+        if not latencies:
+            return None
+        rank = int(percentile / 100 * len(latencies))
+        return latencies[min(len(latencies) - 1, rank)]
+
+    def p95_latency_ms(self, now: Optional[float] = None) -> Optional[float]:
+        return self.latency_percentile_ms(95, now)
+
+    def to_dict(self) -> Dict[str, Any]:
+        success_rate = self.success_rate()
+        p95 = self.p95_latency_ms()
+        return {
+            "state": self.state,
+            "times_opened": self.times_opened,
+            "window_calls": len(self._outcomes),
+            "success_rate": round(success_rate, 3) if success_rate is not None else None,
+            "p95_latency_ms": round(p95, 1) if p95 is not None else None,
+        }
+
+
+class ProviderHealth:
+    """
+    Registry of breakers keyed by "provider/model"
+
+    Usage:
+        health = ProviderHealth(BreakerConfig(open_seconds=30))
+        for config in health.route(providers):
+            permit = health.allow(config)
+            if permit is None:
+                continue  # Another request holds the half-open probe
+            try:
+                ...
+                health.record(config, True, elapsed_ms, permit)
+            except Exception:
+                health.record(config, False, elapsed_ms, permit)
+    """
+
+    def __init__(self, config: Optional[BreakerConfig] = None, adaptive: bool = True):
+        self.config = config or BreakerConfig()
+        self.adaptive = adaptive
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.skipped = 0  # Attempts avoided because a breaker was open
+
+    @staticmethod
+    def key(provider_config: Dict[str, Any]) -> str:
+        return f"{provider_config['provider']}/{provider_config['model']}"
+
+    def breaker(self, provider_config: Dict[str, Any]) -> CircuitBreaker:
+        key = self.key(provider_config)
+        if key not in self.breakers:
+            self.breakers[key] = CircuitBreaker(self.config)
+        return self.breakers[key]
+
+    def route(self, providers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order the chain by health (adaptive) and drop providers whose breaker is open"""
+        ordered = self.rank(providers) if self.adaptive else list(providers)
+        available = []
+        for provider_config in ordered:
+            if self.breaker(provider_config).available():
+                available.append(provider_config)
+            else:
+                self.skipped += 1
+        return available
+
+    def allow(self, provider_config: Dict[str, Any]) -> Optional[Permit]:
+        """Claim an attempt right before sending it (None if refused)"""
+        return self.breaker(provider_config).allow()
+
+    def rank(self, providers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Sort by (paid tier, success rate, p95 latency). Providers without
+        samples sort first within their tier so they get measured; ties
+        keep the configured order.
+        """
+        def sort_key(item):
+            index, provider_config = item
+            breaker = self.breaker(provider_config)
+            success_rate = breaker.success_rate()
+            p95 = breaker.p95_latency_ms()
+            return (
+                provider_config["provider"] == "openai",
+                -round(success_rate, 1) if success_rate is not None else -1.0,
+                p95 if p95 is not None else 0.0,
+                index,
+            )
+
+        return [p for _, p in sorted(enumerate(providers), key=sort_key)]
+
+    def record(
+        self,
+        provider_config: Dict[str, Any],
+        ok: bool,
+        latency_ms: float,
+        permit: Optional[Permit] = None
+    ) -> None:
+        self.breaker(provider_config).record(ok, latency_ms, permit=permit)
+
+    def release(self, provider_config: Dict[str, Any], permit: Optional[Permit]) -> None:
+        """Give back a claimed attempt that was cancelled without an outcome"""
+        self.breaker(provider_config).release(permit)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "adaptive_routing": self.adaptive,
+            "skipped_open": self.skipped,
+            "breakers": {key: b.to_dict() for key, b in self.breakers.items()},
+        }
@@ -0,0 +1,304 @@
+"""
+Per-Request Stage Timing
+Server-Timing header and GET /metrics histograms per stage (LLM, embedding, ...)
+
+Usage:
+    @timed(STAGE_LLM)                 # sync, async or async-generator function
+    async def generate(...): ...
+
+    with span(STAGE_VECTOR_SEARCH):   # ad-hoc block
+        ...
+"""
+
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+from starlette.datastructures import MutableHeaders
+
+STAGE_LLM = "llm"
+STAGE_EMBEDDING = "embedding"
+STAGE_VECTOR_SEARCH = "vector_search"
+STAGE_PERSISTENCE = "persistence"
+STAGE_JSON_PARSE = "json_parse"
+STAGE_APP = "app"  # Request time not covered by any other stage
+STAGE_TOTAL = "total"
+
+# Histogram bucket upper bounds (ms); the last bucket is unbounded
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Not timed: probes, the metrics endpoint itself, docs
+SKIP_PATHS = frozenset({
+    "/", "/health", "/health/ready", "/health/live", "/metrics",
+    "/docs", "/redoc", "/openapi.json",
+})
+
+_current: ContextVar[Optional["RequestTiming"]] = ContextVar(
+    "request_timing", default=None
+)
+_active: ContextVar[FrozenSet[str]] = ContextVar(
+    "request_timing_active", default=frozenset()
+)
+
+
+class RequestTiming:
+    """Stage totals for one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, List[float]] = {}  # stage -> [total_ms, calls]
+
+    def add(self, stage: str, duration_ms: float) -> None:
+        entry = self.stages.setdefault(stage, [0.0, 0])
+        entry[0] += duration_ms
+        entry[1] += 1
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def breakdown(self) -> Dict[str, float]:
+        """Stage durations plus `app` (uncovered time) and `total`"""
+        total = self.elapsed_ms()
+        durations = {stage: entry[0] for stage, entry in self.stages.items()}
+        durations[STAGE_APP] = max(0.0, total - sum(durations.values()))
+        durations[STAGE_TOTAL] = total
+        return durations
+
+    def header_value(self) -> str:
+        """Server-Timing header, e.g. `llm;dur=812.4;desc="2 calls", total;dur=830.1`"""
+        calls = {stage: entry[1] for stage, entry in self.stages.items()}
+        parts = []
+        for stage, duration in self.breakdown().items():
+            part = f"{stage};dur={duration:.1f}"
+            if stage in calls:
+                part += f';desc="{calls[stage]} call{"s" if calls[stage] != 1 else ""}"'
+            parts.append(part)
+        return ", ".join(parts)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """Timing of the request being handled, if any"""
+    return _current.get()
+
+
+@contextmanager
+def span(stage: str):
+    """Attribute the enclosed block to `stage` of the current request"""
+    timing = _current.get()
+    active = _active.get()
+    if timing is None or stage in active:
+        yield
+        return
+    token = _active.set(active | {stage})
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(stage, (time.perf_counter() - started) * 1000)
+        _active.reset(token)
+
+
+def timed(stage: str):
+    """Decorator form of span() for sync, async and async-generator functions"""
+    def decorate(func):
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def stream_wrapper(*args, **kwargs):
+                timing = _current.get()
+                if timing is None or stage in _active.get():
+                    async for item in func(*args, **kwargs):
+                        yield item
+                    return
+                # Only time spent producing items counts, not the consumer's
+                # time between them; the ContextVar cannot be held across yields
+                agen = func(*args, **kwargs)
+                elapsed = 0.0
+                try:
+                    while True:
+                        started = time.perf_counter()
+                        try:
+                            item = await agen.__anext__()
+                        except StopAsyncIteration:
+                            break
+                        finally:
+                            elapsed += time.perf_counter() - started
+                        yield item
+                finally:
+                    await agen.aclose()
+                    timing.add(stage, elapsed * 1000)
+            return stream_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (ms)"""
+
+    def __init__(self, buckets: Iterable[float] = BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value_ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th value (capped at max)"""
+        if not self.count:
+            return None
+        rank = max(1, int(q * self.count + 0.999999))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = self.buckets[i] if i < len(self.buckets) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 2) if self.count else None,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 2) if self.count else None,
+            "buckets": {
+                **{f"le_{bound:g}": count for bound, count in zip(self.buckets, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class RouteStats:
+    """Request count, errors and per-stage histograms for one route"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0  # 5xx responses
+        self.stages: Dict[str, Histogram] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "stages": {stage: hist.to_dict() for stage, hist in self.stages.items()},
+        }
+
+
+class RequestMetrics:
+    """Thread-safe per-route aggregation of RequestTiming breakdowns"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, RouteStats] = {}
+        self._started = time.time()
+
+    def record(self, route: str, status: int, timing: RequestTiming) -> None:
+        breakdown = timing.breakdown()
+        with self._lock:
+            stats = self._routes.setdefault(route, RouteStats())
+            stats.requests += 1
+            if status >= 500:
+                stats.errors += 1
+            for stage, duration in breakdown.items():
+                stats.stages.setdefault(stage, Histogram()).observe(duration)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "uptime_seconds": round(time.time() - self._started, 1),
+                "routes": {
+                    route: stats.to_dict() for route, stats in sorted(self._routes.items())
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+class StageTimingMiddleware:
+    """ASGI middleware: starts a RequestTiming per request and reports it"""
+
+    def __init__(
+        self,
+        app,
+        metrics: Optional[RequestMetrics] = None,
+        header: bool = True,
+        skip_paths: FrozenSet[str] = SKIP_PATHS
+    ):
+        self.app = app
+        self.metrics = metrics or get_request_metrics()
+        self.header = header
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        status = 500  # Unless a response starts
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.header:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", timing.header_value()
+                    )
+            await send(message)
+
+        token = _current.set(timing)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self.metrics.record(route_key(scope), status, timing)
+
+
+def route_key(scope) -> str:
+    """`METHOD /path/{template}`; unmatched paths share one key"""
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "<unmatched>"
+    return f"{scope['method']} {path}"
+
+
+# Singleton instance
+_metrics_instance: Optional[RequestMetrics] = None
+
+
+def get_request_metrics() -> RequestMetrics:
+    """Get or create the process-wide request metrics"""
+    global _metrics_instance
+    if _metrics_instance is None:
+        _metrics_instance = RequestMetrics()
+    return _metrics_instance
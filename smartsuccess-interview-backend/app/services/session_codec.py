@@ -0,0 +1,76 @@
+"""
+Session Codec
+Typed, schema-versioned JSON for persisted interview sessions
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict
+
+from pydantic import ValidationError
+
+from app.models import InterviewSession
+
+logger = logging.getLogger(__name__)
+
+
+class SessionDecodeError(ValueError):
+    """Stored session JSON that is not a valid InterviewSession"""
+
+
+# Bump when a stored field changes meaning or shape, and register a
+# migration from the previous version in _MIGRATIONS
+SCHEMA_VERSION = 1
+SCHEMA_KEY = "_schema"
+
+# Version 0: files written before versioning (same fields as version 1)
+_MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+_PREFIX = '{"%s":%d,' % (SCHEMA_KEY, SCHEMA_VERSION)
+
+
+def encode_session(session: InterviewSession, **extra: Any) -> str:
+    """JSON for a session: schema version first, then fields, then `extra` keys"""
+    body = session.model_dump_json()
+    tail = "".join(
+        f",{json.dumps(key)}:{json.dumps(value, default=str)}"
+        for key, value in extra.items()
+    )
+    return _PREFIX + body[1:-1] + tail + "}"
+
+
+def decode_session(text: str) -> InterviewSession:
+    """Session model from stored JSON; raises SessionDecodeError"""
+    if text.startswith(_PREFIX):
+        try:
+            return InterviewSession.model_validate_json(text)
+        except ValidationError:
+            pass  # Reported by the slow path
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise SessionDecodeError(f"invalid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise SessionDecodeError(f"expected an object, got {type(data).__name__}")
+    return session_from_dict(data)
+
+
+def session_from_dict(data: Dict[str, Any]) -> InterviewSession:
+    """Session model from a stored dict, upgraded to the current schema"""
+    version = data.get(SCHEMA_KEY, 0)
+    if version > SCHEMA_VERSION:
+        logger.warning(
+            f"Session {data.get('session_id')} has schema {version}, "
+            f"newer than {SCHEMA_VERSION}; unknown fields are dropped"
+        )
+    while version < SCHEMA_VERSION:
+        migrate = _MIGRATIONS.get(version)
+        if migrate is not None:
+            data = migrate(data)
+        version += 1
+    try:
+        return InterviewSession.model_validate(data)
+    except ValidationError as e:
+        raise SessionDecodeError(
+            f"schema {data.get(SCHEMA_KEY, 0)}: {e.error_count()} invalid fields"
+        ) from e
@@ -10,37 +10,266 @@ Design decisions:
 - Auto-cleanup of sessions older than 24 hours
 - Graceful degradation: if disk fails, falls back to memory-only
 - Thread-safe via file-level atomicity (write-then-rename)
+- Per-turn deltas appended to `{id}.journal.jsonl`, compacted into `{id}.json`
+- Saves deferred and coalesced while the write-behind writer runs
+- SESSION_BACKEND=sqlite: one shared, indexed database (session_sqlite.py)
+- Bodies load lazily behind `_index.jsonl`, LRU-capped in memory
+- Loaded as typed InterviewSession models (session_codec.py)
 """
 
 import json
 import os
 import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 
+from app.config import settings
+from app.services.request_timing import STAGE_PERSISTENCE, timed
+from app.services.session_codec import (
+    SessionDecodeError, decode_session, encode_session, session_from_dict
+)
+from app.services.session_sqlite import get_sqlite_backend, session_row
+from app.services.session_write_behind import WriteOps, get_session_writer
+
 logger = logging.getLogger(__name__)
 
 # Default session directory
 SESSION_DIR = Path(os.getenv("SESSION_DATA_DIR", "data/sessions"))
 
+JOURNAL_SUFFIX = ".journal.jsonl"
+INDEX_FILE = "_index.jsonl"
+
+# Session fields kept in the index (and used by query())
+INDEX_FIELDS = ("user_id", "interview_type", "phase", "created_at", "completed_at")
+
+
+@dataclass
+class JournalState:
+    """What is already on disk for one journaled session"""
+    lengths: Dict[str, int]  # list field -> items written
+    fields: Dict[str, Any]  # other field -> last written JSON value
+    seq: int = 0  # Last record sequence number
+    records: int = 0  # Records since the last snapshot
+
+
+def replay_journal(data: Dict[str, Any], lines, base_seq: int = 0) -> int:
+    """
+    Apply journal records newer than `base_seq` to a snapshot dict.
+    Returns the last sequence number seen.
+    """
+    seq = base_seq
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning(f"Ignoring torn journal record for {data.get('session_id')}")
+            break
+        if record["seq"] <= seq:
+            continue
+        seq = record["seq"]
+        if record["op"] == "append":
+            data.setdefault(record["field"], []).append(record["value"])
+        elif record["op"] == "set":
+            data[record["field"]] = record["value"]
+    return seq
+
+
+def _field(session: Any, name: str) -> Any:
+    """Field of a model or dict session, with enums as their values"""
+    value = session.get(name) if isinstance(session, dict) else getattr(session, name, None)
+    value = getattr(value, "value", value)
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def session_meta(session: Any) -> Dict[str, Any]:
+    """Index entry for a model or dict session"""
+    return {name: _field(session, name) for name in INDEX_FIELDS}
+
+
+@timed(STAGE_PERSISTENCE)
+def read_session_file(session_dir: Path, session_id: str) -> Tuple[Any, int]:
+    """
+    Session model with its journal replayed, and the last journal seq applied
+    (0 without a journal: the next snapshot starts a new one).
+    """
+    with open(session_dir / f"{session_id}.json") as fp:
+        text = fp.read()
+    journal_path = session_dir / f"{session_id}{JOURNAL_SUFFIX}"
+    if not journal_path.exists():
+        return decode_session(text), 0
+    data = json.loads(text)
+    with open(journal_path) as fp:
+        seq = replay_journal(data, fp, data.get("_journal_seq", 0))
+    return session_from_dict(data), seq
+
+
+class SessionIndex:
+    """
+    Metadata of every session in one directory, shared by the stores using it.
+    
+    `entries` reflects what has been written: write() runs after the session
+    file operations it describes (in the session writer thread, if running).
+    """
+    
+    def __init__(self, session_dir: Path):
+        self.session_dir = session_dir
+        self.path = session_dir / INDEX_FILE
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.lines = 0
+        self._lock = threading.Lock()
+        self.load()
+    
+    @timed(STAGE_PERSISTENCE)
+    def load(self):
+        """Read the index, reconciling it with the session files on disk."""
+        files = {
+            entry.name[:-5] for entry in os.scandir(self.session_dir)
+            if entry.name.endswith(".json")
+        }
+        entries: Dict[str, Dict[str, Any]] = {}
+        lines = 0
+        torn = False
+        if self.path.exists():
+            with open(self.path) as fp:
+                for line in fp:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        torn = True  # Last line of a crashed append
+                        break
+                    lines += 1
+                    session_id = record.pop("id")
+                    if record.get("deleted"):
+                        entries.pop(session_id, None)
+                    else:
+                        entries[session_id] = record
+        
+        live = {sid: meta for sid, meta in entries.items() if sid in files}
+        unindexed = files - live.keys()
+        for session_id in unindexed:
+            try:
+                session, _ = read_session_file(self.session_dir, session_id)
+                live[session_id] = session_meta(session)
+            except Exception as e:
+                logger.warning(f"Skipping corrupted session file {session_id}.json: {e}")
+        
+        with self._lock:
+            self.entries = live
+            self.lines = lines
+            if torn or unindexed or len(live) != len(entries):
+                self._rewrite()
+        if unindexed:
+            logger.info(f"Indexed {len(unindexed)} session files.")
+    
+    def write(self, records: List[Dict[str, Any]]):
+        """Append entries (`{"id", ...fields}`) or tombstones (`{"id", "deleted"}`)."""
+        with self._lock:
+            for record in records:
+                record = dict(record)
+                session_id = record.pop("id")
+                if record.get("deleted"):
+                    self.entries.pop(session_id, None)
+                else:
+                    self.entries[session_id] = record
+            if self.lines + len(records) > 2 * len(self.entries) + 100:
+                self._rewrite()
+                return
+            with open(self.path, "a") as fp:
+                fp.write("".join(json.dumps(r) + "\n" for r in records))
+            self.lines += len(records)
+    
+    def _rewrite(self):
+        """Compact to one line per live session (caller holds the lock)."""
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as fp:
+            for session_id, meta in self.entries.items():
+                fp.write(json.dumps({"id": session_id, **meta}) + "\n")
+        tmp_path.rename(self.path)
+        self.lines = len(self.entries)
+    
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(session_id)
+    
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            return list(self.entries.items())
+    
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.entries
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+# One index per session directory, shared by every store using it
+_indexes: Dict[str, SessionIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_session_index(session_dir: Path) -> SessionIndex:
+    """Get or create the index of a session directory"""
+    key = str(Path(session_dir).resolve())
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = SessionIndex(Path(session_dir))
+        return _indexes[key]
+
 
 class PersistentSessionStore:
     """
-    File-backed session store with in-memory cache.
+    File-backed session store with an LRU in-memory cache.
     
     Drop-in replacement for `Dict[str, InterviewSession]`.
     Supports dict-like access: store[session_id], store.get(session_id), etc.
     """
     
-    def __init__(self, session_dir: Optional[Path] = None):
-        self.session_dir = session_dir or SESSION_DIR
-        self._cache: Dict[str, Any] = {}
+    def __init__(
+        self,
+        session_dir: Optional[Path] = None,
+        journal: Optional[bool] = None,
+        compact_every: Optional[int] = None,
+        backend: Optional[str] = None,
+        sqlite_path: Optional[str] = None,
+        max_cached: Optional[int] = None
+    ):
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self.max_cached = (
+            settings.session_cache_max_sessions if max_cached is None else max_cached
+        )
+        self.loads = 0  # Bodies read from disk
+        self.evictions = 0
+        self._unsaved: set = set()  # Last write failed; never evicted
+        self.db = None
+        self.index: Optional[SessionIndex] = None
+        if (backend or settings.session_backend) == "sqlite":
+            self.db = get_sqlite_backend(sqlite_path or settings.session_sqlite_path)
+            self.session_dir = None
+            journal = False
+        else:
+            self.session_dir = Path(session_dir) if session_dir else SESSION_DIR
+        self.journal = settings.session_journal_enabled if journal is None else journal
+        self.compact_every = compact_every or settings.session_journal_compact_every
+        self.flush_on_complete = settings.session_flush_on_complete
+        self._journal_state: Dict[str, JournalState] = {}
+        self._journal_seq: Dict[str, int] = {}  # Replayed seq, for sessions not yet re-snapshotted
         self._ensure_directory()
         self._load_existing()
     
+    @property
+    def persistent(self) -> bool:
+        return self.db is not None or self.session_dir is not None
+    
     def _ensure_directory(self):
         """Create session directory if it doesn't exist."""
+        if self.session_dir is None:
+            return
         try:
             self.session_dir.mkdir(parents=True, exist_ok=True)
         except OSError as e:
@@ -49,136 +278,417 @@ class PersistentSessionStore:
             self.session_dir = None
     
     def _load_existing(self):
-        """Load existing sessions from disk on startup."""
-        if not self.session_dir:
-            return
-        
-        loaded = 0
-        for f in self.session_dir.glob("*.json"):
+        """Open the session index on startup; bodies are loaded on first access."""
+        if self.session_dir:
             try:
-                with open(f) as fp:
-                    data = json.load(fp)
-                session_id = data.get("session_id", f.stem)
-                self._cache[session_id] = data
-                loaded += 1
-            except Exception as e:
-                logger.warning(f"Skipping corrupted session file {f}: {e}")
-        
-        if loaded > 0:
-            logger.info(f"Loaded {loaded} existing sessions from disk.")
+                self.index = get_session_index(self.session_dir)
+            except OSError as e:
+                logger.warning(f"Cannot read session index in {self.session_dir}: {e}")
+    
+    def _load(self, session_id: str) -> Optional[Any]:
+        """Read one session body from disk (None if unknown or unreadable)."""
+        try:
+            if self.db is not None:
+                body = self.db.get(session_id)  # e.g. written by another worker
+                if body is None:
+                    return None
+                session = decode_session(body)
+            elif self.index is not None and session_id in self.index:
+                session, self._journal_seq[session_id] = read_session_file(
+                    self.session_dir, session_id
+                )
+            else:
+                return None
+        except (OSError, ValueError) as e:  # Includes SessionDecodeError
+            logger.warning(f"Skipping unreadable session {session_id}: {e}")
+            return None
+        self.loads += 1
+        return session
+    
+    def _remember(self, session_id: str, session: Any):
+        """Cache a session as most recently used, evicting over the cap."""
+        self._cache[session_id] = session
+        self._cache.move_to_end(session_id)
+        if self.max_cached and len(self._cache) > self.max_cached and self.persistent:
+            self._evict(len(self._cache) - self.max_cached, keep=session_id)
     
+    def _evict(self, count: int, keep: str):
+        """Drop the least recently used bodies that are safely on disk."""
+        writer = get_session_writer()
+        victims = []
+        for session_id in self._cache:
+            if len(victims) == count or session_id == keep:
+                break
+            if session_id not in self._unsaved and not writer.is_pending(self, session_id):
+                victims.append(session_id)
+        for session_id in victims:
+            del self._cache[session_id]
+            state = self._journal_state.pop(session_id, None)
+            if state is not None:
+                self._journal_seq[session_id] = state.seq  # For the next snapshot
+        self.evictions += len(victims)
+    
+    @timed(STAGE_PERSISTENCE)
     def save(self, session_id: str, session_data: Any):
         """
         Save session to cache and disk.
         
+        While the session writer is running the disk write is deferred and
+        coalesced (see session_write_behind.py); otherwise it happens now.
+        
         Args:
             session_id: Session identifier
             session_data: InterviewSession object or dict.
                          If it has a `.dict()` or `.model_dump()` method, it will be called.
         """
-        # Convert to dict if it's a Pydantic model
-        if hasattr(session_data, 'model_dump'):
-            data = session_data.model_dump(mode='json')
-        elif hasattr(session_data, 'dict'):
-            data = session_data.dict()
-        elif isinstance(session_data, dict):
-            data = session_data
-        else:
-            # Store the object in cache but skip disk persistence
-            self._cache[session_id] = session_data
+        self._remember(session_id, session_data)
+        if not self.persistent:
+            return
+        
+        writer = get_session_writer()
+        if writer.running:
+            writer.mark_dirty(self, session_id)
             return
         
-        # Ensure session_id is in the data
-        data["session_id"] = session_id
-        data["_last_saved"] = datetime.utcnow().isoformat()
+        try:
+            self.write_ops(self.plan_write(session_id))
+        except Exception as e:
+            self.write_failed(session_id)
+            logger.warning(f"Failed to persist session {session_id} to disk: {e}")
+    
+    async def flush(self, session_id: Optional[str] = None):
+        """Write this store's pending saves (or one session's) now."""
+        writer = get_session_writer()
+        if writer.running:
+            await writer.flush(self, [session_id] if session_id else None)
+    
+    def plan_write(self, session_id: str) -> WriteOps:
+        """
+        Serialize the cached session into file operations for write_ops().
+        
+        Runs where the session is mutated (the event loop); journal state
+        advances here, so a failed write must be reported via write_failed().
+        """
+        session_data = self._cache.get(session_id)
+        if session_data is None:
+            return []
+        self._unsaved.discard(session_id)
         
-        # Save to cache
-        self._cache[session_id] = session_data
+        ops = self._plan_body(session_id, session_data)
+        if ops and self.index is not None:
+            meta = session_meta(session_data)
+            if self.index.get(session_id) != meta:
+                ops.append(("index", {"id": session_id, **meta}, None))
+        return ops
+    
+    def _plan_body(self, session_id: str, session_data: Any) -> WriteOps:
+        if self.journal and hasattr(session_data, 'model_dump'):
+            return self._plan_journaled(session_id, session_data)
         
-        # Save to disk (atomic write: write to temp, then rename)
-        if self.session_dir:
-            try:
-                path = self.session_dir / f"{session_id}.json"
+        if hasattr(session_data, 'model_dump'):
+            body = encode_session(session_data, _last_saved=datetime.utcnow().isoformat())
+            columns = session_meta(session_data)
+        else:
+            if hasattr(session_data, 'dict'):
+                data = session_data.dict()
+            elif isinstance(session_data, dict):
+                data = session_data
+            else:
+                # Keep the object in cache but skip disk persistence
+                return []
+            
+            # Ensure session_id is in the data
+            data["session_id"] = session_id
+            data["_last_saved"] = datetime.utcnow().isoformat()
+            body = json.dumps(data, default=str)
+            columns = data
+        
+        if self.db is not None:
+            return [("upsert", session_row(session_id, columns, body), None)]
+        return [
+            ("replace", self.session_dir / f"{session_id}.json", body),
+            ("unlink", self._journal_path(session_id), None),  # Now stale
+        ]
+    
+    def write_ops(self, ops: WriteOps):
+        """Apply planned operations (files: atomic write to temp, then rename)."""
+        for op, path, text in ops:
+            if op == "index":
+                self.index.write([path])
+            elif op == "upsert":
+                self.db.upsert([path])
+            elif op == "delete_row":
+                self.db.delete([path])
+            elif op == "append":
+                with open(path, "a") as fp:
+                    fp.write(text)
+            elif op == "replace":
                 tmp_path = path.with_suffix('.tmp')
-                
                 with open(tmp_path, "w") as fp:
-                    json.dump(data, fp, default=str)
-                
+                    fp.write(text)
                 tmp_path.rename(path)  # Atomic on most filesystems
-            except Exception as e:
-                logger.warning(f"Failed to persist session {session_id} to disk: {e}")
+            elif op == "unlink":
+                path.unlink(missing_ok=True)
+    
+    def write_failed(self, session_id: str):
+        """Forget journal state so the next write is a full snapshot."""
+        self._journal_state.pop(session_id, None)
+        self._unsaved.add(session_id)
+    
+    def _journal_path(self, session_id: str) -> Path:
+        return self.session_dir / f"{session_id}{JOURNAL_SUFFIX}"
+    
+    def _plan_journaled(self, session_id: str, session: Any) -> WriteOps:
+        """Journal records for this save's delta, or a snapshot when due."""
+        state = self._journal_state.get(session_id)
+        if state is None:
+            return self._plan_snapshot(session_id, session)
+        
+        appended = {}
+        for name, written in state.lengths.items():
+            current = len(getattr(session, name))
+            if current < written:
+                return self._plan_snapshot(session_id, session)  # Not append-only
+            if current > written:
+                appended[name] = set(range(written, current))
+        
+        data = session.model_dump(
+            mode='json',
+            include={**appended, **{name: True for name in state.fields}}
+        )
+        records: List[Dict[str, Any]] = []
+        for name in appended:
+            for value in data[name]:
+                records.append({"op": "append", "field": name, "value": value})
+            state.lengths[name] += len(data[name])
+        for name, old in state.fields.items():
+            if data[name] != old:
+                records.append({"op": "set", "field": name, "value": data[name]})
+                state.fields[name] = data[name]
+        if not records:
+            return []
+        
+        completed = any(
+            r["op"] == "set" and r["field"] == "phase" and r["value"] == "completed"
+            for r in records
+        )
+        if completed or state.records + len(records) >= self.compact_every:
+            return self._plan_snapshot(session_id, session)
+        
+        lines = []
+        for record in records:
+            state.seq += 1
+            lines.append(json.dumps({"seq": state.seq, **record}, default=str))
+        state.records += len(records)
+        return [("append", self._journal_path(session_id), "\n".join(lines) + "\n")]
+    
+    def _plan_snapshot(self, session_id: str, session: Any) -> WriteOps:
+        """Full session, then truncate its journal (compaction)."""
+        state = self._journal_state.get(session_id)
+        seq = state.seq if state else self._journal_seq.pop(session_id, 0)
+        
+        lengths = {name: len(value) for name, value in session if isinstance(value, list)}
+        fields = session.model_dump(mode='json', exclude=set(lengths))
+        body = encode_session(
+            session, _last_saved=datetime.utcnow().isoformat(), _journal_seq=seq
+        )
+        
+        self._journal_state[session_id] = JournalState(lengths, fields, seq)
+        return [
+            ("replace", self.session_dir / f"{session_id}.json", body),
+            ("unlink", self._journal_path(session_id), None),
+        ]
     
     def get(self, session_id: str) -> Optional[Any]:
-        """Get a session by ID."""
-        return self._cache.get(session_id)
+        """Get a session by ID, loading it from disk on first access."""
+        session = self._cache.get(session_id)
+        if session is not None:
+            self._cache.move_to_end(session_id)
+            return session
+        session = self._load(session_id)
+        if session is not None:
+            self._remember(session_id, session)
+        return session
     
+    def query(
+        self,
+        user_id: Optional[str] = None,
+        interview_type: Optional[str] = None,
+        phase: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, Any]]:
+        """
+        (session_id, session) pairs matching the filters, newest first.
+        
+        Cached sessions are returned as cached (they may be newer than disk).
+        Other candidates come from the session index (files) or an index scan
+        (SQLite); their bodies are read but not cached, so history queries do
+        not push active sessions out of the cache.
+        """
+        filters = {"user_id": user_id, "interview_type": interview_type, "phase": phase}
+        filters = {k: v for k, v in filters.items() if v is not None}
+        
+        def matches(session: Any) -> bool:
+            return all(_field(session, k) == v for k, v in filters.items())
+        
+        if self.db is None:
+            # (session_id, created_at, cached session or None)
+            candidates = [
+                (sid, _field(s, "created_at"), s)
+                for sid, s in self._cache.items() if matches(s)
+            ]
+            if self.index is not None:
+                for sid, meta in self.index.items():
+                    if sid not in self._cache and all(
+                        meta.get(k) == v for k, v in filters.items()
+                    ):
+                        candidates.append((sid, meta.get("created_at"), None))
+            candidates.sort(key=lambda c: c[1] or "", reverse=True)
+            if limit is not None:
+                candidates = candidates[:limit]
+            results = []
+            for sid, _, session in candidates:
+                if session is None:
+                    session = self._load(sid)
+                if session is not None:
+                    results.append((sid, session))
+            return results
+        else:
+            results = []
+            for sid, body in self.db.query(user_id, interview_type, phase, limit):
+                cached = self._cache.get(sid)
+                if cached is None:
+                    try:
+                        results.append((sid, decode_session(body)))
+                    except SessionDecodeError as e:
+                        logger.warning(f"Skipping unreadable session {sid}: {e}")
+                elif matches(cached):
+                    results.append((sid, cached))
+            # Saved here but not yet written by the session writer
+            found = {sid for sid, _ in results}
+            for sid in get_session_writer().pending(self):
+                cached = self._cache.get(sid)
+                if sid not in found and cached is not None and matches(cached):
+                    results.append((sid, cached))
+        
+        results.sort(key=lambda item: _field(item[1], "created_at") or "", reverse=True)
+        return results[:limit] if limit is not None else results
+    
+    @timed(STAGE_PERSISTENCE)
     def delete(self, session_id: str):
         """Delete a session from cache and disk."""
         self._cache.pop(session_id, None)
+        self._unsaved.discard(session_id)
+        self._journal_state.pop(session_id, None)
+        self._journal_seq.pop(session_id, None)
         
-        if self.session_dir:
+        if self.persistent:
             try:
-                path = self.session_dir / f"{session_id}.json"
-                path.unlink(missing_ok=True)
+                self._remove_files(session_id)
             except Exception as e:
                 logger.warning(f"Failed to delete session file {session_id}: {e}")
     
+    def _remove_files(self, session_id: str):
+        if self.db is not None:
+            ops = [("delete_row", session_id, None)]
+        else:
+            ops = [
+                ("unlink", self.session_dir / f"{session_id}.json", None),
+                ("unlink", self._journal_path(session_id), None),
+            ]
+            if self.index is not None:
+                ops.append(("index", {"id": session_id, "deleted": True}, None))
+        writer = get_session_writer()
+        if writer.running:
+            writer.discard(self, session_id)
+            writer.submit(self, ops)  # Lands after any queued write of this session
+        else:
+            self.write_ops(ops)
+    
     def cleanup_old(self, max_age_hours: int = 24):
         """Remove sessions older than max_age_hours."""
+        if self.db is not None:
+            expired = self.db.delete_older_than(time.time() - max_age_hours * 3600)
+            for sid in expired:
+                self._cache.pop(sid, None)
+            if expired:
+                logger.info(f"Cleaned up {len(expired)} expired sessions.")
+            return
         if not self.session_dir:
             return
         
         cutoff = datetime.now() - timedelta(hours=max_age_hours)
-        cleaned = 0
+        cleaned = []
         
         for f in self.session_dir.glob("*.json"):
             try:
                 if datetime.fromtimestamp(f.stat().st_mtime) < cutoff:
                     sid = f.stem
                     f.unlink()
+                    self._journal_path(sid).unlink(missing_ok=True)
                     self._cache.pop(sid, None)
-                    cleaned += 1
+                    self._journal_state.pop(sid, None)
+                    cleaned.append(sid)
             except Exception:
                 pass
         
-        if cleaned > 0:
-            logger.info(f"Cleaned up {cleaned} expired sessions.")
+        if cleaned:
+            if self.index is not None:
+                self.index.write([{"id": sid, "deleted": True} for sid in cleaned])
+            logger.info(f"Cleaned up {len(cleaned)} expired sessions.")
     
     def list_sessions(self) -> list:
-        """List all active session IDs."""
-        return list(self._cache.keys())
+        """List all session IDs (cached or on disk)."""
+        if self.db is not None:
+            ids = self.db.ids()
+        elif self.index is not None:
+            ids = [sid for sid, _ in self.index.items()]
+        else:
+            ids = []
+        return list(dict.fromkeys([*self._cache, *ids]))
     
     @property
     def count(self) -> int:
-        """Number of active sessions."""
-        return len(self._cache)
+        """Number of sessions."""
+        return len(self.list_sessions())
     
     # Dict-like interface for backward compatibility
     # HOTFIX: Added .items()/.values()/.keys() for dashboard.py compatibility
-    def items(self):
+    # Iterating items()/values() loads every body; prefer query()
+    def items(self) -> Iterator[Tuple[str, Any]]:
         """Iterate over all sessions as (session_id, session_data) pairs."""
-        return self._cache.items()
+        for session_id in self.list_sessions():
+            session = self.get(session_id)
+            if session is not None:
+                yield session_id, session
     
-    def values(self):
+    def values(self) -> Iterator[Any]:
         """Iterate over all session values."""
-        return self._cache.values()
+        return (session for _, session in self.items())
     
     def keys(self):
         """Iterate over all session IDs."""
-        return self._cache.keys()
+        return self.list_sessions()
     
     def __len__(self) -> int:
-        return len(self._cache)
+        return self.count
     
     def __bool__(self) -> bool:
         """Always return True — store instance exists even when empty."""
         return True
     
     def __contains__(self, session_id: str) -> bool:
-        return session_id in self._cache
+        if session_id in self._cache:
+            return True
+        if self.db is not None:
+            return self.db.exists(session_id)
+        return self.index is not None and session_id in self.index
     
     def __getitem__(self, session_id: str) -> Any:
-        return self._cache[session_id]
+        session = self.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        return session
     
     def __setitem__(self, session_id: str, session_data: Any):
         self.save(session_id, session_data)
@@ -187,10 +697,17 @@ class PersistentSessionStore:
         self.delete(session_id)
     
     def pop(self, session_id: str, default=None):
-        result = self._cache.pop(session_id, default)
-        if self.session_dir:
+        result = self._cache.pop(session_id, None)
+        if result is None:
+            result = self._load(session_id)
+        if result is None:
+            result = default
+        self._unsaved.discard(session_id)
+        self._journal_state.pop(session_id, None)
+        self._journal_seq.pop(session_id, None)
+        if self.persistent:
             try:
-                (self.session_dir / f"{session_id}.json").unlink(missing_ok=True)
+                self._remove_files(session_id)
             except Exception:
                 pass
         return result
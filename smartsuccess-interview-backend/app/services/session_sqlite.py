@@ -0,0 +1,179 @@
+"""
+SQLite Session Backend
+Shared, indexed session storage for PersistentSessionStore (SESSION_BACKEND=sqlite)
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id     TEXT PRIMARY KEY,
+    user_id        TEXT,
+    interview_type TEXT,
+    phase          TEXT,
+    created_at     TEXT,
+    completed_at   TEXT,
+    updated_at     REAL NOT NULL,
+    body           TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_sessions_user ON sessions (user_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_sessions_type_phase ON sessions (interview_type, phase);
+CREATE INDEX IF NOT EXISTS ix_sessions_phase ON sessions (phase, completed_at);
+CREATE INDEX IF NOT EXISTS ix_sessions_created ON sessions (created_at);
+CREATE INDEX IF NOT EXISTS ix_sessions_updated ON sessions (updated_at);
+"""
+
+# Indexed columns, in row order after session_id
+COLUMNS = ("user_id", "interview_type", "phase", "created_at", "completed_at")
+
+# (session_id, user_id, interview_type, phase, created_at, completed_at, body)
+SessionRow = Tuple[Optional[str], ...]
+
+
+def session_row(session_id: str, data: Dict[str, Any], body: str) -> SessionRow:
+    """Row for a session already dumped to JSON-compatible `data`"""
+    return (session_id, *(_column(data.get(name)) for name in COLUMNS), body)
+
+
+def _column(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return str(getattr(value, "value", value))
+
+
+class SQLiteSessionBackend:
+    """Thread-safe access to one SQLite session database"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def upsert(self, rows: Sequence[SessionRow]) -> None:
+        """Insert or replace sessions in one transaction"""
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                """
+                INSERT INTO sessions
+                    (session_id, user_id, interview_type, phase,
+                     created_at, completed_at, body, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(session_id) DO UPDATE SET
+                    user_id = excluded.user_id,
+                    interview_type = excluded.interview_type,
+                    phase = excluded.phase,
+                    created_at = excluded.created_at,
+                    completed_at = excluded.completed_at,
+                    body = excluded.body,
+                    updated_at = excluded.updated_at
+                """,
+                [(*row, now) for row in rows]
+            )
+
+    def delete(self, session_ids: Sequence[str]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "DELETE FROM sessions WHERE session_id = ?",
+                [(sid,) for sid in session_ids]
+            )
+
+    def delete_older_than(self, cutoff: float) -> List[str]:
+        """Delete sessions not written since `cutoff` (epoch seconds)"""
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            ids = [row[0] for row in conn.execute(
+                "SELECT session_id FROM sessions WHERE updated_at < ?", (cutoff,)
+            )]
+            conn.execute("DELETE FROM sessions WHERE updated_at < ?", (cutoff,))
+        return ids
+
+    def get(self, session_id: str) -> Optional[str]:
+        """JSON body of a session"""
+        row = self._connect().execute(
+            "SELECT body FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def exists(self, session_id: str) -> bool:
+        return self._connect().execute(
+            "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone() is not None
+
+    def ids(self) -> List[str]:
+        return [row[0] for row in self._connect().execute("SELECT session_id FROM sessions")]
+
+    def query(
+        self,
+        user_id: Optional[str] = None,
+        interview_type: Optional[str] = None,
+        phase: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, str]]:
+        """(session_id, JSON body) of matching sessions, newest first"""
+        clauses, params = [], []
+        for column, value in (
+            ("user_id", user_id), ("interview_type", interview_type), ("phase", phase)
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        sql = "SELECT session_id, body FROM sessions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._connect().execute(sql, params).fetchall()
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+# One backend per database file, shared by every store using it
+_backends: Dict[str, SQLiteSessionBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_sqlite_backend(path: str) -> SQLiteSessionBackend:
+    """Get or create the backend for a database file"""
+    key = str(Path(path).resolve())
+    with _backends_lock:
+        if key not in _backends:
+            _backends[key] = SQLiteSessionBackend(path)
+        return _backends[key]
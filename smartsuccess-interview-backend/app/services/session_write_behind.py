@@ -0,0 +1,208 @@
+"""
+Write-Behind Session Persistence
+Coalesces dirty sessions and writes them from one worker thread, off the event loop
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# A store's file operations for one session: (op, path, text)
+WriteOps = List[Tuple[str, Any, Optional[str]]]
+
+
+class SessionWriteBehind:
+    """
+    Coalescing, batched background writer shared by all session stores
+
+    Usage (FastAPI lifespan):
+        writer = get_session_writer()
+        writer.start()
+        ...
+        await writer.stop()  # flush on shutdown
+    """
+
+    def __init__(self, interval_ms: float = 200, max_batch: int = 100):
+        self.interval_seconds = interval_ms / 1000
+        self.max_batch = max_batch
+        # (id(store), session_id) -> (store, session_id, first dirty time)
+        self._dirty: Dict[Tuple[int, str], Tuple[Any, str, float]] = {}
+        self._writing: Set[Tuple[int, str]] = set()  # Planned, write not finished
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.saves = 0
+        self.writes = 0
+        self.batches = 0
+        self.failures = 0
+        self._lags_ms: Deque[float] = deque(maxlen=1024)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="session-writer"
+            )
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background loop and flush everything still dirty"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        await self.flush()
+        self._task = None
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    def mark_dirty(self, store: Any, session_id: str) -> None:
+        """Record a save; the session is written by the next flush"""
+        self.saves += 1
+        self._dirty.setdefault(
+            (id(store), session_id), (store, session_id, time.perf_counter())
+        )
+
+    def pending(self, store: Any) -> List[str]:
+        """Session ids of `store` saved but not yet written"""
+        keys = [*self._dirty, *self._writing]
+        return list(dict.fromkeys(sid for key, sid in keys if key == id(store)))
+
+    def is_pending(self, store: Any, session_id: str) -> bool:
+        key = (id(store), session_id)
+        return key in self._dirty or key in self._writing
+
+    def discard(self, store: Any, session_id: str) -> None:
+        self._dirty.pop((id(store), session_id), None)
+
+    def submit(self, store: Any, ops: WriteOps) -> Future:
+        """Queue file operations behind every write submitted before them"""
+        return self._executor.submit(store.write_ops, ops)
+
+    async def flush(
+        self,
+        store: Any = None,
+        session_ids: Optional[Iterable[str]] = None
+    ) -> int:
+        """
+        Write dirty sessions now: all of them, one store's, or the given
+        sessions of one store. Returns the number of sessions written.
+        """
+        if session_ids is not None:
+            keys = [(id(store), sid) for sid in session_ids]
+        else:
+            keys = [k for k in list(self._dirty) if store is None or k[0] == id(store)]
+        entries = [self._dirty.pop(k) for k in keys if k in self._dirty]
+        self._writing.update((id(e[0]), e[1]) for e in entries)
+
+        written = 0
+        submitted = 0
+        try:
+            for start in range(0, len(entries), self.max_batch):
+                batch = entries[start:start + self.max_batch]
+                planned = []
+                for entry in batch:
+                    store_, session_id, _ = entry
+                    try:
+                        planned.append((entry, store_.plan_write(session_id)))
+                    except Exception as e:
+                        self._failed(entry, e)
+
+                future = self._executor.submit(_write_batch, planned)
+                submitted += len(batch)
+                try:
+                    results = await asyncio.wrap_future(future)
+                finally:
+                    self._writing.difference_update((id(e[0]), e[1]) for e in batch)
+                self.batches += 1
+
+                now = time.perf_counter()
+                for (entry, _), error in zip(planned, results):
+                    if error is not None:
+                        self._failed(entry, error)
+                        continue
+                    written += 1
+                    self._lags_ms.append((now - entry[2]) * 1000)
+        finally:
+            # Cancelled (stop() during a flush): later batches stay dirty
+            for entry in entries[submitted:]:
+                key = (id(entry[0]), entry[1])
+                self._writing.discard(key)
+                self._dirty.setdefault(key, entry)
+        self.writes += written
+        return written
+
+    def _failed(self, entry: Tuple[Any, str, float], error: Exception) -> None:
+        store, session_id, first_dirty = entry
+        self.failures += 1
+        logger.warning(f"Failed to persist session {session_id} to disk: {error}")
+        store.write_failed(session_id)
+        # Retry on the next flush, keeping the original dirty time for lag
+        self._dirty.setdefault((id(store), session_id), entry)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            if self._dirty:
+                try:
+                    await self.flush()
+                except Exception as e:
+                    logger.warning(f"Session flush failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        lags = sorted(self._lags_ms)
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval_seconds * 1000),
+            "pending": len(self._dirty),
+            "saves": self.saves,
+            "writes": self.writes,
+            "coalesced": max(0, self.saves - self.writes - len(self._dirty)),
+            "batches": self.batches,
+            "failures": self.failures,
+            "flush_lag_ms": {
+                "p50": round(lags[len(lags) // 2], 2) if lags else None,
+                "p95": round(lags[int(len(lags) * 0.95)], 2) if lags else None,
+                "max": round(lags[-1], 2) if lags else None,
+            },
+        }
+
+
+def _write_batch(planned) -> List[Optional[Exception]]:
+    """Worker thread: run each session's operations, collecting failures"""
+    results: List[Optional[Exception]] = []
+    for (store, _, _), ops in planned:
+        try:
+            store.write_ops(ops)
+            results.append(None)
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+# Singleton instance
+_writer_instance: Optional[SessionWriteBehind] = None
+
+
+def get_session_writer() -> SessionWriteBehind:
+    """Get or create the shared session writer"""
+    global _writer_instance
+    if _writer_instance is None:
+        _writer_instance = SessionWriteBehind(
+            interval_ms=settings.session_flush_interval_ms,
+            max_batch=settings.session_flush_max_batch
+        )
+    return _writer_instance
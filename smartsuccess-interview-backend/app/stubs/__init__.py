@@ -0,0 +1,56 @@
+"""
+Offline stub providers for load tests and local development
+LLM_PROVIDER=stub / EMBEDDING_PROVIDER=stub; latency and errors via STUB_* settings
+"""
+
+from typing import Optional
+
+from .behavior import StubBehavior, StubProviderError
+from .embeddings import STUB_EMBEDDING_MODEL, StubEmbeddings
+from .llm import StubLLM
+
+__all__ = [
+    "StubBehavior",
+    "StubProviderError",
+    "StubLLM",
+    "StubEmbeddings",
+    "STUB_EMBEDDING_MODEL",
+    "get_stub_llm",
+    "get_stub_embeddings",
+]
+
+# Singletons, so latency/error sequences are shared process-wide
+_stub_llm: Optional[StubLLM] = None
+_stub_embeddings: Optional[StubEmbeddings] = None
+
+
+def get_stub_llm() -> StubLLM:
+    global _stub_llm
+    if _stub_llm is None:
+        from app.config import settings
+        _stub_llm = StubLLM(
+            StubBehavior(
+                median_ms=settings.stub_llm_latency_ms,
+                sigma=settings.stub_latency_sigma,
+                error_rate=settings.stub_error_rate,
+                seed=settings.stub_seed
+            ),
+            seed=settings.stub_seed
+        )
+    return _stub_llm
+
+
+def get_stub_embeddings() -> StubEmbeddings:
+    global _stub_embeddings
+    if _stub_embeddings is None:
+        from app.config import settings
+        _stub_embeddings = StubEmbeddings(
+            settings.embedding_dimension,
+            StubBehavior(
+                median_ms=settings.stub_embedding_latency_ms,
+                sigma=settings.stub_latency_sigma,
+                error_rate=settings.stub_error_rate,
+                seed=settings.stub_seed + 1
+            )
+        )
+    return _stub_embeddings
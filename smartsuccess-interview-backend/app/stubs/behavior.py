@@ -0,0 +1,42 @@
+"""
+Latency and error model shared by the stub providers
+Seeded log-normal latency around a median, plus an error rate
+"""
+
+import asyncio
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+class StubProviderError(Exception):
+    """Injected failure from a stub provider"""
+
+
+@dataclass
+class StubBehavior:
+    median_ms: float = 0.0
+    sigma: float = 0.0  # Log-normal shape (0 = constant latency)
+    error_rate: float = 0.0  # Probability a call raises StubProviderError
+    seed: int = 0
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def sample_latency_ms(self) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        if self.sigma <= 0:
+            return self.median_ms
+        return self.median_ms * math.exp(self.sigma * self._rng.gauss(0.0, 1.0))
+
+    async def simulate(self, what: str = "call", latency_ms: Optional[float] = None) -> None:
+        """Sleep for a sampled latency, then maybe raise an injected error"""
+        delay = self.sample_latency_ms() if latency_ms is None else latency_ms
+        fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if fail:
+            raise StubProviderError(f"Injected stub {what} failure")
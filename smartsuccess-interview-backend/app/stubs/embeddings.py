@@ -0,0 +1,58 @@
+"""
+Deterministic stub embeddings
+Feature-hashed words and trigrams behind the AsyncOpenAI `embeddings.create` surface
+"""
+
+import hashlib
+import math
+import re
+from types import SimpleNamespace
+from typing import List, Optional, Union
+
+from .behavior import StubBehavior
+
+STUB_EMBEDDING_MODEL = "stub-embedding"
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class StubEmbeddings:
+    """Offline embedding provider with the AsyncOpenAI client shape"""
+
+    def __init__(self, dimension: int = 1536, behavior: Optional[StubBehavior] = None):
+        self.dimension = dimension
+        self.behavior = behavior or StubBehavior()
+        self.calls = 0
+        self.embeddings = SimpleNamespace(create=self._create)
+
+    def _bucket(self, feature: str) -> tuple:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        return value % self.dimension, 1.0 if value >> 63 else -1.0
+
+    def embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        words = _WORD.findall(text.lower())
+        for word in words:
+            index, sign = self._bucket(word)
+            vector[index] += sign
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                index, sign = self._bucket(padded[i:i + 3])
+                vector[index] += 0.25 * sign
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            return vector
+        return [v / norm for v in vector]
+
+    async def _create(self, model: str, input: Union[str, List[str]], **kwargs) -> SimpleNamespace:
+        self.calls += 1
+        await self.behavior.simulate("embedding")
+        texts = [input] if isinstance(input, str) else list(input)
+        return SimpleNamespace(
+            model=STUB_EMBEDDING_MODEL,
+            data=[
+                SimpleNamespace(index=i, embedding=self.embed(text))
+                for i, text in enumerate(texts)
+            ]
+        )
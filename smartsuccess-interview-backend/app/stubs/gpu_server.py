@@ -0,0 +1,143 @@
+"""
+Fake GPU server
+
+Implements the endpoints GPUClient calls (app/services/gpu_client.py) so
+the voice and custom-RAG paths can be exercised without a GPU:
+- GET  /health              services + gpu_name
+- POST /api/stt/transcribe  deterministic answer text per audio payload
+- POST /api/tts/synthesize  silent 16 kHz WAV, length scaled to the text
+- POST /api/rag/build       profile, questions and rag_id for the upload
+
+Run standalone:
+    python -m app.stubs.gpu_server --port 8080
+then set GPU_SERVER_URL=http://localhost:8080 and USE_GPU_VOICE=true.
+"""
+
+import argparse
+import hashlib
+import io
+import wave
+from typing import List, Optional
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from .behavior import StubBehavior, StubProviderError
+
+SAMPLE_RATE = 16000
+WORDS_PER_SECOND = 2.5
+
+# Long enough, and varied enough, to pass voice.validate_response
+_TRANSCRIPTS = [
+    "In my last role I led the migration of our billing service to a new platform and cut latency in half.",
+    "I enjoy working with cross-functional teams, and I try to communicate trade-offs early and clearly.",
+    "When a deadline slipped, I re-scoped the release with the product owner and we shipped the core on time.",
+    "I'm interested in this position because it combines backend engineering with direct customer impact.",
+    "I resolved the disagreement by walking through the data together and agreeing on a small experiment.",
+]
+
+_QUESTIONS = [
+    "Tell me about a project on your resume you are most proud of.",
+    "Describe a time you had to learn a new technology quickly.",
+    "How do you prioritize when several stakeholders need something at once?",
+    "Walk me through how you would design a rate limiter for a public API.",
+    "Tell me about a time you received difficult feedback.",
+]
+
+
+class SynthesizeRequest(BaseModel):
+    text: str
+    voice: Optional[str] = None
+    emotion: Optional[str] = None
+    model: Optional[str] = None
+
+
+def _pick(options: List[str], data: bytes) -> str:
+    digest = hashlib.sha256(data).digest()
+    return options[int.from_bytes(digest[:4], "big") % len(options)]
+
+
+def silent_wav(seconds: float) -> bytes:
+    """Mono 16-bit PCM WAV of silence"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        out.writeframes(b"\x00\x00" * int(SAMPLE_RATE * seconds))
+    return buffer.getvalue()
+
+
+def create_app(behavior: Optional[StubBehavior] = None) -> FastAPI:
+    behavior = behavior or StubBehavior()
+    app = FastAPI(title="SmartSuccess Fake GPU Server")
+    app.state.behavior = behavior
+
+    async def simulate(what: str) -> None:
+        try:
+            await behavior.simulate(what)
+        except StubProviderError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
+    @app.get("/health")
+    async def health():
+        return {
+            "status": "healthy",
+            "gpu_name": "Stub GPU",
+            "services": {"stt": True, "tts": True, "rag": True},
+        }
+
+    @app.post("/api/stt/transcribe")
+    async def transcribe(audio: UploadFile = File(...), language: str = Form("en")):
+        data = await audio.read()
+        await simulate("STT")
+        return {"text": _pick(_TRANSCRIPTS, data), "language": language}
+
+    @app.post("/api/tts/synthesize")
+    async def synthesize(request: SynthesizeRequest):
+        await simulate("TTS")
+        seconds = max(0.5, len(request.text.split()) / WORDS_PER_SECOND)
+        return Response(content=silent_wav(seconds), media_type="audio/wav")
+
+    @app.post("/api/rag/build")
+    async def build_rag(files: List[UploadFile] = File(...), user_id: str = Form(...)):
+        digest = hashlib.sha256(user_id.encode("utf-8"))
+        names = []
+        for upload in files:
+            digest.update(await upload.read())
+            names.append(upload.filename)
+        await simulate("RAG build")
+        rag_id = f"stub-{digest.hexdigest()[:12]}"
+        return {
+            "success": True,
+            "rag_id": rag_id,
+            "profile": {"files": names, "skills": ["python", "communication"]},
+            "questions": [
+                _pick(_QUESTIONS, f"{rag_id}:{i}".encode()) for i in range(3)
+            ],
+        }
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+    from app.config import settings
+
+    parser = argparse.ArgumentParser(description="Run the fake GPU server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    behavior = StubBehavior(
+        median_ms=settings.stub_gpu_latency_ms,
+        sigma=settings.stub_latency_sigma,
+        error_rate=settings.stub_error_rate,
+        seed=settings.stub_seed
+    )
+    uvicorn.run(create_app(behavior), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
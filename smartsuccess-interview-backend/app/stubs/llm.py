@@ -0,0 +1,171 @@
+"""
+Deterministic stub LLM
+Responses shaped like the real prompts expect, from (seed, prompt, system prompt)
+"""
+
+import hashlib
+import json
+import random
+import re
+from types import SimpleNamespace
+from typing import AsyncIterator, List, Optional
+
+from .behavior import StubBehavior
+
+# Template placeholders, e.g. <1-5>, <true|false>, "<Positive|Neutral|Concerning>"
+_RANGE = re.compile(r"<(\d+)-(\d+)>")
+_BOOL = re.compile(r"<true\|false>|\btrue/false\b")
+_CHOICE = re.compile(r'"<?([A-Za-z_]+(?:\|[A-Za-z_]+)+)>?"')
+_TEXT = re.compile(r'"<([^">]*)>"')
+# "BASE QUESTION TO PERSONALIZE:", "BASE QUESTION TEMPLATE:",
+# "NEXT PLANNED QUESTION (adapt this naturally):" followed by the question line
+_PLANNED_QUESTION = re.compile(
+    r"(?:BASE|NEXT PLANNED) QUESTION[^:\n]*:[ \t]*\n\"?([^\n]+?)\"?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE
+)
+
+_OPENERS = [
+    "Thinking about your background,",
+    "Building on your experience,",
+    "Given the role you're applying for,",
+    "From what you've shared so far,",
+]
+
+_FOLLOW_UPS = [
+    "Could you walk me through a specific example of that?",
+    "What was the measurable outcome of that work?",
+    "What would you do differently if you faced that again?",
+    "How did you decide between the alternatives you considered?",
+]
+
+
+def _find_template(prompt: str) -> Optional[str]:
+    """Last balanced {...} block in the prompt that looks like a JSON object"""
+    end = prompt.rfind("}")
+    while end >= 0:
+        depth = 0
+        for start in range(end, -1, -1):
+            if prompt[start] == "}":
+                depth += 1
+            elif prompt[start] == "{":
+                depth -= 1
+                if depth == 0:
+                    block = prompt[start:end + 1]
+                    if '":' in block:
+                        return block
+                    break
+        end = prompt.rfind("}", 0, end)
+    return None
+
+
+class StubLLM:
+    """Offline text generator with the LLMService call signature"""
+
+    def __init__(self, behavior: Optional[StubBehavior] = None, seed: int = 0):
+        self.behavior = behavior or StubBehavior()
+        self.seed = seed
+        self.calls = 0
+
+    def _rng(self, prompt: str, system_prompt: Optional[str]) -> random.Random:
+        digest = hashlib.sha256(
+            f"{self.seed}\0{system_prompt or ''}\0{prompt}".encode("utf-8")
+        ).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def respond(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """The deterministic response text for a prompt"""
+        rng = self._rng(prompt, system_prompt)
+        question = self._question(prompt, rng)
+
+        for text in (prompt, system_prompt or ""):
+            template = _find_template(text) if "JSON" in text else None
+            if template:
+                return self._fill_template(template, rng, question)
+
+        if question:
+            return question
+        if "question" in prompt.lower():
+            return rng.choice(_FOLLOW_UPS)
+        return "Thank you, that's helpful context."
+
+    @staticmethod
+    def _question(prompt: str, rng: random.Random) -> Optional[str]:
+        """The planned/base question of the prompt, lightly personalized"""
+        match = _PLANNED_QUESTION.search(prompt)
+        if not match or not match.group(1).strip():
+            return None
+        base = match.group(1).strip()
+        return f"{rng.choice(_OPENERS)} {base[0].lower()}{base[1:]}"
+
+    def _fill_template(
+        self, template: str, rng: random.Random, question: Optional[str] = None
+    ) -> str:
+        text = _RANGE.sub(
+            lambda m: str(min(int(m.group(2)), max(int(m.group(1)), round(rng.triangular(
+                int(m.group(1)), int(m.group(2)), (int(m.group(1)) + int(m.group(2))) * 0.6
+            ))))),
+            template
+        )
+        text = _BOOL.sub(lambda m: "true" if rng.random() < 0.2 else "false", text)
+        text = _CHOICE.sub(lambda m: json.dumps(rng.choice(m.group(1).split("|"))), text)
+        text = _TEXT.sub(lambda m: json.dumps(f"Stub: {m.group(1)}"), text)
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return "{}"
+        # Descriptive values: "Your question or response" carries the
+        # question, "(..., optional)" fields are left empty
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if not isinstance(value, str):
+                    continue
+                if question and "question" in value.lower():
+                    data[key] = question
+                elif "optional" in value.lower():
+                    data[key] = ""
+        return json.dumps(data)
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024
+    ) -> str:
+        self.calls += 1
+        await self.behavior.simulate("LLM")
+        return self.respond(prompt, system_prompt)
+
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024
+    ) -> AsyncIterator[str]:
+        """Time to first token is one sampled latency; words follow quickly"""
+        self.calls += 1
+        await self.behavior.simulate("LLM stream")
+        words = self.respond(prompt, system_prompt).split(" ")
+        for i, word in enumerate(words):
+            yield word if i == len(words) - 1 else word + " "
+
+    @property
+    def chat(self) -> SimpleNamespace:
+        """AsyncOpenAI-compatible surface (client.chat.completions.create)"""
+        return SimpleNamespace(completions=SimpleNamespace(create=self._chat_create))
+
+    async def _chat_create(
+        self,
+        model: str,
+        messages: List[dict],
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        **kwargs
+    ) -> SimpleNamespace:
+        system = next((m["content"] for m in messages if m["role"] == "system"), None)
+        prompt = "\n".join(m["content"] for m in messages if m["role"] != "system")
+        text = await self.generate(prompt, system, temperature, max_tokens)
+        return SimpleNamespace(choices=[
+            SimpleNamespace(message=SimpleNamespace(content=text))
+        ])
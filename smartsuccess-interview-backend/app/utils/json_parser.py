@@ -11,9 +11,12 @@ import json
 import logging
 from typing import Optional, Dict, Any
 
+from app.services.request_timing import STAGE_JSON_PARSE, timed
+
 logger = logging.getLogger(__name__)
 
 
+@timed(STAGE_JSON_PARSE)
 def extract_json_from_llm(response_text: str) -> Optional[Dict[str, Any]]:
     """
     Robustly extract JSON from LLM responses.
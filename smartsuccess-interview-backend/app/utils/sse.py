@@ -0,0 +1,40 @@
+"""
+Server-Sent Events helpers
+Streams the interviewer's next question as it is generated
+
+Event protocol of the `/message/stream` endpoints:
+- `delta`: {"text": "..."} — chunk of the next question, in order
+- `done`:  MessageResponse JSON — the authoritative final response
+- `error`: {"detail": "..."} — processing failed; no `done` follows
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def message_event_stream(
+    service, session_id: str, message: str
+) -> AsyncIterator[str]:
+    """Encode an interview service's process_message_stream() as SSE"""
+    try:
+        async for item in service.process_message_stream(session_id, message):
+            if item["event"] == "delta":
+                yield format_sse("delta", {"text": item["text"]})
+            else:
+                yield format_sse("done", item["response"].model_dump(mode="json"))
+    except Exception as e:
+        logger.error(f"Streaming message failed for {session_id}: {e}")
+        yield format_sse("error", {"detail": str(e)})
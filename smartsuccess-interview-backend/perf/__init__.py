@@ -0,0 +1,7 @@
+"""
+Performance tooling for SmartSuccess Interview Backend
+
+Not imported by the application. Run from the backend directory:
+    python -m perf.loadtest --help
+    python -m perf.bench --help
+"""
@@ -0,0 +1,576 @@
+"""
+Micro-Benchmarks for Pure-Python Hot Paths
+Timings across input sizes; `compare` exits 1 when a median regresses
+
+Usage:
+    python -m perf.bench run --out base.json
+    python -m perf.bench run --out new.json --filter vector_store
+    python -m perf.bench compare base.json new.json --threshold 0.10
+    python -m perf.bench run --quick      # Smallest sizes only
+
+Each benchmark runs in this process with a scratch session directory and
+stub providers; run it in its own process.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+# ==================== REGISTRY ====================
+
+
+@dataclass
+class Benchmark:
+    name: str
+    factory: Callable[[int, "BenchContext"], Callable[[], Any]]
+    sizes: List[int]
+    quick_sizes: List[int]
+    unit: str  # What the size counts (pages, rows, sessions, vectors)
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, sizes: List[int], unit: str, quick: Optional[List[int]] = None):
+    """
+    Register `factory(size, ctx) -> callable`; setup happens in the factory,
+    only the returned callable is timed
+    """
+    def register(factory):
+        BENCHMARKS.append(Benchmark(name, factory, sizes, quick or sizes[:1], unit))
+        return factory
+    return register
+
+
+@dataclass
+class BenchContext:
+    scratch: str  # Per-run temporary directory
+    dimension: int  # Embedding dimension for vector benchmarks
+    seed: int = 0
+
+    def rng(self, size: int) -> random.Random:
+        return random.Random(self.seed * 1_000_003 + size)
+
+
+# ==================== INPUT GENERATORS ====================
+
+_SECTIONS = ["SUMMARY", "EXPERIENCE", "PROJECTS", "EDUCATION", "SKILLS", "CERTIFICATIONS"]
+_SENTENCES = [
+    "Led a team of five engineers building Python microservices on GCP.",
+    "Reduced p95 API latency by 60% through query tuning and caching!",
+    "Designed a RAG pipeline with LangChain, embeddings and a vector store.",
+    "Owned CI/CD with GitHub Actions, Docker and Kubernetes deployments.",
+    "Mentored junior developers and ran weekly architecture reviews.",
+    "Migrated batch ETL jobs to streaming with Kafka and Spark?",
+    "Partnered with product managers to define quarterly OKRs.",
+]
+_CONTACTS = [
+    "Contact: jordan.lee{n}@example.com, +1 (415) 555-01{n:02d}",
+    "Phone 212-555-{n:04d} or alt 646.555.{n:04d}",
+    "SSN on file: 123-45-{n:04d}",
+]
+PAGE_CHARS = 3000
+
+
+def make_document(pages: int, rng: random.Random) -> str:
+    """Resume-like text of roughly `pages` pages (~3000 characters each)"""
+    parts = [f"JORDAN LEE\n{_CONTACTS[0].format(n=0)}\n"]
+    length = 0
+    n = 0
+    while length < pages * PAGE_CHARS:
+        section = _SECTIONS[n % len(_SECTIONS)]
+        lines = [f"\n{section}:"]
+        for _ in range(rng.randint(4, 9)):
+            sentence = " ".join(rng.sample(_SENTENCES, 3))
+            lines.append(f"- {sentence}")
+        if n % 3 == 0:
+            lines.append(_CONTACTS[n % len(_CONTACTS)].format(n=n % 100))
+        block = "\n".join(lines) + "\n"
+        parts.append(block)
+        length += len(block)
+        n += 1
+    return "".join(parts)
+
+
+def make_comparison_rows(rows: int, rng: random.Random) -> List[Dict[str, str]]:
+    statuses = ["Strong", "Moderate", "Partial", "Lack", "strong match", "Partially met"]
+    return [
+        {
+            "category": f"Requirement {i}",
+            "status": rng.choice(statuses),
+            "comment": " ".join(rng.sample(_SENTENCES, 2)),
+        }
+        for i in range(rows)
+    ]
+
+
+def make_session(index: int, user_id: str, interview_type: str, answers: int = 6):
+    """A completed interview session with `answers` evaluated Q/A pairs"""
+    from app.models import InterviewPhase, InterviewSession
+
+    created = datetime(2026, 1, 1) + timedelta(minutes=index)
+    questions = [f"Question {q} for session {index}?" for q in range(answers)]
+    responses = [
+        {
+            "question_index": q,
+            "question": questions[q],
+            "response": " ".join(_SENTENCES[(index + q) % len(_SENTENCES):][:3]),
+            "evaluation": {"score": 3 + (index + q) % 3, "feedback": "Clear and specific."},
+            "timestamp": (created + timedelta(minutes=q)).isoformat(),
+        }
+        for q in range(answers)
+    ]
+    messages = []
+    for q in range(answers):
+        messages.append({"role": "assistant", "content": questions[q]})
+        messages.append({"role": "user", "content": responses[q]["response"]})
+    return InterviewSession(
+        session_id=f"{interview_type}_{user_id}_{index:08x}",
+        user_id=user_id,
+        interview_type=interview_type,
+        phase=InterviewPhase.COMPLETED,
+        current_question_index=answers,
+        questions_asked=questions,
+        responses=responses,
+        messages=messages,
+        created_at=created,
+        started_at=created,
+        completed_at=created + timedelta(minutes=answers),
+    )
+
+
+# ==================== BENCHMARKS ====================
+
+
+@benchmark("vector_store.search", sizes=[10, 1_000, 10_000, 100_000], unit="vectors",
+           quick=[10, 1_000])
+def bench_vector_search(n: int, ctx: BenchContext):
+    import numpy as np
+    from app.core.vector_store import VectorStore
+
+    rng = np.random.default_rng(ctx.seed)
+    store = VectorStore()
+    embeddings = rng.standard_normal((n, ctx.dimension), dtype=np.float32)
+    store.add_documents("bench", [
+        {"id": str(i), "content": f"doc {i}", "embedding": embeddings[i]}
+        for i in range(n)
+    ])
+    query = rng.standard_normal(ctx.dimension, dtype=np.float32).tolist()
+    store.search("bench", query, k=5)  # Builds the IVF index outside the timing
+    return lambda: store.search("bench", query, k=5)
+
+
+@benchmark("vector_store.search_exact", sizes=[10_000, 100_000], unit="vectors",
+           quick=[])
+def bench_vector_search_exact(n: int, ctx: BenchContext):
+    import numpy as np
+    from app.core.vector_store import VectorStore
+
+    rng = np.random.default_rng(ctx.seed)
+    store = VectorStore()
+    embeddings = rng.standard_normal((n, ctx.dimension), dtype=np.float32)
+    store.add_documents("bench", [
+        {"id": str(i), "content": f"doc {i}", "embedding": embeddings[i]}
+        for i in range(n)
+    ])
+    query = rng.standard_normal(ctx.dimension, dtype=np.float32).tolist()
+    return lambda: store.search("bench", query, k=5, exact=True)
+
+
+def _embedding_service():
+    from app.core.embedding_cache import EmbeddingCache
+    from app.core.embedding_service import EmbeddingService
+    return EmbeddingService(cache=EmbeddingCache(max_entries=1))
+
+
+@benchmark("embedding.chunk_text", sizes=[1, 10, 50], unit="pages")
+def bench_chunk_text(pages: int, ctx: BenchContext):
+    service = _embedding_service()
+    text = make_document(pages, ctx.rng(pages))
+    return lambda: service.chunk_text(text)
+
+
+@benchmark("embedding.chunk_text_by_sections", sizes=[1, 10, 50], unit="pages")
+def bench_chunk_text_by_sections(pages: int, ctx: BenchContext):
+    service = _embedding_service()
+    text = make_document(pages, ctx.rng(pages))
+    return lambda: service.chunk_text_by_sections(text, source="resume")
+
+
+@benchmark("json.extract_json_from_llm", sizes=[1, 10, 100], unit="rows")
+def bench_extract_json(rows: int, ctx: BenchContext):
+    from app.utils.json_parser import extract_json_from_llm
+
+    payload = json.dumps({"rows": make_comparison_rows(rows, ctx.rng(rows)), "score": 4})
+    # One of each shape LLMs return: clean, fenced with preamble, trailing comma
+    inputs = [
+        payload,
+        f"Here is the evaluation:\n```json\n{payload}\n```\nLet me know!",
+        payload[:-1] + ",}",
+    ]
+
+    def run():
+        for text in inputs:
+            extract_json_from_llm(text)
+    return run
+
+
+@benchmark("matchwise.validate_comparison_json", sizes=[10, 100, 1_000], unit="rows")
+def bench_validate_comparison_json(rows: int, ctx: BenchContext):
+    from app.api.routes.matchwise import validate_comparison_json
+
+    payload = json.dumps({"rows": make_comparison_rows(rows, ctx.rng(rows))})
+    inputs = [payload, f"```json\n{payload}\n```", f"Sure! {payload} Hope this helps."]
+
+    def run():
+        for text in inputs:
+            validate_comparison_json(text)
+    return run
+
+
+@benchmark("matchwise.redact_pii", sizes=[1, 10, 50], unit="pages")
+def bench_redact_pii(pages: int, ctx: BenchContext):
+    from app.api.routes.matchwise import redact_pii
+
+    text = make_document(pages, ctx.rng(pages))
+    return lambda: redact_pii(text)
+
+
+@benchmark("domain.detect_domain_from_jd", sizes=[1, 10], unit="pages")
+def bench_detect_domain(pages: int, ctx: BenchContext):
+    from app.rag.domain_config import detect_domain_from_jd
+
+    job_context = {
+        "job_title": "Senior Backend Engineer",
+        "job_description": make_document(pages, ctx.rng(pages)),
+        "required_skills": ["python", "kubernetes", "kafka"],
+    }
+    return lambda: detect_domain_from_jd(job_context)
+
+
+@benchmark("sessions.save_snapshot", sizes=[6, 30], unit="answers")
+def bench_session_save_snapshot(answers: int, ctx: BenchContext):
+    """Full session file write on every save (journal off)"""
+    from pathlib import Path
+    from app.services.session_persistence import PersistentSessionStore
+
+    store = PersistentSessionStore(Path(tempfile.mkdtemp(dir=ctx.scratch)), journal=False)
+    session = make_session(0, "user_0", "screening", answers)
+    return lambda: store.save(session.session_id, session)
+
+
+@benchmark("sessions.save_turn", sizes=[6, 30], unit="answers")
+def bench_session_save_turn(answers: int, ctx: BenchContext):
+    """
+    One answered turn per save (journal append, compaction when due); a new
+    interview starts every `answers` turns, so its first snapshot is included
+    """
+    from pathlib import Path
+    from app.models import InterviewPhase
+    from app.services.session_persistence import PersistentSessionStore
+
+    store = PersistentSessionStore(Path(tempfile.mkdtemp(dir=ctx.scratch)), journal=True)
+    template = make_session(0, "user_0", "screening", answers)
+    calls = itertools.count()
+    session = None
+
+    def run():
+        nonlocal session
+        n = next(calls)
+        turn = n % answers
+        if turn == 0:
+            session = make_session(n, "user_0", "screening", answers=0)
+            session.phase = InterviewPhase.IN_PROGRESS
+            session.completed_at = None
+        session.questions_asked.append(template.questions_asked[turn])
+        session.responses.append(template.responses[turn])
+        session.messages.extend(template.messages[2 * turn:2 * turn + 2])
+        session.current_question_index = turn + 1
+        store.save(session.session_id, session)
+    return run
+
+
+@benchmark("sessions.load_existing", sizes=[10, 100, 1_000, 10_000], unit="sessions",
+           quick=[10])
+def bench_session_load(n: int, ctx: BenchContext):
+    from pathlib import Path
+    from app.services.session_persistence import PersistentSessionStore
+
+    store = PersistentSessionStore(Path(tempfile.mkdtemp(dir=ctx.scratch)))
+    for i in range(n):
+        session = make_session(i, f"user_{i % 50}", "behavioral")
+        store.save(session.session_id, session)
+    return store.index.load
+
+
+def _dashboard(n: int):
+    """Interview services holding n completed sessions, and a fake request"""
+    from app.interview.behavioral_interview import get_behavioral_interview_service
+    from app.interview.screening_interview import get_screening_interview_service
+    from app.interview.technical_interview import get_technical_interview_service
+    from app.services.session_store import SessionStore
+
+    session_store = SessionStore()
+    getters = {
+        "screening": get_screening_interview_service,
+        "behavioral": get_behavioral_interview_service,
+        "technical": get_technical_interview_service,
+    }
+    users = max(1, n // 10)
+    sample_id = None
+    for interview_type, getter in getters.items():
+        getter.cache_clear()
+        getter(session_store=session_store).sessions._cache.clear()
+    for i in range(n):
+        interview_type = list(getters)[i % 3]
+        session = make_session(i, f"user_{i % users}", interview_type)
+        getters[interview_type](session_store=session_store).sessions._cache[
+            session.session_id
+        ] = session
+        sample_id = sample_id or session.session_id
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(
+        session_store=session_store
+    )))
+    return request, sample_id
+
+
+def _run(coro_factory) -> Callable[[], Any]:
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(coro_factory())
+
+
+@benchmark("dashboard.history", sizes=[10, 100, 1_000, 10_000], unit="sessions",
+           quick=[10])
+def bench_dashboard_history(n: int, ctx: BenchContext):
+    from app.api.routes.dashboard import get_interview_history
+
+    request, _ = _dashboard(n)
+    return _run(lambda: get_interview_history(request, "user_0", limit=10))
+
+
+@benchmark("dashboard.stats", sizes=[10, 100, 1_000, 10_000], unit="sessions",
+           quick=[10])
+def bench_dashboard_stats(n: int, ctx: BenchContext):
+    from app.api.routes.dashboard import get_user_stats
+
+    request, _ = _dashboard(n)
+    return _run(lambda: get_user_stats(request, "user_0"))
+
+
+@benchmark("dashboard.report", sizes=[10, 100, 1_000, 10_000], unit="sessions",
+           quick=[10])
+def bench_dashboard_report(n: int, ctx: BenchContext):
+    from app.api.routes.dashboard import generate_interview_report
+
+    request, session_id = _dashboard(n)
+    return _run(lambda: generate_interview_report(request, session_id))
+
+
+# ==================== RUNNER ====================
+
+
+def measure(func: Callable[[], Any], min_time: float, repeat: int) -> Dict[str, Any]:
+    """
+    Per-call seconds over `repeat` rounds; each round runs `func` enough
+    times to take at least `min_time` (calibrated like timeit.autorange)
+    """
+    func()  # Warm-up
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    rounds = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - started) / number)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_s": min(rounds),
+        "median_s": statistics.median(rounds),
+        "mean_s": statistics.fmean(rounds),
+        "stdev_s": statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+    }
+
+
+def configure_environment(scratch: str) -> None:
+    """Scratch session directory, no disk caches, no provider keys (before app import)"""
+    os.environ.update({
+        "SESSION_DATA_DIR": os.path.join(scratch, "sessions"),
+        "LLM_PROVIDER": "stub",
+        "EMBEDDING_PROVIDER": "stub",
+        "LLM_CACHE_PATH": "",
+        "EMBEDDING_CACHE_PATH": "",
+        "VECTOR_SNAPSHOT_ENABLED": "false",
+    })
+
+
+def run_benchmarks(
+    ctx: BenchContext,
+    pattern: Optional[str] = None,
+    quick: bool = False,
+    min_time: float = 0.2,
+    repeat: int = 5,
+    log: Callable[[str], None] = print
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for bench in BENCHMARKS:
+        for size in (bench.quick_sizes if quick else bench.sizes):
+            key = f"{bench.name}[{size}]"
+            if pattern and not re.search(pattern, key):
+                continue
+            try:
+                func = bench.factory(size, ctx)
+            except ImportError as e:
+                log(f"{key:<48} skipped ({e})")
+                continue
+            stats = measure(func, min_time, repeat)
+            results[key] = {"name": bench.name, "size": size, "unit": bench.unit, **stats}
+            log(f"{key:<48} {_fmt(stats['median_s']):>10} ±{_fmt(stats['stdev_s'])}")
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "dimension": ctx.dimension,
+            "quick": quick,
+            "min_time": min_time,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float) -> Dict[str, Any]:
+    """
+    Classify each benchmark by median ratio new/base: `regression` above
+    1 + threshold, `improvement` below 1 - threshold, otherwise `ok`
+    """
+    base_results, new_results = base["results"], new["results"]
+    rows = []
+    for key in sorted(set(base_results) & set(new_results)):
+        before = base_results[key]["median_s"]
+        after = new_results[key]["median_s"]
+        ratio = after / before if before else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({
+            "benchmark": key,
+            "base_s": before,
+            "new_s": after,
+            "ratio": round(ratio, 3),
+            "status": status,
+        })
+    return {
+        "threshold": threshold,
+        "rows": rows,
+        "regressions": [r["benchmark"] for r in rows if r["status"] == "regression"],
+        "only_in_base": sorted(set(base_results) - set(new_results)),
+        "only_in_new": sorted(set(new_results) - set(base_results)),
+    }
+
+
+def format_comparison(result: Dict[str, Any]) -> str:
+    rows = result["rows"]
+    width = max([len(r["benchmark"]) for r in rows] + [9])
+    lines = [f"{'benchmark':<{width}}  {'base':>10} {'new':>10} {'ratio':>7}  status"]
+    for r in rows:
+        marker = "  <-- REGRESSION" if r["status"] == "regression" else ""
+        lines.append(
+            f"{r['benchmark']:<{width}}  {_fmt(r['base_s']):>10} {_fmt(r['new_s']):>10} "
+            f"{r['ratio']:>7.3f}  {r['status']}{marker}"
+        )
+    for label in ("only_in_base", "only_in_new"):
+        if result[label]:
+            lines.append(f"{label}: {', '.join(result[label])}")
+    lines.append(
+        f"{len(result['regressions'])} regression(s) over "
+        f"{result['threshold']:.0%} threshold"
+    )
+    return "\n".join(lines)
+
+
+def _fmt(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f}ms"
+    return f"{seconds * 1e6:.2f}µs"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for hot paths")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run benchmarks and write JSON results")
+    run.add_argument("--out", default=None, help="Results JSON path")
+    run.add_argument("--filter", default=None, help="Regex on 'name[size]'")
+    run.add_argument("--quick", action="store_true", help="Smallest sizes only")
+    run.add_argument("--min-time", type=float, default=0.2,
+                     help="Seconds per timing round (default 0.2)")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--dimension", type=int, default=384,
+                     help="Embedding dimension for vector benchmarks")
+    run.add_argument("--seed", type=int, default=0)
+
+    cmp = commands.add_parser("compare", help="Compare two result files")
+    cmp.add_argument("base")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=0.10,
+                     help="Relative median slowdown flagged as a regression")
+    cmp.add_argument("--out", default=None, help="Comparison JSON path")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.base) as fp:
+            base = json.load(fp)
+        with open(args.new) as fp:
+            new = json.load(fp)
+        result = compare(base, new, args.threshold)
+        print(format_comparison(result))
+        if args.out:
+            with open(args.out, "w") as fp:
+                json.dump(result, fp, indent=2)
+        return 1 if result["regressions"] else 0
+
+    with tempfile.TemporaryDirectory(prefix="bench_") as scratch:
+        configure_environment(scratch)
+        ctx = BenchContext(scratch=scratch, dimension=args.dimension, seed=args.seed)
+        report = run_benchmarks(
+            ctx, args.filter, args.quick, args.min_time, args.repeat
+        )
+
+    if args.out:
+        with open(args.out, "w") as fp:
+            json.dump(report, fp, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
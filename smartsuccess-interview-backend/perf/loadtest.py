@@ -0,0 +1,435 @@
+"""
+End-to-End Interview Load Test
+Concurrent simulated candidates against the in-process app with stub providers;
+reports throughput and p50/p95/p99 latency per endpoint and pipeline stage
+
+Usage:
+    python -m perf.loadtest --candidates 50 --llm-latency-ms 400 --sigma 0.5
+    python -m perf.loadtest --candidates 20 --types screening --json out.json
+
+The stub/session settings are applied through environment variables before
+the app is imported, so run it in its own process.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+INTERVIEW_TYPES = ("screening", "behavioral", "technical")
+
+RESUME = """
+Jordan Lee - Backend Engineer
+
+EXPERIENCE
+Senior Software Engineer, Acme Payments (2020-2024)
+- Built a Python/FastAPI billing platform serving 2M requests per day
+- Migrated batch jobs to event-driven workers on GCP Pub/Sub
+- Mentored four engineers and led the on-call rotation
+
+SKILLS
+Python, FastAPI, PostgreSQL, Redis, Docker, Kubernetes, GCP
+"""
+
+JOB_DESCRIPTION = """
+Backend Engineer - Interview Platform
+
+Requirements:
+- 3+ years of Python web services experience
+- Experience with LLM APIs and retrieval-augmented generation
+- Strong communication and ownership
+"""
+
+# Varied, validator-friendly answers. None may contain an early-exit keyword
+# ('stop', 'end', 'finish', 'done', ...), which would complete the session.
+ANSWERS = [
+    "In my last role I owned the billing service. I profiled the slowest "
+    "queries, added two covering indexes and a small Redis cache, and p95 "
+    "latency dropped from 900 ms to 180 ms within a month.",
+    "A teammate and I disagreed about rewriting a legacy module. I proposed "
+    "we measure defect rates first; the data showed a targeted refactor was "
+    "enough, and we shipped it two sprints earlier than the rewrite plan.",
+    "I'm excited about this position because it combines Python services "
+    "with LLM-based products, and I enjoy building reliable systems that "
+    "candidates and recruiters use every day.",
+    "When our main database had an outage, I coordinated the incident "
+    "channel, switched reads to the replica and wrote the postmortem. We "
+    "added alerting on replication lag so it would be caught earlier.",
+    "For a rate limiter I would use a token bucket per API key in Redis, "
+    "with a Lua script for atomic refill and take, and return 429 with a "
+    "Retry-After header when the bucket is empty.",
+    "I learned Kubernetes quickly for a migration by pairing with our "
+    "platform team, reading the official tutorials and moving one small "
+    "service first to validate our deployment approach.",
+]
+
+
+@dataclass
+class LoadTestConfig:
+    candidates: int = 10  # Simulated candidates (one interview each)
+    concurrency: int = 10  # Candidates in flight at once
+    types: List[str] = field(default_factory=lambda: list(INTERVIEW_TYPES))
+    llm_latency_ms: float = 0.0
+    embedding_latency_ms: float = 0.0
+    latency_sigma: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+    think_time_ms: float = 0.0  # Pause between a candidate's answers
+    max_turns: int = 30  # Safety cap per interview
+    data_dir: Optional[str] = None  # Session files (default: temp directory)
+
+
+def configure_environment(config: LoadTestConfig, data_dir: str) -> None:
+    """Point settings at the stubs and a scratch data directory (before app import)"""
+    os.environ.update({
+        "LLM_PROVIDER": "stub",
+        "EMBEDDING_PROVIDER": "stub",
+        "COST_OPTIMIZED_MODE": "false",
+        "STUB_SEED": str(config.seed),
+        "STUB_LLM_LATENCY_MS": str(config.llm_latency_ms),
+        "STUB_EMBEDDING_LATENCY_MS": str(config.embedding_latency_ms),
+        "STUB_LATENCY_SIGMA": str(config.latency_sigma),
+        "STUB_ERROR_RATE": str(config.error_rate),
+        "SESSION_DATA_DIR": os.path.join(data_dir, "sessions"),
+        "DATA_DIR": data_dir,
+        "LLM_CACHE_PATH": "",
+        "EMBEDDING_CACHE_PATH": "",
+        "VECTOR_SNAPSHOT_ENABLED": "false",
+    })
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: List[float], errors: int = 0) -> Dict[str, Any]:
+    def ms(value):
+        return round(value, 2) if value is not None else None
+
+    return {
+        "count": len(samples),
+        "errors": errors,
+        "mean_ms": ms(sum(samples) / len(samples)) if samples else None,
+        "p50_ms": ms(percentile(samples, 50)),
+        "p95_ms": ms(percentile(samples, 95)),
+        "p99_ms": ms(percentile(samples, 99)),
+        "max_ms": ms(max(samples)) if samples else None,
+    }
+
+
+class LatencyRecorder:
+    """Latency samples and error counts keyed by endpoint or stage name"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, name: str, elapsed_ms: float, ok: bool = True) -> None:
+        self.samples[name].append(elapsed_ms)
+        if not ok:
+            self.errors[name] += 1
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: summarize(self.samples[name], self.errors.get(name, 0))
+            for name in sorted(self.samples)
+        }
+
+
+def _stage_targets() -> Dict[str, List[tuple]]:
+    """(class, method) pairs timed as pipeline stages"""
+    from app.interview.base_interview import BaseInterviewService
+    from app.interview.behavioral_interview import BehavioralInterviewService
+    from app.interview.screening_interview import ScreeningInterviewService
+    from app.interview.technical_interview import TechnicalInterviewService
+    from app.services.llm_service import LLMService
+    from app.services.session_persistence import PersistentSessionStore, SessionIndex
+    from app.services.session_store import SessionStore
+
+    services = [
+        ScreeningInterviewService,
+        BehavioralInterviewService,
+        TechnicalInterviewService,
+    ]
+    return {
+        "process_message": [(BaseInterviewService, "process_message")],
+        "build_context": [(cls, "_build_context") for cls in services],
+        "evaluate": [(cls, "_evaluate_response") for cls in services],
+        "follow_up": [(cls, "_check_follow_up") for cls in services],
+        "next_question": [(cls, "_get_next_question") for cls in services],
+        "complete": [(BaseInterviewService, "_complete_interview")],
+        "summary": [(cls, "_generate_summary") for cls in services],
+        "llm_generate": [(LLMService, "generate")],
+        "session_save": [(PersistentSessionStore, "save")],
+        "session_index_load": [(SessionIndex, "load")],
+        "session_load": [(PersistentSessionStore, "_load")],
+        "store_add_response": [(SessionStore, "add_response")],
+        "store_user_sessions": [(SessionStore, "get_user_sessions")],
+    }
+
+
+@contextmanager
+def instrument_stages(recorder: LatencyRecorder) -> Iterator[None]:
+    """Time the stage methods on their classes; restored on exit"""
+    patched = []
+    for stage, targets in _stage_targets().items():
+        for cls, name in targets:
+            original = cls.__dict__.get(name)
+            if original is None:
+                continue
+            patched.append((cls, name, original))
+            setattr(cls, name, _timed(original, stage, recorder))
+    try:
+        yield
+    finally:
+        for cls, name, original in reversed(patched):
+            setattr(cls, name, original)
+
+
+def _timed(func, stage: str, recorder: LatencyRecorder):
+    if asyncio.iscoroutinefunction(func):
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = await func(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                recorder.record(stage, (time.perf_counter() - started) * 1000, ok)
+    else:
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = func(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                recorder.record(stage, (time.perf_counter() - started) * 1000, ok)
+    timed.__wrapped__ = func
+    return timed
+
+
+class Candidate:
+    """One simulated candidate running one interview over HTTP"""
+
+    def __init__(self, index: int, interview_type: str, client, config: LoadTestConfig,
+                 endpoints: LatencyRecorder):
+        self.index = index
+        self.interview_type = interview_type
+        self.client = client
+        self.config = config
+        self.endpoints = endpoints
+        self.user_id = f"load_{config.seed}_{index}"
+        self.rng = random.Random(config.seed * 100003 + index)
+        self.turns = 0
+
+    async def _call(self, name: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except Exception:
+            self.endpoints.record(name, (time.perf_counter() - started) * 1000, False)
+            raise
+        ok = response.status_code < 400
+        if ok and name.endswith("/message"):
+            ok = response.json().get("type") != "error"
+        self.endpoints.record(name, (time.perf_counter() - started) * 1000, ok)
+        response.raise_for_status()
+        return response.json()
+
+    async def run(self) -> bool:
+        """Returns True when the interview reached completion"""
+        base = f"/api/interview/{self.interview_type}"
+        start = await self._call(
+            f"POST {base}/start", "POST", f"{base}/start",
+            json={
+                "user_id": self.user_id,
+                "resume_text": RESUME,
+                "job_description": JOB_DESCRIPTION,
+            }
+        )
+        session_id = start["session_id"]
+
+        completed = False
+        answers = self.rng.sample(ANSWERS, len(ANSWERS))
+        while self.turns < self.config.max_turns:
+            if self.config.think_time_ms:
+                await asyncio.sleep(self.config.think_time_ms / 1000)
+            reply = await self._call(
+                f"POST {base}/message", "POST", f"{base}/message",
+                json={
+                    "session_id": session_id,
+                    "message": answers[self.turns % len(answers)],
+                }
+            )
+            self.turns += 1
+            if reply.get("is_complete"):
+                completed = True
+                break
+
+        await self._call(
+            "GET /api/dashboard/session/{id}/report", "GET",
+            f"/api/dashboard/session/{session_id}/report"
+        )
+        await self._call(
+            "GET /api/dashboard/history/{user_id}", "GET",
+            f"/api/dashboard/history/{self.user_id}"
+        )
+        await self._call(
+            "GET /api/dashboard/stats/{user_id}", "GET",
+            f"/api/dashboard/stats/{self.user_id}"
+        )
+        return completed
+
+
+async def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    """
+    Run the load test in this process and return the report
+
+    Expects configure_environment() to have run before the app was imported.
+    """
+    import httpx
+    from app.main import app, lifespan
+
+    endpoints = LatencyRecorder()
+    stages = LatencyRecorder()
+    semaphore = asyncio.Semaphore(config.concurrency)
+    outcomes = {"completed": 0, "incomplete": 0, "failed": 0}
+    turns = 0
+
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest", timeout=None
+        ) as client:
+
+            async def candidate(index: int) -> None:
+                nonlocal turns
+                interview_type = config.types[index % len(config.types)]
+                sim = Candidate(index, interview_type, client, config, endpoints)
+                async with semaphore:
+                    try:
+                        done = await sim.run()
+                        outcomes["completed" if done else "incomplete"] += 1
+                    except Exception:
+                        outcomes["failed"] += 1
+                    turns += sim.turns
+
+            with instrument_stages(stages):
+                started = time.perf_counter()
+                await asyncio.gather(*(candidate(i) for i in range(config.candidates)))
+                wall = time.perf_counter() - started
+
+    requests = sum(len(s) for s in endpoints.samples.values())
+    return {
+        "config": asdict(config),
+        "wall_seconds": round(wall, 3),
+        "sessions": outcomes,
+        "answers_sent": turns,
+        "throughput": {
+            "requests_per_second": round(requests / wall, 2) if wall else None,
+            "sessions_per_second": round(outcomes["completed"] / wall, 3) if wall else None,
+        },
+        "endpoints": endpoints.report(),
+        "stages": stages.report(),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Sessions: {report['sessions']}  answers: {report['answers_sent']}  "
+        f"wall: {report['wall_seconds']}s",
+        f"Throughput: {report['throughput']['requests_per_second']} req/s, "
+        f"{report['throughput']['sessions_per_second']} sessions/s",
+    ]
+    for title in ("endpoints", "stages"):
+        rows = report[title]
+        if not rows:
+            continue
+        width = max(len(name) for name in rows)
+        lines.append("")
+        lines.append(
+            f"{title.upper():<{width}}  {'count':>6} {'err':>4} "
+            f"{'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+        )
+        for name, s in rows.items():
+            cells = [
+                f"{s[k]:>9.1f}" if s[k] is not None else f"{'-':>9}"
+                for k in ("p50_ms", "p95_ms", "p99_ms", "max_ms")
+            ]
+            lines.append(
+                f"{name:<{width}}  {s['count']:>6} {s['errors']:>4} " + " ".join(cells)
+            )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="End-to-end interview load test")
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Candidates in flight at once (default: all)")
+    parser.add_argument("--types", default=",".join(INTERVIEW_TYPES),
+                        help="Comma-separated interview types to cycle through")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--embedding-latency-ms", type=float, default=0.0)
+    parser.add_argument("--sigma", type=float, default=0.0,
+                        help="Log-normal latency spread (0 = constant)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--think-time-ms", type=float, default=0.0)
+    parser.add_argument("--data-dir", default=None,
+                        help="Session data directory (default: temporary)")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="Also write the report as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    types = [t.strip() for t in args.types.split(",") if t.strip()]
+    unknown = set(types) - set(INTERVIEW_TYPES)
+    if unknown:
+        print(f"Unknown interview types: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    config = LoadTestConfig(
+        candidates=args.candidates,
+        concurrency=args.concurrency or args.candidates,
+        types=types,
+        llm_latency_ms=args.llm_latency_ms,
+        embedding_latency_ms=args.embedding_latency_ms,
+        latency_sigma=args.sigma,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        think_time_ms=args.think_time_ms,
+        data_dir=args.data_dir,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="loadtest_") as scratch:
+        configure_environment(config, config.data_dir or scratch)
+        report = asyncio.run(run_load_test(config))
+
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w") as fp:
+            json.dump(report, fp, indent=2)
+    return 0 if report["sessions"]["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
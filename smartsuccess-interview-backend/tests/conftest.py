@@ -3,13 +3,30 @@ Pytest Configuration and Fixtures
 """
 
 import os
+import shutil
 import sys
+import tempfile
 import pytest
 from fastapi.testclient import TestClient
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Keep sessions and caches written by tests out of the repo's data/ directory
+# (set before app.config is imported)
+TEST_DATA_DIR = tempfile.mkdtemp(prefix="smartsuccess-tests-")
+os.environ["SESSION_DATA_DIR"] = os.path.join(TEST_DATA_DIR, "sessions")
+os.environ["SESSION_SQLITE_PATH"] = os.path.join(TEST_DATA_DIR, "sessions.db")
+os.environ["LLM_CACHE_PATH"] = os.path.join(TEST_DATA_DIR, "llm_cache.db")
+os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(TEST_DATA_DIR, "embedding_cache.db")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def test_data_dir():
+    """Temporary data directory for the whole test session"""
+    yield TEST_DATA_DIR
+    shutil.rmtree(TEST_DATA_DIR, ignore_errors=True)
+
 
 @pytest.fixture(scope="session")
 def client():
@@ -16,6 +16,7 @@ class TestHealth:
         data = response.json()
         assert data["status"] == "healthy"
         assert "version" in data
+        assert "bytes_resident" in data["vector_store"]
     
     def test_readiness_check(self, client):
         """Test readiness endpoint"""
@@ -0,0 +1,77 @@
+"""
+Tests for the micro-benchmark suite (perf/bench.py)
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from perf.bench import BENCHMARKS, compare, make_document, measure
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _results(**medians):
+    return {"results": {key: {"median_s": value} for key, value in medians.items()}}
+
+
+class TestBenchHelpers:
+    """Test input generation, timing and comparison"""
+
+    def test_registry_names_unique(self):
+        names = [bench.name for bench in BENCHMARKS]
+        assert len(names) == len(set(names))
+
+    def test_document_size(self):
+        import random
+        text = make_document(10, random.Random(0))
+        assert 30_000 <= len(text) < 34_000
+        assert "EXPERIENCE:" in text and "@example.com" in text
+
+    def test_measure(self):
+        stats = measure(lambda: sum(range(100)), min_time=0.001, repeat=3)
+        assert stats["repeat"] == 3
+        assert stats["number"] >= 1
+        assert 0 < stats["min_s"] <= stats["median_s"]
+
+    def test_compare(self):
+        base = _results(**{"a[1]": 1.0, "b[1]": 1.0, "c[1]": 1.0, "gone[1]": 1.0})
+        new = _results(**{"a[1]": 1.05, "b[1]": 1.5, "c[1]": 0.5, "added[1]": 1.0})
+        result = compare(base, new, threshold=0.10)
+        status = {row["benchmark"]: row["status"] for row in result["rows"]}
+        assert status == {"a[1]": "ok", "b[1]": "regression", "c[1]": "improvement"}
+        assert result["regressions"] == ["b[1]"]
+        assert result["only_in_base"] == ["gone[1]"]
+        assert result["only_in_new"] == ["added[1]"]
+
+
+class TestBenchRun:
+    """Run the suite and compare in their own processes"""
+
+    def _bench(self, *args):
+        return subprocess.run(
+            [sys.executable, "-m", "perf.bench", *args],
+            cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120
+        )
+
+    def test_quick_run_and_compare(self, tmp_path):
+        out = tmp_path / "results.json"
+        result = self._bench(
+            "run", "--quick", "--filter", "sessions|dashboard|json",
+            "--min-time", "0.001", "--repeat", "2", "--out", str(out)
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+
+        results = json.loads(out.read_text())["results"]
+        assert {"sessions.load_existing[10]", "dashboard.stats[10]",
+                "json.extract_json_from_llm[1]"} <= set(results)
+        assert all(entry["median_s"] > 0 for entry in results.values())
+
+        assert self._bench("compare", str(out), str(out)).returncode == 0
+        slower = json.loads(out.read_text())
+        for entry in slower["results"].values():
+            entry["median_s"] *= 2
+        slow_path = tmp_path / "slower.json"
+        slow_path.write_text(json.dumps(slower))
+        assert self._bench("compare", str(out), str(slow_path)).returncode == 1
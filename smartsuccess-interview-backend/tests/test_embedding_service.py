@@ -0,0 +1,219 @@
+"""
+Tests for EmbeddingService caching
+"""
+
+import asyncio
+import hashlib
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import embedding_cache as embedding_cache_module
+from app.core.embedding_cache import EmbeddingCache, cache_key
+from app.core.embedding_service import EmbeddingService
+
+
+class FakeOpenAIEmbeddings:
+    """Stand-in for AsyncOpenAI().embeddings recording each request"""
+
+    def __init__(self, dimension: int = 8, fail: bool = False):
+        self.dimension = dimension
+        self.fail = fail
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def vector(self, text: str):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [b / 255.0 + 0.01 for b in digest[:self.dimension]]
+
+    async def create(self, model, input):
+        self.requests.append(input)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if self.fail:
+            raise RuntimeError("provider down")
+        texts = [input] if isinstance(input, str) else input
+        data = [
+            SimpleNamespace(index=i, embedding=self.vector(t))
+            for i, t in reversed(list(enumerate(texts)))
+        ]
+        return SimpleNamespace(data=data)
+
+
+def _service(cache: EmbeddingCache, fake: FakeOpenAIEmbeddings) -> EmbeddingService:
+    service = EmbeddingService(cache=cache)
+    service.openai_client = SimpleNamespace(embeddings=fake)
+    service.xai_key = None
+    service.dimension = fake.dimension
+    return service
+
+
+class TestEmbeddingCache:
+    """Test the content-hash embedding cache"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_text_costs_no_call(self):
+        """Whitespace-equivalent texts hit the memory tier"""
+        fake = FakeOpenAIEmbeddings()
+        service = _service(EmbeddingCache(), fake)
+
+        first = await service.embed_text("Senior  Python\nengineer")
+        second = await service.embed_text("Senior Python engineer")
+
+        assert first == pytest.approx(second)
+        assert len(fake.requests) == 1
+        stats = service.cache.get_stats()
+        assert stats["memory_hits"] == 1 and stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_only_sends_missing_distinct_texts(self):
+        """Cached and duplicate texts are not sent; order is preserved"""
+        fake = FakeOpenAIEmbeddings()
+        service = _service(EmbeddingCache(), fake)
+        await service.embed_text("a")
+
+        result = await service.embed_batch(["b", "a", "c", "b", " "])
+
+        assert fake.requests[-1] == ["b", "c"]
+        assert result[0] == pytest.approx(fake.vector("b"))
+        assert result[1] == pytest.approx(fake.vector("a"))
+        assert result[3] == pytest.approx(fake.vector("b"))
+        assert result[4] == [0.0] * fake.dimension
+
+        await service.embed_batch(["a", "b", "c"])
+        assert len(fake.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_restart(self, tmp_path):
+        """A new cache on the same SQLite file serves earlier embeddings"""
+        db_path = str(tmp_path / "embeddings.db")
+        fake = FakeOpenAIEmbeddings()
+        cache = EmbeddingCache(db_path=db_path)
+        await _service(cache, fake).embed_batch(["resume chunk", "jd chunk"])
+        cache.close()
+
+        restarted = EmbeddingCache(db_path=db_path)
+        service = _service(restarted, fake)
+        assert await service.embed_text("jd chunk") == pytest.approx(fake.vector("jd chunk"))
+        assert len(fake.requests) == 1
+        assert restarted.get_stats()["disk_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_lookups_batched_off_the_event_loop(self, tmp_path):
+        """A batch reads the disk tier in one query, in a worker thread"""
+        db_path = str(tmp_path / "embeddings.db")
+        fake = FakeOpenAIEmbeddings()
+        cache = EmbeddingCache(db_path=db_path)
+        await _service(cache, fake).embed_batch(["a", "b", "c"])
+        cache.close()
+
+        restarted = EmbeddingCache(db_path=db_path)
+        calls = []
+        disk_get_many = restarted._disk_get_many
+
+        def record(keys):
+            calls.append((len(keys), threading.current_thread()))
+            return disk_get_many(keys)
+
+        restarted._disk_get_many = record
+        result = await _service(restarted, fake).embed_batch(["c", "a", "d", "a"])
+
+        assert result[:2] == [pytest.approx(fake.vector("c")), pytest.approx(fake.vector("a"))]
+        assert calls == [(3, calls[0][1])]
+        assert calls[0][1] is not threading.main_thread()
+        assert fake.requests[-1] == ["d"]
+        assert restarted.get_stats()["disk_hits"] == 3
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_is_pruned(self, tmp_path, monkeypatch):
+        """Expired rows are not served and the table is capped, oldest first"""
+        db_path = str(tmp_path / "embeddings.db")
+        cache = EmbeddingCache(db_path=db_path, disk_max_rows=150, ttl_seconds=60)
+        clock = [1000.0]
+        monkeypatch.setattr(
+            embedding_cache_module, "time", SimpleNamespace(time=lambda: clock[0])
+        )
+
+        await cache.put_many("m", [(f"old {i}", [1.0, 0.0]) for i in range(50)])
+        clock[0] += 30
+        for i in range(150):
+            clock[0] += 0.01
+            await cache.put("m", f"new {i}", [0.0, 1.0])
+        # 200 rows stored, pruned at 100 and 200: capped at the 150 newest
+        count = cache._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        assert count == 150
+        assert set(cache._disk_get_many([cache_key("m", "old 0"), cache_key("m", "new 0")])) == {
+            cache_key("m", "new 0")
+        }
+
+        clock[0] += 61
+        assert cache._disk_get_many([cache_key("m", "new 149")]) == {}
+
+    @pytest.mark.asyncio
+    async def test_failures_and_other_models_not_served(self):
+        """Zero vectors are not cached and keys are scoped by model"""
+        fake = FakeOpenAIEmbeddings(fail=True)
+        cache = EmbeddingCache()
+        service = _service(cache, fake)
+
+        assert await service.embed_text("text") == [0.0] * fake.dimension
+        assert cache.get_stats()["stores"] == 0
+
+        await cache.put("other-model", "text", [1.0] * fake.dimension)
+        assert await cache.get(service.model, "text") is None
+
+    @pytest.mark.asyncio
+    async def test_fallback_vectors_not_served_after_recovery(self, monkeypatch):
+        """Vectors from the xAI fallback never answer later OpenAI-space lookups"""
+        fake = FakeOpenAIEmbeddings(fail=True)
+        cache = EmbeddingCache()
+        service = _service(cache, fake)
+        service.xai_key = "xai-test"
+
+        async def embed_with_xai(text):
+            return [1.0] * fake.dimension
+
+        monkeypatch.setattr(service, "_embed_with_xai", embed_with_xai)
+        assert await service.embed_text("text") == [1.0] * fake.dimension
+        assert await service.embed_batch(["batch text"]) == [[1.0] * fake.dimension]
+
+        fake.fail = False
+        assert await service.embed_text("text") == pytest.approx(fake.vector("text"))
+        assert await service.embed_batch(["batch text"]) == [
+            pytest.approx(fake.vector("batch text"))
+        ]
+
+
+class TestEmbedMany:
+    """Test the batched, concurrency-limited embedding pipeline"""
+
+    @pytest.mark.asyncio
+    async def test_batches_are_budgeted_and_order_preserved(self):
+        """Texts are split by token/item budget and reassembled in order"""
+        fake = FakeOpenAIEmbeddings()
+        service = _service(EmbeddingCache(), fake)
+        service.batch_max_tokens = 30
+        service.batch_max_items = 3
+        service._batch_semaphore = asyncio.Semaphore(2)
+
+        texts = [f"chunk number {i} " * (1 + i % 3) for i in range(10)]
+        result = await service.embed_many(texts)
+
+        assert result == [pytest.approx(fake.vector(service._clean_text(t))) for t in texts]
+        assert sum(len(batch) for batch in fake.requests) == 10
+        for batch in fake.requests:
+            assert len(batch) <= 3
+            assert len(batch) == 1 or sum(service._estimate_tokens(t) for t in batch) <= 30
+        assert 1 < fake.max_in_flight <= 2
+
+    @pytest.mark.asyncio
+    async def test_empty_input(self):
+        """No texts means no provider call"""
+        fake = FakeOpenAIEmbeddings()
+        service = _service(EmbeddingCache(), fake)
+        assert await service.embed_many([]) == []
+        assert fake.requests == []
@@ -0,0 +1,107 @@
+"""
+Tests for the shared HTTP client pool
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from app.services.http_pool import HTTPClientPool
+
+
+@pytest_asyncio.fixture
+async def local_server():
+    """Local HTTP server recording the client port of every request"""
+    peers = []
+
+    async def handler(request):
+        peers.append(request.transport.get_extra_info("peername")[1])
+        status = int(request.query.get("status", 200))
+        return web.json_response({"ok": True}, status=status)
+
+    app = web.Application()
+    app.router.add_route("*", "/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/", peers
+    await runner.cleanup()
+
+
+class TestHTTPClientPool:
+    """Test keep-alive reuse, metrics and lifecycle"""
+
+    @pytest.mark.asyncio
+    async def test_httpx_client_reuses_connection(self, local_server):
+        """Sequential calls share one client and one TCP connection"""
+        url, peers = local_server
+        pool = HTTPClientPool()
+
+        for _ in range(3):
+            response = await pool.client("groq").post(url, json={})
+            assert response.status_code == 200
+        await pool.client("groq").get(url, params={"status": 429})
+
+        assert len(set(peers)) == 1
+        stats = pool.get_stats()["providers"]["groq"]
+        assert stats["requests"] == 4
+        assert stats["errors"] == 1
+        assert stats["clients_created"] == 1
+        assert stats["status_counts"] == {200: 3, 429: 1}
+
+        client = pool.client("groq")
+        await pool.aclose()
+        assert client.is_closed
+        assert pool.client("groq") is not client
+
+    @pytest.mark.asyncio
+    async def test_aiohttp_session_reuses_connection(self, local_server):
+        """MatchWise-style aiohttp calls share one keep-alive session"""
+        url, peers = local_server
+        pool = HTTPClientPool()
+
+        for _ in range(3):
+            async with pool.session("gemini").post(url, json={}) as response:
+                assert response.status == 200
+                await response.json()
+
+        assert len(set(peers)) == 1
+        assert pool.get_stats()["providers"]["gemini"]["requests"] == 3
+
+        session = pool.session("gemini")
+        await pool.aclose()
+        assert session.closed
+
+    @pytest.mark.asyncio
+    async def test_transport_errors_counted(self):
+        """Connection failures count as errors"""
+        pool = HTTPClientPool()
+        with pytest.raises(Exception):
+            await pool.client("xai").get("http://127.0.0.1:9/", timeout=1.0)
+        assert pool.get_stats()["providers"]["xai"]["errors"] == 1
+        await pool.aclose()
+
+    def test_client_from_previous_loop_is_closed(self):
+        """A client replaced after an event-loop change is closed, not leaked"""
+        pool = HTTPClientPool()
+
+        async def warm():
+            pool.warm(["groq", "xai"])
+            return pool.client("groq")
+
+        async def replace():
+            client = pool.client("groq")
+            await pool.aclose()
+            return client
+
+        old = asyncio.run(warm())
+        new = asyncio.run(replace())
+
+        assert new is not old
+        assert old.is_closed and new.is_closed
+        assert pool.get_stats()["providers"]["groq"]["clients_created"] == 2
+        assert pool.get_stats()["clients_retired"] == 2  # groq on reuse, xai on aclose
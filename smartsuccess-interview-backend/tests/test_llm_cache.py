@@ -0,0 +1,77 @@
+"""
+Tests for the LLM response cache
+"""
+
+import time
+
+import pytest
+
+from app.services.llm_cache import LLMResponseCache, response_key
+
+
+class TestResponseKey:
+    """Test key construction"""
+
+    def test_temperature_bucketing(self):
+        assert response_key("p", None, 0.3, 100) == response_key("p", "", 0.31, 100)
+        assert response_key("p", None, 0.3, 100) != response_key("p", None, 0.5, 100)
+        assert response_key("p", None, 0.3, 100) != response_key("p", None, 0.3, 200)
+        assert response_key("p", "sys", 0.3, 100) != response_key("p", None, 0.3, 100)
+        assert response_key("p", None, 0.3, 100, "openai/gpt-4o") != response_key(
+            "p", None, 0.3, 100, "openai/gpt-4o-mini"
+        )
+
+    def test_should_cache(self):
+        cache = LLMResponseCache(max_temperature=0.3)
+        assert cache.should_cache(0.3)
+        assert not cache.should_cache(0.7)
+        assert cache.should_cache(0.7, opt_in=True)
+        assert not cache.should_cache(0.0, opt_in=False)
+        assert not LLMResponseCache(enabled=False).should_cache(0.0, opt_in=True)
+
+
+class TestLLMResponseCache:
+    """Test LRU, TTL and the disk tier"""
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self):
+        cache = LLMResponseCache(max_entries=2)
+        await cache.put("a", "A")
+        await cache.put("b", "B")
+        assert await cache.get("a") == "A"
+        await cache.put("c", "C")
+        assert await cache.get("b") is None
+        assert await cache.get("a") == "A" and await cache.get("c") == "C"
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        cache = LLMResponseCache(ttl_seconds=0.05)
+        await cache.put("k", "value")
+        assert await cache.get("k") == "value"
+        time.sleep(0.06)
+        assert await cache.get("k") is None
+        assert cache.get_stats()["expired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_responses_not_stored(self):
+        cache = LLMResponseCache()
+        await cache.put("k", "  ")
+        assert await cache.get("k") is None
+        assert cache.get_stats()["stores"] == 0
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_restart(self, tmp_path):
+        db_path = str(tmp_path / "llm_cache.db")
+        cache = LLMResponseCache(db_path=db_path)
+        await cache.put("k", "persisted")
+        cache.close()
+
+        restarted = LLMResponseCache(db_path=db_path)
+        assert await restarted.get("k") == "persisted"
+        assert restarted.get_stats()["disk_hits"] == 1
+        restarted.close()
+
+        expired = LLMResponseCache(db_path=db_path, ttl_seconds=0)
+        assert await expired.get("k") is None
+        assert expired._disk_get("k") is None
+        expired.close()
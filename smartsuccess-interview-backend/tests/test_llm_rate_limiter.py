@@ -0,0 +1,103 @@
+"""
+Tests for per-provider LLM token buckets and the priority wait queue
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.llm_rate_limiter import (
+    LLMRateLimiter,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    RateLimitTimeout,
+    TokenBucket,
+    estimate_tokens
+)
+
+GROQ = {"provider": "groq", "model": "llama", "rpm": 600, "tpm": 60000}
+
+
+def _drain(limiter: LLMRateLimiter, config=GROQ):
+    """Empty the request bucket so the next acquire has to queue"""
+    bucket = limiter.limiter(config).requests
+    bucket.take(bucket.capacity, bucket.updated)
+    return bucket
+
+
+class TestTokenBucket:
+    """Test refill arithmetic"""
+
+    def test_wait_time_and_refill(self):
+        bucket = TokenBucket(per_minute=60)
+        start = bucket.updated
+        assert bucket.wait_time(60, start) == 0
+        bucket.take(60, start)
+        assert bucket.wait_time(1, start) == pytest.approx(1.0)
+        assert bucket.wait_time(1, start + 0.5) == pytest.approx(0.5)
+        assert bucket.wait_time(1, start + 1.0) == 0
+        # Oversized requests only need a full bucket
+        assert bucket.wait_time(1000, start + 1.0) == pytest.approx(59.0)
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("x" * 400, "y" * 400, 100) == 300
+
+
+class TestLLMRateLimiter:
+    """Test queueing, priority, timeouts and metrics"""
+
+    @pytest.mark.asyncio
+    async def test_unlimited_config_passes_through(self):
+        limiter = LLMRateLimiter()
+        assert await limiter.acquire({"provider": "openai", "model": "x"}, 100) == 0.0
+        assert limiter.get_stats()["providers"] == {}
+
+    @pytest.mark.asyncio
+    async def test_interactive_served_before_background(self):
+        """Queued live turns jump ahead of earlier background work"""
+        limiter = LLMRateLimiter(max_wait=5)
+        _drain(limiter)
+        order = []
+
+        async def call(name, priority):
+            await limiter.acquire(GROQ, 10, priority)
+            order.append(name)
+
+        tasks = [asyncio.create_task(call("report-1", PRIORITY_BACKGROUND))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("report-2", PRIORITY_BACKGROUND)))
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("turn", PRIORITY_INTERACTIVE)))
+        await asyncio.sleep(0.01)
+        assert limiter.limiter(GROQ).depth() == 3
+
+        await asyncio.gather(*tasks)
+        assert order == ["turn", "report-1", "report-2"]
+
+        stats = limiter.get_stats()["providers"]["groq/llama"]
+        assert stats["queued"] == 3 and stats["max_queue_depth"] == 3
+        assert stats["queue_depth"] == 0
+        assert stats["max_wait_ms"] >= 150
+
+    @pytest.mark.asyncio
+    async def test_timeout_leaves_queue(self):
+        """A caller past max_wait gets RateLimitTimeout and is dropped from the queue"""
+        limiter = LLMRateLimiter(max_wait=0.02)
+        _drain(limiter)
+
+        with pytest.raises(RateLimitTimeout):
+            await limiter.acquire(GROQ, 10)
+
+        provider = limiter.limiter(GROQ)
+        assert provider.depth() == 0
+        assert provider.metrics.timeouts == 1
+        # Capacity that refills is granted to the next caller, not the abandoned one
+        assert await limiter.acquire(GROQ, 10, max_wait=1) > 0
+
+    @pytest.mark.asyncio
+    async def test_token_budget_limits_large_requests(self):
+        limiter = LLMRateLimiter(max_wait=0.02)
+        config = {"provider": "groq", "model": "small", "tpm": 6000}
+        assert await limiter.acquire(config, 6000) == 0.0
+        with pytest.raises(RateLimitTimeout):
+            await limiter.acquire(config, 500)
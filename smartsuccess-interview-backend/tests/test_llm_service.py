@@ -0,0 +1,674 @@
+"""
+Tests for LLMService streaming, provider health and the SSE message flow
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.models import MessageResponse
+from app.services import llm_service as llm_module
+from app.services.llm_cache import LLMResponseCache
+from app.services.llm_rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from app.services.llm_service import LLMService
+from app.services.provider_health import (
+    CLOSED, HALF_OPEN, OPEN, BreakerConfig, CircuitBreaker, ProviderHealth
+)
+from app.utils.sse import message_event_stream
+
+
+def _sse(*payloads) -> bytes:
+    return "".join(
+        f"data: {p if isinstance(p, str) else json.dumps(p)}\n\n" for p in payloads
+    ).encode("utf-8")
+
+
+def _chat_chunk(text: str) -> dict:
+    return {"choices": [{"delta": {"content": text}}]}
+
+
+def _gemini_chunk(text: str) -> dict:
+    return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+class FakePool:
+    """Routes every provider's client through one httpx MockTransport"""
+
+    def __init__(self, handler):
+        self.requests = []
+
+        async def record(request):
+            self.requests.append(request)
+            response = handler(request)
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+
+        self._client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+
+    def client(self, provider):
+        return self._client
+
+
+def _service(monkeypatch, handler, cost_optimized=True) -> LLMService:
+    pool = FakePool(handler)
+    monkeypatch.setattr(llm_module, "get_http_pool", lambda: pool)
+    service = LLMService()
+    service.gemini_api_key = "gemini-key"
+    service.groq_api_key = "groq-key"
+    service.openai_api_key = "openai-key"
+    service.cost_optimized = cost_optimized
+    service.cache = LLMResponseCache()
+    service.pool = pool
+    return service
+
+
+async def _collect(stream) -> list:
+    return [delta async for delta in stream]
+
+
+class TestGenerateStream:
+    """Test streamed generation and provider fallback"""
+
+    @pytest.mark.asyncio
+    async def test_openai_deltas(self, monkeypatch):
+        """Default mode streams OpenAI chat deltas until [DONE]"""
+        def handler(request):
+            body = json.loads(request.content)
+            assert body["stream"] is True
+            assert body["messages"][0] == {"role": "system", "content": "be brief"}
+            return httpx.Response(200, content=_sse(
+                {"choices": [{"delta": {"role": "assistant"}}]},
+                _chat_chunk("Tell me "), _chat_chunk("about yourself."),
+                "[DONE]", _chat_chunk("ignored")
+            ))
+
+        service = _service(monkeypatch, handler, cost_optimized=False)
+        deltas = await _collect(service.generate_stream("q", system_prompt="be brief"))
+
+        assert deltas == ["Tell me ", "about yourself."]
+        assert service.pool.requests[0].url.host == "api.openai.com"
+        assert service.get_usage_stats()["provider_usage"]["openai"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gemini_stream(self, monkeypatch):
+        """Gemini uses streamGenerateContent with alt=sse"""
+        def handler(request):
+            assert request.url.path.endswith(":streamGenerateContent")
+            assert request.url.params["alt"] == "sse"
+            return httpx.Response(200, content=_sse(
+                _gemini_chunk("Why this "), _gemini_chunk("role?")
+            ))
+
+        service = _service(monkeypatch, handler)
+        assert await _collect(service.generate_stream("q")) == ["Why this ", "role?"]
+        assert service._daily_requests == 1
+
+    @pytest.mark.asyncio
+    async def test_falls_back_before_first_delta(self, monkeypatch):
+        """A provider failing before any text is skipped for the next one"""
+        def handler(request):
+            if request.url.host == "api.groq.com":
+                return httpx.Response(200, content=_sse(_chat_chunk("from groq"), "[DONE]"))
+            return httpx.Response(503, content=b"unavailable")
+
+        service = _service(monkeypatch, handler)
+        assert await _collect(service.generate_stream("q")) == ["from groq"]
+
+        hosts = [r.url.host for r in service.pool.requests]
+        assert hosts[-1] == "api.groq.com"
+        assert hosts.count("generativelanguage.googleapis.com") == 2
+        usage = service.get_usage_stats()["provider_usage"]
+        assert usage["groq"] == 1 and usage["gemini"] == 0
+
+    @pytest.mark.asyncio
+    async def test_error_after_first_delta_is_raised(self, monkeypatch):
+        """Text already yielded cannot be retracted, so no fallback happens"""
+        def handler(request):
+            return httpx.Response(200, content=_sse(_gemini_chunk("Half a "), "{not json"))
+
+        service = _service(monkeypatch, handler)
+        deltas = []
+        with pytest.raises(json.JSONDecodeError):
+            async for delta in service.generate_stream("q"):
+                deltas.append(delta)
+
+        assert deltas == ["Half a "]
+        assert len(service.pool.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_providers(self, monkeypatch):
+        """All providers failing raises like generate()"""
+        service = _service(monkeypatch, lambda request: httpx.Response(500))
+        with pytest.raises(Exception, match="All LLM providers failed"):
+            await _collect(service.generate_stream("q"))
+
+
+class FakeInterviewService:
+    """Minimal service exposing process_message_stream() for the SSE encoder"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+
+    async def process_message_stream(self, session_id, message):
+        yield {"event": "delta", "text": "Next "}
+        if self.fail:
+            raise RuntimeError("evaluation exploded")
+        yield {"event": "delta", "text": "question?"}
+        yield {"event": "done", "response": MessageResponse(
+            type="question", message="Next question?", question_number=2
+        )}
+
+
+class TestMessageStream:
+    """Test the interview-level streaming flow"""
+
+    @pytest.mark.asyncio
+    async def test_next_question_deltas_then_done(self, monkeypatch):
+        """process_message_stream() forwards question deltas before the final response"""
+        from app.interview.screening_interview import ScreeningInterviewService
+
+        service = ScreeningInterviewService()
+
+        async def evaluate(session, response):
+            return {"needs_followup": False}
+
+        async def no_follow_up(session, evaluation):
+            return None
+
+        async def next_question(session, on_delta=None):
+            for part in ["What drew ", "you to ", "this role?"]:
+                await on_delta(part)
+            return "What drew you to this role?"
+
+        monkeypatch.setattr(service, "_evaluate_response", evaluate)
+        monkeypatch.setattr(service, "_check_follow_up", no_follow_up)
+        monkeypatch.setattr(service, "_get_next_question", next_question)
+
+        session = await service.create_session(user_id="stream_user")
+        events = [
+            event async for event in service.process_message_stream(
+                session.session_id,
+                "I am a backend engineer with six years of experience in Python."
+            )
+        ]
+        service.delete_session(session.session_id)
+
+        assert [e["text"] for e in events[:-1]] == ["What drew ", "you to ", "this role?"]
+        assert events[-1]["event"] == "done"
+        assert events[-1]["response"].message == "What drew you to this role?"
+
+    @pytest.mark.asyncio
+    async def test_disconnect_mid_stream_finishes_turn(self, monkeypatch):
+        """A client disconnect drops the deltas but the turn still completes and persists"""
+        from app.interview import base_interview
+        from app.interview.screening_interview import ScreeningInterviewService
+
+        service = ScreeningInterviewService()
+        release = asyncio.Event()
+
+        async def evaluate(session, response):
+            return {"needs_followup": False}
+
+        async def no_follow_up(session, evaluation):
+            return None
+
+        async def next_question(session, on_delta=None):
+            if on_delta:
+                await on_delta("Tell me ")
+                await release.wait()
+                await on_delta("more.")
+            return "Tell me more."
+
+        persisted = []
+        persist = service._persist_session
+        monkeypatch.setattr(service, "_evaluate_response", evaluate)
+        monkeypatch.setattr(service, "_check_follow_up", no_follow_up)
+        monkeypatch.setattr(service, "_get_next_question", next_question)
+        monkeypatch.setattr(
+            service, "_persist_session",
+            lambda session: persisted.append(session.current_question_index) or persist(session)
+        )
+
+        session = await service.create_session(user_id="disconnect_user")
+        answer = "I build distributed systems in Python and mentor junior teammates."
+        await service.process_message(session.session_id, answer)
+        session = service.get_session(session.session_id)
+        questions = len(session.questions_asked)
+        index = session.current_question_index
+
+        stream = service.process_message_stream(session.session_id, answer)
+        assert (await stream.__anext__())["text"] == "Tell me "
+        await stream.aclose()  # Client disconnects mid-question
+
+        release.set()
+        await asyncio.gather(*base_interview._detached_turns)
+
+        session = service.get_session(session.session_id)
+        service.delete_session(session.session_id)
+        assert session.current_question_index == index + 1
+        assert session.questions_asked[questions:] == ["Tell me more."]
+        assert session.responses[-1]["question_index"] == index
+        assert persisted[-1] == index + 1
+
+    @pytest.mark.asyncio
+    async def test_sse_encoding(self):
+        """Events are encoded as named SSE frames; errors end the stream"""
+        frames = [f async for f in message_event_stream(FakeInterviewService(), "s", "m")]
+        assert frames[0] == 'event: delta\ndata: {"text": "Next "}\n\n'
+        assert frames[-1].startswith("event: done\n")
+        assert json.loads(frames[-1].split("data: ", 1)[1])["message"] == "Next question?"
+
+        frames = [f async for f in message_event_stream(FakeInterviewService(fail=True), "s", "m")]
+        assert frames[-1] == 'event: error\ndata: {"detail": "evaluation exploded"}\n\n'
+
+
+class TestStreamEndpoints:
+    """Test the SSE endpoint wiring"""
+
+    @pytest.mark.parametrize("interview_type", ["screening", "behavioral", "technical"])
+    def test_unknown_session_404(self, client, interview_type):
+        response = client.post(
+            f"/api/interview/{interview_type}/message/stream",
+            json={"session_id": "missing", "message": "hello"}
+        )
+        assert response.status_code == 404
+
+
+def _completion(request):
+    """Non-streaming success for any provider; Gemini requests fail"""
+    if request.url.host == "generativelanguage.googleapis.com":
+        return httpx.Response(503, content=b"overloaded")
+    return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions and health-aware routing"""
+
+    def test_state_transitions(self):
+        """closed → open on failure rate → half-open probe → closed"""
+        breaker = CircuitBreaker(BreakerConfig(min_calls=4, open_seconds=30))
+        for ok in (True, False, True, False):
+            assert breaker.allow(now=0)
+            breaker.record(ok, 100, now=0)
+        assert breaker.state == OPEN
+        assert not breaker.allow(now=10)
+
+        probe = breaker.allow(now=31)
+        assert probe and breaker.state == HALF_OPEN
+        assert not breaker.allow(now=31)  # Only one probe at a time
+        breaker.record(False, 100, now=32, permit=probe)
+        assert breaker.state == OPEN and breaker.times_opened == 2
+
+        probe = breaker.allow(now=63)
+        breaker.record(True, 100, now=63, permit=probe)
+        assert breaker.state == CLOSED
+        assert breaker.success_rate(now=63) == 1.0
+
+    def test_only_probe_holder_decides_half_open(self):
+        """A call started while closed cannot release or settle the probe"""
+        breaker = CircuitBreaker(BreakerConfig(min_calls=2, open_seconds=30))
+        early = breaker.allow(now=0)
+        for _ in range(2):
+            breaker.record(False, 100, now=0, permit=breaker.allow(now=0))
+        assert breaker.state == OPEN
+
+        probe = breaker.allow(now=31)
+        breaker.release(early)
+        assert not breaker.allow(now=31)  # Probe still held
+        breaker.record(True, 100, now=32, permit=early)
+        assert breaker.state == HALF_OPEN
+
+        breaker.record(False, 100, now=33, permit=probe)
+        assert breaker.state == OPEN
+
+    def test_slow_calls_open_breaker(self):
+        breaker = CircuitBreaker(BreakerConfig(min_calls=4, slow_call_ms=1000))
+        for _ in range(4):
+            breaker.record(True, 5000, now=0)
+        assert breaker.state == OPEN
+
+    def test_rank_by_health_keeps_openai_last(self):
+        """Healthier/faster free providers move up; OpenAI never does"""
+        health = ProviderHealth()
+        gemini = {"provider": "gemini", "model": "g"}
+        groq = {"provider": "groq", "model": "l"}
+        openai = {"provider": "openai", "model": "o"}
+        for _ in range(5):
+            health.record(gemini, True, 2000)
+            health.record(groq, True, 300)
+            health.record(openai, True, 50)
+
+        assert health.rank([gemini, groq, openai]) == [groq, gemini, openai]
+        health.record(groq, False, 300)
+        health.record(groq, False, 300)
+        assert health.rank([gemini, groq, openai]) == [gemini, groq, openai]
+
+    @pytest.mark.asyncio
+    async def test_open_provider_is_skipped(self, monkeypatch):
+        """Once Gemini's breakers open, generate() goes straight to Groq"""
+        service = _service(monkeypatch, _completion)
+        service.health.adaptive = False
+        service.openai_api_key = None
+
+        for _ in range(4):
+            assert await service.generate("q") == "ok"
+        gemini_calls = sum(
+            r.url.host == "generativelanguage.googleapis.com"
+            for r in service.pool.requests
+        )
+        assert gemini_calls == 8  # Both Gemini models, four times
+
+        service.pool.requests.clear()
+        assert await service.generate("q") == "ok"
+        assert [r.url.host for r in service.pool.requests] == ["api.groq.com"]
+        stats = service.get_usage_stats()["provider_health"]
+        assert stats["skipped_open"] == 2
+        assert stats["breakers"]["groq/llama-3.3-70b-versatile"]["state"] == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_adaptive_routing_prefers_healthy_provider(self, monkeypatch):
+        """A failing provider drops behind a healthy one before its breaker opens"""
+        service = _service(monkeypatch, _completion)
+        service.openai_api_key = None
+
+        await service.generate("q")
+        service.pool.requests.clear()
+        await service.generate("q")
+        assert [r.url.host for r in service.pool.requests] == ["api.groq.com"]
+
+
+class TestHedging:
+    """Test hedged requests, budgets and stats"""
+
+    def _hedging_service(self, monkeypatch, handler, **policy):
+        service = _service(monkeypatch, handler)
+        service.health.adaptive = False
+        service.hedging.enabled = True
+        service.hedging.default_delay_ms = 50
+        service.hedging.min_delay_ms = 10
+        for name, value in policy.items():
+            setattr(service.hedging, name, value)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self, monkeypatch):
+        """The hedge to the next provider wins and the primary call is cancelled"""
+        cancelled = []
+
+        async def handler(request):
+            if request.url.host == "generativelanguage.googleapis.com":
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(request.url.path)
+                    raise
+            return httpx.Response(200, json={"choices": [{"message": {"content": "groq"}}]})
+
+        service = self._hedging_service(monkeypatch, handler)
+        assert await asyncio.wait_for(service.generate("q"), timeout=2) == "groq"
+        await asyncio.sleep(0)
+
+        hosts = [r.url.host for r in service.pool.requests]
+        assert hosts == ["generativelanguage.googleapis.com", "api.groq.com"]
+        assert len(cancelled) == 1
+        stats = service.get_usage_stats()["hedging"]
+        assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+        assert stats["hedge_rate"] == 1.0 and stats["win_rate"] == 1.0
+        assert service.health.breaker({"provider": "gemini", "model": "gemini-2.5-flash"}).state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_not_hedged(self, monkeypatch):
+        service = self._hedging_service(monkeypatch, _completion, allow_openai=True)
+        service.gemini_api_key = None
+        assert await service.generate("q") == "ok"
+        stats = service.hedging.stats
+        assert stats.eligible == 1 and stats.hedged == 0
+        assert len(service.pool.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_never_hedges_to_openai_by_default(self, monkeypatch):
+        """Groq is the last free provider, so there is nothing to hedge to"""
+        async def handler(request):
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json={"choices": [{"message": {"content": "slow"}}]})
+
+        service = self._hedging_service(monkeypatch, handler)
+        service.gemini_api_key = None
+        assert await service.generate("q") == "slow"
+        assert [r.url.host for r in service.pool.requests] == ["api.groq.com"]
+        assert service.hedging.stats.eligible == 0
+
+        service.hedging.allow_openai = True
+        await service.generate("q")
+        assert service.hedging.stats.hedged == 1
+
+    @pytest.mark.asyncio
+    async def test_budget_limits_hedges(self, monkeypatch):
+        """Beyond the per-minute budget the primary is simply awaited"""
+        async def handler(request):
+            if request.url.host == "generativelanguage.googleapis.com":
+                await asyncio.sleep(0.1)
+                return httpx.Response(200, json={
+                    "candidates": [{"content": {"parts": [{"text": "gemini"}]}}]
+                })
+            await asyncio.sleep(0.3)
+            return httpx.Response(200, json={"choices": [{"message": {"content": "groq"}}]})
+
+        service = self._hedging_service(monkeypatch, handler, max_per_minute=1)
+        assert await service.generate("q") == "gemini"
+        assert await service.generate("q") == "gemini"
+
+        stats = service.hedging.stats
+        assert stats.hedged == 1 and stats.primary_wins == 1
+        assert stats.budget_denied == 1
+
+    @pytest.mark.asyncio
+    async def test_open_backup_does_not_spend_budget(self, monkeypatch):
+        """A backup refused by its breaker leaves the hedge budget untouched"""
+        async def handler(request):
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json={
+                "candidates": [{"content": {"parts": [{"text": "gemini"}]}}]
+            })
+
+        service = self._hedging_service(monkeypatch, handler, max_per_minute=1)
+        service.groq_api_key = None
+        primary, backup = service._get_provider_order(None)[:2]
+        monkeypatch.setattr(service.hedging, "candidate", lambda *args: backup)
+        service.health.breaker(backup)._probe = 1  # Another caller holds the probe
+        service.health.breaker(backup).state = HALF_OPEN
+
+        assert await service.generate("q") == "gemini"
+        assert service.hedging.stats.hedged == 0
+        assert service.hedging.acquire()  # Budget still available
+
+    def test_delay_uses_observed_percentile(self):
+        service = LLMService()
+        primary = {"provider": "groq", "model": "m"}
+        assert service.hedging.delay_seconds(primary, service.health) == (
+            service.hedging.default_delay_ms / 1000
+        )
+        for latency in range(100, 1100, 100):
+            service.health.record(primary, True, latency)
+        service.hedging.percentile = 50
+        assert service.hedging.delay_seconds(primary, service.health) == 0.6
+
+
+class TestRateLimiting:
+    """Test rate-limit integration in the fallback chain"""
+
+    @pytest.mark.asyncio
+    async def test_saturated_provider_falls_through(self, monkeypatch):
+        """A provider without capacity is skipped once max_wait passes"""
+        service = _service(monkeypatch, _completion)
+        service.gemini_api_key = None
+        service.rate_limiter.max_wait = 0.01
+        groq = service._get_provider_order(None)[0]
+        bucket = service.rate_limiter.limiter(groq).requests
+        bucket.take(bucket.capacity, bucket.updated)
+
+        assert await service.generate("q") == "ok"
+        assert [r.url.host for r in service.pool.requests] == ["api.openai.com"]
+        stats = service.get_usage_stats()["rate_limits"]["providers"]
+        assert stats["groq/llama-3.3-70b-versatile"]["timeouts"] == 1
+        assert service.health.breaker(groq).state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_default_path_is_rate_limited(self, monkeypatch):
+        """Without routing, generate() and generate_stream() still take OpenAI capacity"""
+        def handler(request):
+            if json.loads(request.content).get("stream"):
+                return httpx.Response(200, content=_sse(_chat_chunk("ok"), "[DONE]"))
+            return _completion(request)
+
+        service = _service(monkeypatch, handler, cost_optimized=False)
+        assert await service.generate("q") == "ok"
+        assert await _collect(service.generate_stream("q")) == ["ok"]
+
+        key = f"openai/{llm_module.settings.llm_model}"
+        stats = service.get_usage_stats()["rate_limits"]["providers"][key]
+        assert stats["acquired"] == 2 and stats["rpm"] == 500
+        assert service.get_usage_stats()["provider_usage"]["openai"] == 2
+
+    @pytest.mark.asyncio
+    async def test_feedback_evaluation_is_background(self, monkeypatch):
+        """Feedback scoring queues behind live interview turns"""
+        from app.feedback.screening_feedback import ScreeningFeedbackService
+
+        priorities = []
+
+        class RecordingLLM:
+            def is_available(self):
+                return True
+
+            async def generate(self, prompt, priority=PRIORITY_INTERACTIVE, **kwargs):
+                priorities.append(priority)
+                return '{"communication_clarity": 4}'
+
+        feedback = ScreeningFeedbackService()
+        feedback.llm = RecordingLLM()
+        assert await feedback.evaluate_response("Q", "A") == {"communication_clarity": 4}
+        assert priorities == [PRIORITY_BACKGROUND]
+
+    @pytest.mark.asyncio
+    async def test_feedback_without_provider_uses_default(self, monkeypatch):
+        from app.feedback.screening_feedback import ScreeningFeedbackService
+
+        service = _service(monkeypatch, _completion, cost_optimized=False)
+        service.openai_api_key = None
+        feedback = ScreeningFeedbackService()
+        feedback.llm = service
+        assert await feedback.evaluate_response("Q", "A") == feedback._default_evaluation()
+        assert service.pool.requests == []
+
+    @pytest.mark.asyncio
+    async def test_report_summary_is_background(self, monkeypatch):
+        """Dashboard report summaries are generated at background priority"""
+        from app.api.routes import dashboard
+
+        service = _service(monkeypatch, _completion, cost_optimized=False)
+        priorities = []
+        generate = service.generate
+
+        async def recording_generate(prompt, priority=PRIORITY_INTERACTIVE, **kwargs):
+            priorities.append(priority)
+            return await generate(prompt, priority=priority, **kwargs)
+
+        service.generate = recording_generate
+        monkeypatch.setattr(dashboard, "get_llm_service", lambda: service)
+        report = {
+            "interview_type": "screening",
+            "conversation_history": [{
+                "question_index": 1, "question": "Q", "user_response": "A"
+            }],
+            "feedback_analysis": {"overall_score": 70.0},
+            "strengths": [],
+            "areas_for_improvement": []
+        }
+        assert await dashboard._generate_report_summary(report) == "ok"
+        assert priorities == [PRIORITY_BACKGROUND]
+
+        service.openai_api_key = None
+        assert await dashboard._generate_report_summary(report) is None
+
+    @pytest.mark.asyncio
+    async def test_interactive_call_served_before_queued_background(self, monkeypatch):
+        """With the bucket empty, a live turn overtakes an earlier report call"""
+        served = []
+
+        def handler(request):
+            served.append(json.loads(request.content)["messages"][-1]["content"])
+            return _completion(request)
+
+        service = _service(monkeypatch, handler, cost_optimized=False)
+        openai = service._default_provider()
+        bucket = service.rate_limiter.limiter(openai).requests
+        bucket.take(bucket.capacity, bucket.updated)
+
+        report = asyncio.create_task(
+            service.generate("report", priority=PRIORITY_BACKGROUND)
+        )
+        await asyncio.sleep(0)
+        turn = asyncio.create_task(
+            service.generate("turn", priority=PRIORITY_INTERACTIVE)
+        )
+        await asyncio.sleep(0.01)
+        assert service.rate_limiter.limiter(openai).depth() == 2
+
+        assert await asyncio.gather(report, turn) == ["ok", "ok"]
+        assert served == ["turn", "report"]
+
+
+class TestResponseCache:
+    """Test response-cache integration in generate() and generate_stream()"""
+
+    @pytest.mark.asyncio
+    async def test_low_temperature_calls_are_cached(self, monkeypatch):
+        service = _service(monkeypatch, _completion)
+        service.gemini_api_key = None
+
+        assert await service.generate("evaluate", temperature=0.3) == "ok"
+        assert await service.generate("evaluate", temperature=0.3) == "ok"
+        assert len(service.pool.requests) == 1
+
+        await service.generate("question", temperature=0.7)
+        await service.generate("question", temperature=0.7)
+        assert len(service.pool.requests) == 3
+
+        await service.generate("question", temperature=0.7, cache=True)
+        await service.generate("question", temperature=0.7, cache=True)
+        assert len(service.pool.requests) == 4
+        assert service.get_usage_stats()["response_cache"]["memory_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_is_cached_as_one_delta(self, monkeypatch):
+        def handler(request):
+            return httpx.Response(200, content=_sse(
+                _chat_chunk("Why "), _chat_chunk("this role?"), "[DONE]"
+            ))
+
+        service = _service(monkeypatch, handler, cost_optimized=False)
+        assert await _collect(service.generate_stream("q", temperature=0.0)) == ["Why ", "this role?"]
+        assert await _collect(service.generate_stream("q", temperature=0.0)) == ["Why this role?"]
+        assert len(service.pool.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_model_change_misses(self, monkeypatch):
+        """Responses cached for one LLM_MODEL are not served for another"""
+        service = _service(monkeypatch, _completion, cost_optimized=False)
+        await service.generate("evaluate", temperature=0.0)
+        monkeypatch.setattr(llm_module.settings, "llm_model", "gpt-4o")
+        await service.generate("evaluate", temperature=0.0)
+        assert len(service.pool.requests) == 2
+        assert json.loads(service.pool.requests[-1].content)["model"] == "gpt-4o"
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self, monkeypatch):
+        service = _service(monkeypatch, lambda request: httpx.Response(500))
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await service.generate("q", temperature=0.0)
+        assert service.cache.get_stats()["stores"] == 0
@@ -0,0 +1,76 @@
+"""
+Tests for the end-to-end load-test harness (perf/loadtest.py)
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from perf.loadtest import (
+    ANSWERS, LatencyRecorder, _stage_targets, instrument_stages, percentile
+)
+from app.utils.input_validator import validate_response
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLoadTestHelpers:
+    """Test percentile math, stage instrumentation and the answer bank"""
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([7.0], 99) == 7.0
+        assert percentile([], 50) is None
+
+    def test_answers_are_valid(self):
+        for answer in ANSWERS:
+            assert validate_response(answer) == (True, None)
+
+    def test_instrument_stages_restores(self):
+        originals = {
+            (cls, name): cls.__dict__.get(name)
+            for targets in _stage_targets().values() for cls, name in targets
+        }
+        with instrument_stages(LatencyRecorder()):
+            from app.services.llm_service import LLMService
+            assert LLMService.__dict__["generate"].__wrapped__ is originals[(LLMService, "generate")]
+        for (cls, name), original in originals.items():
+            assert cls.__dict__.get(name) is original
+
+    def test_recorder_report(self):
+        recorder = LatencyRecorder()
+        for ms in (10.0, 20.0, 30.0):
+            recorder.record("POST /x", ms)
+        recorder.record("POST /x", 40.0, ok=False)
+        report = recorder.report()["POST /x"]
+        assert report["count"] == 4
+        assert report["errors"] == 1
+        assert report["p50_ms"] == 20.0
+        assert report["max_ms"] == 40.0
+
+
+class TestLoadTestRun:
+    """Run the harness end to end in its own process (it configures settings)"""
+
+    def test_full_sessions(self, tmp_path):
+        out = tmp_path / "report.json"
+        result = subprocess.run(
+            [sys.executable, "-m", "perf.loadtest", "--candidates", "3",
+             "--json", str(out)],
+            cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+
+        report = json.loads(out.read_text())
+        assert report["sessions"] == {"completed": 3, "incomplete": 0, "failed": 0}
+        endpoints = report["endpoints"]
+        for interview_type in ("screening", "behavioral", "technical"):
+            assert endpoints[f"POST /api/interview/{interview_type}/start"]["count"] == 1
+            assert endpoints[f"POST /api/interview/{interview_type}/message"]["errors"] == 0
+        assert endpoints["GET /api/dashboard/session/{id}/report"]["count"] == 3
+        for stage in ("process_message", "evaluate", "next_question", "session_save"):
+            assert report["stages"][stage]["p99_ms"] is not None
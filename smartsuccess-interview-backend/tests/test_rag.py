@@ -0,0 +1,178 @@
+"""
+Tests for RAG context building and retrieval
+"""
+
+import hashlib
+
+import pytest
+
+from app.core.vector_store import VectorStore
+from app.rag.screening_rag import ScreeningRAGService
+
+
+class FakeEmbeddingCalls:
+    """Deterministic stand-in for EmbeddingService network calls"""
+
+    def __init__(self, dimension: int = 16):
+        self.dimension = dimension
+        self.texts = []
+        self.batches = []
+
+    def vector(self, text: str):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [b / 255.0 + 0.01 for b in digest[:self.dimension]]
+
+    async def embed_text(self, text: str):
+        self.texts.append(text)
+        return self.vector(text)
+
+    async def embed_batch(self, texts):
+        self.batches.append(list(texts))
+        self.texts.extend(texts)
+        return [self.vector(t) for t in texts]
+
+
+@pytest.fixture
+def rag_service(monkeypatch):
+    """Screening RAG service with a private store and fake embeddings"""
+    service = ScreeningRAGService()
+    service.vector_store = VectorStore()
+    fake = FakeEmbeddingCalls()
+    monkeypatch.setattr(service.embedding_service, "embed_text", fake.embed_text)
+    monkeypatch.setattr(service.embedding_service, "embed_batch", fake.embed_batch)
+    service.fake_embeddings = fake
+    return service
+
+
+class TestBuildUserContext:
+    """Test resume/JD context building"""
+
+    @pytest.mark.asyncio
+    async def test_rebuild_only_embeds_changed_chunks(
+        self, rag_service, sample_resume, sample_job_description
+    ):
+        """Rebuilding with an edited JD re-embeds only the new chunks"""
+        collection_id = await rag_service.build_user_context(
+            "user_1", sample_resume, sample_job_description
+        )
+        first_count = len(rag_service.fake_embeddings.texts)
+        documents = rag_service.vector_store.count_documents(collection_id)
+        assert first_count == documents > 0
+        assert len(rag_service.fake_embeddings.batches) == 1  # one round-trip
+
+        rag_service.fake_embeddings.texts.clear()
+        await rag_service.build_user_context(
+            "user_1", sample_resume, sample_job_description + "\nBENEFITS:\n- Fully remote role\n"
+        )
+        assert rag_service.fake_embeddings.texts == ["- Fully remote role"]
+        assert rag_service.vector_store.count_documents(collection_id) == documents + 1
+
+    @pytest.mark.asyncio
+    async def test_removed_sections_are_deleted(self, rag_service, sample_resume):
+        """Chunks no longer present in the resume are dropped"""
+        collection_id = await rag_service.build_user_context(
+            "user_1", sample_resume, "REQUIREMENTS:\nPython"
+        )
+        await rag_service.build_user_context("user_1", sample_resume, None)
+
+        docs = rag_service.vector_store.get_all_documents(collection_id)
+        assert docs and all(d.metadata["type"] == "resume" for d in docs)
+
+
+class TestQueryContext:
+    """Test context retrieval for prompts"""
+
+    @pytest.mark.asyncio
+    async def test_query_context_many_batches_embeddings(
+        self, rag_service, sample_resume, sample_job_description
+    ):
+        """Several queries share one embed_batch call and match query_context"""
+        await rag_service.build_user_context("user_1", sample_resume, sample_job_description)
+
+        calls = []
+        embed_batch = rag_service.embedding_service.embed_batch
+
+        async def counting_embed_batch(texts):
+            calls.append(list(texts))
+            return await embed_batch(texts)
+
+        rag_service.embedding_service.embed_batch = counting_embed_batch
+
+        queries = ["python machine learning", rag_service.JOB_CONTEXT_QUERY]
+        contexts = await rag_service.query_context_many(
+            "user_1", queries, [None, "job_description"], k=[3, 2]
+        )
+
+        assert calls == [queries]
+        assert contexts == [
+            await rag_service.query_context("user_1", queries[0], k=3),
+            await rag_service.query_context(
+                "user_1", queries[1], source_filter="job_description", k=2
+            ),
+        ]
+        assert "[JOB_DESCRIPTION" in contexts[1] and "[RESUME" not in contexts[1]
+
+    @pytest.mark.asyncio
+    async def test_query_context_many_without_context(self, rag_service):
+        """Users without a collection get empty contexts and no embedding call"""
+        rag_service.fake_embeddings.texts.clear()
+        assert await rag_service.query_context_many("nobody", ["a", "b"]) == ["", ""]
+        assert rag_service.fake_embeddings.texts == []
+
+
+class FakeLLM:
+    """Records which LLMService method served each question"""
+
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.calls = []
+
+    async def generate(self, prompt, **kwargs):
+        self.calls.append("generate")
+        return "".join(self.deltas)
+
+    async def generate_stream(self, prompt, **kwargs):
+        self.calls.append("generate_stream")
+        for delta in self.deltas:
+            yield delta
+
+
+class TestGenerateQuestion:
+    """Test that streamed and non-streamed questions agree"""
+
+    async def _both(self, rag_service, monkeypatch, deltas, min_length=10):
+        from app.services import llm_service as llm_module
+
+        llm = FakeLLM(deltas)
+        monkeypatch.setattr(llm_module, "get_llm_service", lambda: llm)
+        streamed = []
+
+        async def on_delta(text):
+            streamed.append(text)
+
+        plain = await rag_service._generate_question("p", 150, min_length)
+        question = await rag_service._generate_question(
+            "p", 150, min_length, on_delta=on_delta
+        )
+        assert plain == question
+        assert llm.calls == ["generate", "generate_stream"]
+        return question, streamed
+
+    @pytest.mark.asyncio
+    async def test_deltas_match_cleaned_question(self, rag_service, monkeypatch):
+        """Surrounding quotes are never streamed"""
+        question, streamed = await self._both(
+            rag_service, monkeypatch,
+            [' "What', " drew you", " to 'this' role", '?"', "\n"]
+        )
+        assert question == "What drew you to 'this' role?"
+        assert "".join(streamed) == question
+
+    @pytest.mark.asyncio
+    async def test_short_reply_streams_nothing(self, rag_service, monkeypatch):
+        """A reply the caller replaces with the base question is not streamed"""
+        question, streamed = await self._both(
+            rag_service, monkeypatch, ['"Why', ' us?"']
+        )
+        assert question is None
+        assert streamed == []
@@ -0,0 +1,180 @@
+"""
+Tests for per-request stage timing (app/services/request_timing.py)
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.services.request_timing import (
+    STAGE_APP, STAGE_JSON_PARSE, STAGE_LLM, STAGE_TOTAL, STAGE_VECTOR_SEARCH,
+    Histogram, RequestMetrics, RequestTiming, StageTimingMiddleware,
+    _current, span, timed
+)
+from app.utils.json_parser import extract_json_from_llm
+
+
+def _parse_header(value: str) -> dict:
+    stages = {}
+    for part in value.split(", "):
+        name, *params = part.split(";")
+        stages[name] = dict(p.split("=", 1) for p in params)
+    return stages
+
+
+class TestSpans:
+    """Test span/timed attribution within one request"""
+
+    def _timing(self):
+        timing = RequestTiming()
+        return timing, _current.set(timing)
+
+    def test_no_request_is_noop(self):
+        with span(STAGE_LLM):
+            pass
+        assert extract_json_from_llm('{"a": 1}') == {"a": 1}
+
+    @pytest.mark.asyncio
+    async def test_nested_same_stage_counts_once(self):
+        @timed(STAGE_LLM)
+        async def inner():
+            await asyncio.sleep(0.01)
+
+        @timed(STAGE_LLM)
+        async def outer():
+            await inner()
+            await inner()
+
+        timing, token = self._timing()
+        try:
+            await outer()
+            with span(STAGE_VECTOR_SEARCH):
+                extract_json_from_llm("```json\n{\"a\": 1}\n```")
+        finally:
+            _current.reset(token)
+        assert timing.stages[STAGE_LLM][1] == 1
+        assert timing.stages[STAGE_LLM][0] >= 20
+        assert timing.stages[STAGE_VECTOR_SEARCH][1] == 1
+        assert timing.stages[STAGE_JSON_PARSE][1] == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_excludes_consumer_time(self):
+        @timed(STAGE_LLM)
+        async def stream():
+            for word in ("a", "b"):
+                await asyncio.sleep(0.01)
+                yield word
+
+        timing, token = self._timing()
+        try:
+            async for _ in stream():
+                await asyncio.sleep(0.05)  # Consumer (e.g. the network)
+        finally:
+            _current.reset(token)
+        duration, calls = timing.stages[STAGE_LLM]
+        assert calls == 1
+        assert 20 <= duration < 90
+
+    def test_breakdown_and_header(self):
+        timing = RequestTiming()
+        timing.add(STAGE_LLM, 5.0)
+        timing.add(STAGE_LLM, 7.0)
+        breakdown = timing.breakdown()
+        assert breakdown[STAGE_LLM] == 12.0
+        assert breakdown[STAGE_TOTAL] >= 0
+        header = _parse_header(timing.header_value())
+        assert header[STAGE_LLM] == {"dur": "12.0", "desc": '"2 calls"'}
+        assert STAGE_APP in header and STAGE_TOTAL in header
+
+
+class TestHistogram:
+    """Test bucket placement and quantile estimates"""
+
+    def test_quantiles(self):
+        hist = Histogram(buckets=(10, 100, 1000))
+        for value in [5] * 90 + [50] * 9 + [5000]:
+            hist.observe(value)
+        assert hist.quantile(0.5) == 10
+        assert hist.quantile(0.95) == 100
+        assert hist.quantile(1.0) == 5000
+        data = hist.to_dict()
+        assert data["count"] == 100
+        assert data["buckets"] == {"le_10": 90, "le_100": 9, "le_1000": 0, "inf": 1}
+        assert Histogram().quantile(0.5) is None
+
+
+class TestStageTimingMiddleware:
+    """Test the header and per-route aggregation through a real ASGI app"""
+
+    def _app(self, metrics: RequestMetrics) -> FastAPI:
+        app = FastAPI()
+        app.add_middleware(StageTimingMiddleware, metrics=metrics)
+
+        @timed(STAGE_LLM)
+        async def fake_llm():
+            await asyncio.sleep(0.02)
+            return '{"score": 4}'
+
+        @app.get("/items/{item_id}")
+        async def item(item_id: str):
+            return extract_json_from_llm(await fake_llm())
+
+        @app.get("/stream")
+        async def stream():
+            async def events():
+                yield "data: one\n\n"
+                yield f"data: {await fake_llm()}\n\n"
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        @app.get("/boom")
+        async def boom():
+            raise RuntimeError("boom")
+
+        @app.get("/health")
+        async def health():
+            return {"ok": True}
+
+        return app
+
+    @pytest.mark.asyncio
+    async def test_header_and_metrics(self):
+        metrics = RequestMetrics()
+        transport = httpx.ASGITransport(app=self._app(metrics), raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+            for item_id in ("a", "b"):
+                response = await client.get(f"/items/{item_id}")
+                assert response.json() == {"score": 4}
+            assert "server-timing" not in (await client.get("/health")).headers
+            streamed = await client.get("/stream")
+            assert (await client.get("/boom")).status_code == 500
+            await client.get("/missing")
+
+        header = _parse_header(response.headers["server-timing"])
+        assert float(header[STAGE_LLM]["dur"]) >= 20
+        assert header[STAGE_JSON_PARSE]["desc"] == '"1 call"'
+        assert float(header[STAGE_TOTAL]["dur"]) >= float(header[STAGE_LLM]["dur"])
+        assert STAGE_LLM not in _parse_header(streamed.headers["server-timing"])
+
+        routes = metrics.get_stats()["routes"]
+        assert set(routes) == {
+            "GET /items/{item_id}", "GET /stream", "GET /boom", "GET <unmatched>"
+        }
+        items = routes["GET /items/{item_id}"]
+        assert items["requests"] == 2 and items["errors"] == 0
+        assert items["stages"][STAGE_LLM]["count"] == 2
+        assert routes["GET /stream"]["stages"][STAGE_LLM]["count"] == 1
+        assert routes["GET /boom"]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self):
+        from app.api.routes.health import router
+        app = FastAPI()
+        app.include_router(router)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://app"
+        ) as client:
+            data = (await client.get("/metrics")).json()
+        assert "routes" in data and "uptime_seconds" in data
@@ -0,0 +1,510 @@
+"""
+Tests for the journaled session persistence (app/services/session_persistence.py)
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.models import InterviewPhase, InterviewSession
+from app.services import session_codec, session_persistence
+from app.services.session_codec import (
+    SCHEMA_KEY, SessionDecodeError, decode_session, encode_session
+)
+from app.services.session_persistence import (
+    INDEX_FILE, JOURNAL_SUFFIX, PersistentSessionStore, SessionIndex
+)
+from app.services.session_write_behind import SessionWriteBehind
+
+
+@pytest.fixture(autouse=True)
+def writer(monkeypatch):
+    """A private, not-yet-started writer (the app's may be running in another test)"""
+    writer = SessionWriteBehind(interval_ms=10_000)
+    monkeypatch.setattr(session_persistence, "get_session_writer", lambda: writer)
+    return writer
+
+
+def _session(session_id="screening_u1_abc") -> InterviewSession:
+    return InterviewSession(
+        session_id=session_id,
+        user_id="u1",
+        interview_type="screening",
+        phase=InterviewPhase.GREETING,
+        resume_text="Python engineer " * 200
+    )
+
+
+def _turn(session: InterviewSession, n: int):
+    session.messages.append({"role": "user", "content": f"answer {n}"})
+    session.responses.append({"question_index": n, "response": f"answer {n}"})
+    session.questions_asked.append(f"question {n + 1}?")
+    session.messages.append({"role": "assistant", "content": f"question {n + 1}?"})
+    session.current_question_index = n + 1
+
+
+def _session_files(tmp_path):
+    return sorted(p.name for p in tmp_path.iterdir() if p.name != INDEX_FILE)
+
+
+def _journal_lines(tmp_path, session_id):
+    path = tmp_path / f"{session_id}{JOURNAL_SUFFIX}"
+    return path.read_text().splitlines() if path.exists() else []
+
+
+class TestSessionJournal:
+    """Test delta journaling, compaction and replay"""
+
+    def test_turn_writes_only_delta(self, tmp_path):
+        store = PersistentSessionStore(tmp_path, journal=True, compact_every=100)
+        session = _session()
+        store.save(session.session_id, session)
+        snapshot = (tmp_path / f"{session.session_id}.json").read_text()
+
+        session.phase = InterviewPhase.IN_PROGRESS
+        _turn(session, 0)
+        store.save(session.session_id, session)
+        store.save(session.session_id, session)  # No changes: nothing written
+
+        assert (tmp_path / f"{session.session_id}.json").read_text() == snapshot
+        records = [json.loads(line) for line in _journal_lines(tmp_path, session.session_id)]
+        assert [r["seq"] for r in records] == list(range(1, 7))
+        assert {(r["op"], r["field"]) for r in records} == {
+            ("append", "messages"), ("append", "responses"),
+            ("append", "questions_asked"), ("set", "phase"),
+            ("set", "current_question_index"),
+        }
+        assert "resume_text" not in "".join(_journal_lines(tmp_path, session.session_id))
+
+    def test_replay_matches_model(self, tmp_path):
+        store = PersistentSessionStore(tmp_path, journal=True, compact_every=100)
+        session = _session()
+        store.save(session.session_id, session)
+        for n in range(3):
+            _turn(session, n)
+            session.follow_up_count[n] = 1
+            store.save(session.session_id, session)
+
+        loaded = PersistentSessionStore(tmp_path).get(session.session_id)
+        assert loaded == session
+
+    def test_compaction(self, tmp_path):
+        store = PersistentSessionStore(tmp_path, journal=True, compact_every=10)
+        session = _session()
+        store.save(session.session_id, session)
+        for n in range(3):
+            _turn(session, n)
+            store.save(session.session_id, session)
+        # 5 records per turn: the second turn is compacted instead of appended
+        assert len(_journal_lines(tmp_path, session.session_id)) == 5
+
+        session.phase = InterviewPhase.COMPLETED
+        store.save(session.session_id, session)
+        assert _journal_lines(tmp_path, session.session_id) == []
+        snapshot = json.loads((tmp_path / f"{session.session_id}.json").read_text())
+        assert snapshot["phase"] == "completed"
+        assert snapshot["_journal_seq"] == 10
+        assert len(snapshot["messages"]) == 6
+
+    def test_crash_between_snapshot_and_truncate(self, tmp_path):
+        store = PersistentSessionStore(tmp_path, journal=True, compact_every=100)
+        session = _session()
+        store.save(session.session_id, session)
+        _turn(session, 0)
+        store.save(session.session_id, session)
+        journal = (tmp_path / f"{session.session_id}{JOURNAL_SUFFIX}").read_text()
+
+        # Snapshot written but the old journal survived; torn record appended
+        replace, _unlink = store._plan_snapshot(session.session_id, session)
+        store.write_ops([replace])
+        (tmp_path / f"{session.session_id}{JOURNAL_SUFFIX}").write_text(
+            journal + '{"seq": 99, "op": "app'
+        )
+        loaded = PersistentSessionStore(tmp_path).get(session.session_id)
+        assert len(loaded.messages) == 2
+        assert loaded.questions_asked == ["question 1?"]
+
+    def test_shrunk_list_resnapshots(self, tmp_path):
+        store = PersistentSessionStore(tmp_path, journal=True, compact_every=100)
+        session = _session()
+        _turn(session, 0)
+        store.save(session.session_id, session)
+        session.messages.pop()
+        store.save(session.session_id, session)
+        assert _journal_lines(tmp_path, session.session_id) == []
+        loaded = PersistentSessionStore(tmp_path).get(session.session_id)
+        assert len(loaded.messages) == 1
+
+    def test_delete_removes_journal(self, tmp_path):
+        store = PersistentSessionStore(tmp_path, journal=True)
+        session = _session()
+        store.save(session.session_id, session)
+        _turn(session, 0)
+        store.save(session.session_id, session)
+        store.delete(session.session_id)
+        assert _session_files(tmp_path) == []
+
+    def test_journal_disabled(self, tmp_path):
+        store = PersistentSessionStore(tmp_path, journal=False)
+        session = _session()
+        store.save(session.session_id, session)
+        _turn(session, 0)
+        store.save(session.session_id, session)
+        assert _journal_lines(tmp_path, session.session_id) == []
+        snapshot = json.loads((tmp_path / f"{session.session_id}.json").read_text())
+        assert len(snapshot["messages"]) == 2
+
+
+class TestWriteBehind:
+    """Test deferred, coalesced and ordered session writes"""
+
+    @pytest.mark.asyncio
+    async def test_saves_coalesce_until_flush(self, tmp_path, writer):
+        store = PersistentSessionStore(tmp_path, journal=True, compact_every=100)
+        writer.start()
+        try:
+            session = _session()
+            store.save(session.session_id, session)
+            for n in range(3):
+                _turn(session, n)
+                store.save(session.session_id, session)
+            assert _session_files(tmp_path) == []
+            assert store.get(session.session_id) is session
+
+            assert await writer.flush() == 1
+            stats = writer.get_stats()
+            assert stats["saves"] == 4 and stats["writes"] == 1
+            assert stats["coalesced"] == 3 and stats["pending"] == 0
+            assert stats["flush_lag_ms"]["max"] is not None
+        finally:
+            await writer.stop()
+        loaded = PersistentSessionStore(tmp_path).get(session.session_id)
+        assert len(loaded.messages) == 6
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_and_delete_is_ordered(self, tmp_path, writer):
+        store = PersistentSessionStore(tmp_path, journal=True)
+        writer.start()
+        kept, deleted = _session("kept"), _session("deleted")
+        store.save(kept.session_id, kept)
+        store.save(deleted.session_id, deleted)
+        await store.flush(deleted.session_id)
+        assert (tmp_path / "deleted.json").exists()
+        assert not (tmp_path / "kept.json").exists()
+
+        _turn(deleted, 0)
+        store.save(deleted.session_id, deleted)
+        store.delete(deleted.session_id)
+        await writer.stop()
+        assert _session_files(tmp_path) == ["kept.json"]
+
+    @pytest.mark.asyncio
+    async def test_failed_write_is_retried_as_snapshot(self, tmp_path, writer):
+        store = PersistentSessionStore(tmp_path, journal=True)
+        writer.start()
+        try:
+            session = _session()
+            store.save(session.session_id, session)
+            await writer.flush()
+            _turn(session, 0)
+            store.save(session.session_id, session)
+            (tmp_path / f"{session.session_id}{JOURNAL_SUFFIX}").mkdir()  # Append fails
+            await writer.flush()
+            assert writer.get_stats()["failures"] == 1
+            assert writer.get_stats()["pending"] == 1
+            (tmp_path / f"{session.session_id}{JOURNAL_SUFFIX}").rmdir()
+            await writer.flush()
+        finally:
+            await writer.stop()
+        snapshot = json.loads((tmp_path / f"{session.session_id}.json").read_text())
+        assert len(snapshot["messages"]) == 2
+
+
+
+class TestLazyLoading:
+    """Test the session index, lazy body loading and the LRU cap"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_indexes(self, monkeypatch):
+        monkeypatch.setattr(session_persistence, "_indexes", {})
+
+    def _restart(self, monkeypatch, tmp_path, **kwargs):
+        monkeypatch.setattr(session_persistence, "_indexes", {})
+        return PersistentSessionStore(tmp_path, **kwargs)
+
+    def test_startup_reads_index_only(self, tmp_path, monkeypatch):
+        store = PersistentSessionStore(tmp_path, journal=True)
+        for i in range(3):
+            store.save(f"s{i}", _user_session(f"s{i}", f"u{i % 2}"))
+        _turn(store.get("s0"), 0)
+        store.get("s0").phase = InterviewPhase.IN_PROGRESS
+        store.save("s0", store.get("s0"))
+
+        store = self._restart(monkeypatch, tmp_path)
+        assert len(store._cache) == 0
+        assert len(store) == 3 and "s2" in store and "nope" not in store
+        assert store.index.get("s0")["phase"] == "in_progress"
+        assert [sid for sid, _ in store.query(user_id="u0", phase="in_progress")] == ["s0"]
+        assert store.loads == 1 and len(store._cache) == 0  # Query does not cache
+
+        loaded = store.get("s0")
+        assert len(loaded.messages) == 2
+        assert store.get("s0") is loaded and store.loads == 2
+
+    def test_lru_eviction(self, tmp_path):
+        store = PersistentSessionStore(tmp_path, journal=True, max_cached=2)
+        sessions = [_user_session(f"s{i}", "u1") for i in range(3)]
+        store.save("s0", sessions[0])
+        store.save("s1", sessions[1])
+        store.get("s0")  # s1 is now least recently used
+        store.save("s2", sessions[2])
+        assert list(store._cache) == ["s0", "s2"] and store.evictions == 1
+
+        reloaded = store.get("s1")
+        assert reloaded == sessions[1]
+        assert list(store._cache) == ["s2", "s1"]
+
+    def test_evicted_journaled_session_resnapshots(self, tmp_path, monkeypatch):
+        store = PersistentSessionStore(tmp_path, journal=True, max_cached=1)
+        session = _session()
+        store.save(session.session_id, session)
+        _turn(session, 0)
+        store.save(session.session_id, session)
+        store.save("other", _user_session("other", "u2"))  # Evicts the session
+        _turn(session, 1)
+        store.save(session.session_id, session)  # Still held by the caller
+
+        snapshot = json.loads((tmp_path / f"{session.session_id}.json").read_text())
+        assert snapshot["_journal_seq"] == 5
+        loaded = self._restart(monkeypatch, tmp_path).get(session.session_id)
+        assert loaded == session
+
+    @pytest.mark.asyncio
+    async def test_pending_sessions_are_not_evicted(self, tmp_path, writer):
+        store = PersistentSessionStore(tmp_path, max_cached=1)
+        writer.start()
+        try:
+            store.save("s0", _user_session("s0", "u1"))
+            store.save("s1", _user_session("s1", "u1"))
+            assert list(store._cache) == ["s0", "s1"]
+            await writer.flush()
+            store.save("s2", _user_session("s2", "u1"))
+            assert list(store._cache) == ["s2"]
+        finally:
+            await writer.stop()
+        assert _session_files(tmp_path) == ["s0.json", "s1.json", "s2.json"]
+
+    def test_index_reconciles_with_files(self, tmp_path, monkeypatch):
+        store = PersistentSessionStore(tmp_path)
+        for i in range(3):
+            store.save(f"s{i}", _user_session(f"s{i}", "u1"))
+        store.delete("s1")
+        (tmp_path / "s2.json").unlink()  # Removed behind the index's back
+        legacy = _user_session("legacy", "u9").model_dump(mode="json")
+        (tmp_path / "legacy.json").write_text(json.dumps(legacy))  # Never indexed
+        with open(tmp_path / INDEX_FILE, "a") as fp:
+            fp.write('{"id": "s0", "pha')  # Torn append
+
+        index = SessionIndex(tmp_path)
+        assert sorted(sid for sid, _ in index.items()) == ["legacy", "s0"]
+        assert index.get("legacy")["user_id"] == "u9"
+        assert len((tmp_path / INDEX_FILE).read_text().splitlines()) == 2
+
+    def test_index_compacts(self, tmp_path):
+        store = PersistentSessionStore(tmp_path)
+        session = _user_session("s0", "u1")
+        for n in range(120):
+            session.current_question_index = n
+            session.phase = InterviewPhase.IN_PROGRESS if n % 2 else InterviewPhase.GREETING
+            store.save("s0", session)
+        assert store.index.lines <= 102
+        assert SessionIndex(tmp_path).get("s0")["phase"] == "in_progress"
+
+
+class TestSessionCodec:
+    """Test typed, schema-versioned session JSON"""
+
+    def test_round_trip(self):
+        session = _session()
+        _turn(session, 0)
+        session.follow_up_count[0] = 2
+        session.phase = InterviewPhase.COMPLETED
+        text = encode_session(session, _journal_seq=7)
+        assert text.startswith('{"_schema":1,')
+        assert json.loads(text)["_journal_seq"] == 7
+
+        loaded = decode_session(text)
+        assert isinstance(loaded, InterviewSession)
+        assert loaded == session
+        assert loaded.phase == InterviewPhase.COMPLETED
+        assert loaded.follow_up_count == {0: 2}
+
+    def test_unversioned_file_is_typed(self):
+        legacy = _session().model_dump(mode="json")  # Written before versioning
+        loaded = decode_session(json.dumps({**legacy, "_last_saved": "x"}))
+        assert isinstance(loaded, InterviewSession)
+        assert loaded.session_id == legacy["session_id"]
+
+    def test_migration(self, monkeypatch):
+        legacy = _session().model_dump(mode="json")
+        legacy["candidate"] = legacy.pop("user_id")
+        monkeypatch.setitem(session_codec._MIGRATIONS, 0, lambda data: {
+            **{k: v for k, v in data.items() if k != "candidate"},
+            "user_id": data["candidate"],
+        })
+        assert decode_session(json.dumps(legacy)).user_id == "u1"
+        with pytest.raises(SessionDecodeError):  # Current version: not migrated
+            decode_session(json.dumps({**legacy, SCHEMA_KEY: 1}))
+
+    def test_unreadable_files_are_skipped(self, tmp_path, monkeypatch):
+        store = PersistentSessionStore(tmp_path)
+        store.save("good", _user_session("good", "u1"))
+        old_schema = _user_session("old", "u1").model_dump(mode="json")
+        del old_schema["interview_type"]  # Required now, missing in the old file
+        (tmp_path / "old.json").write_text(json.dumps(old_schema))
+        (tmp_path / "corrupt.json").write_text('{"session_id": "corrupt", ')
+
+        monkeypatch.setattr(session_persistence, "_indexes", {})  # Restart
+        store = PersistentSessionStore(tmp_path)
+        assert "corrupt" not in store and "old" not in store  # Not indexed
+        store.index.entries["old"] = {"user_id": "u1"}  # Indexed by an older build
+        assert store.get("old") is None
+        assert [sid for sid, _ in store.query(user_id="u1")] == ["good"]
+        assert all(isinstance(s, InterviewSession) for _, s in store.items())
+
+    def test_restarted_sessions_convert_for_dashboard(self, tmp_path, monkeypatch):
+        from app.services.session_adapter import convert_base_session_to_store
+        from app.services.session_store import InterviewStatus
+
+        store = PersistentSessionStore(tmp_path, journal=True)
+        session = _session()
+        _turn(session, 0)
+        session.phase = InterviewPhase.COMPLETED
+        store.save(session.session_id, session)
+
+        monkeypatch.setattr(session_persistence, "_indexes", {})  # Restart
+        [(_, loaded)] = PersistentSessionStore(tmp_path).query(user_id="u1")
+        assert isinstance(loaded, InterviewSession)
+        converted = convert_base_session_to_store(loaded)
+        assert converted.status == InterviewStatus.COMPLETED
+        assert len(converted.responses) == 1
+
+def _user_session(session_id, user_id, phase=InterviewPhase.GREETING) -> InterviewSession:
+    return InterviewSession(
+        session_id=session_id, user_id=user_id, interview_type="screening", phase=phase
+    )
+
+
+class TestSQLiteBackend:
+    """Test the shared, indexed SQLite session backend"""
+
+    def test_stores_share_database(self, tmp_path):
+        db = str(tmp_path / "sessions.db")
+        first = PersistentSessionStore(backend="sqlite", sqlite_path=db)
+        second = PersistentSessionStore(backend="sqlite", sqlite_path=db)
+        session = _session()
+        first.save(session.session_id, session)
+
+        assert session.session_id in second  # e.g. another worker
+        loaded = second.get(session.session_id)
+        assert loaded.user_id == "u1"
+        assert loaded.phase == "greeting"
+        assert all(p.name.startswith("sessions.db") for p in tmp_path.iterdir())
+
+    def test_query_uses_indexes(self, tmp_path):
+        db = str(tmp_path / "sessions.db")
+        store = PersistentSessionStore(backend="sqlite", sqlite_path=db)
+        store.save("a", _user_session("a", "u1", InterviewPhase.COMPLETED))
+        store.save("b", _user_session("b", "u1"))
+        store.save("c", _user_session("c", "u2", InterviewPhase.COMPLETED))
+
+        fresh = PersistentSessionStore(backend="sqlite", sqlite_path=db)
+        assert sorted(sid for sid, _ in fresh.query(user_id="u1")) == ["a", "b"]
+        assert [sid for sid, _ in fresh.query(user_id="u1", phase="completed")] == ["a"]
+        assert [sid for sid, _ in fresh.query(phase="completed", limit=1)] == ["c"]
+
+        plan = " ".join(row[-1] for row in fresh.db._connect().execute(
+            "EXPLAIN QUERY PLAN SELECT body FROM sessions WHERE user_id = ? "
+            "ORDER BY created_at DESC", ("u1",)
+        ))
+        assert "ix_sessions_user" in plan
+
+    @pytest.mark.asyncio
+    async def test_query_includes_pending_writes(self, tmp_path, writer):
+        store = PersistentSessionStore(
+            backend="sqlite", sqlite_path=str(tmp_path / "sessions.db")
+        )
+        writer.start()
+        try:
+            store.save("a", _user_session("a", "u1"))
+            assert store.db.count() == 0
+            assert [sid for sid, _ in store.query(user_id="u1")] == ["a"]
+            await writer.flush()
+            assert store.db.count() == 1
+            assert [sid for sid, _ in store.query(user_id="u1")] == ["a"]
+        finally:
+            await writer.stop()
+
+    def test_unreadable_rows_are_skipped(self, tmp_path):
+        db = str(tmp_path / "sessions.db")
+        store = PersistentSessionStore(backend="sqlite", sqlite_path=db)
+        store.save("good", _user_session("good", "u1"))
+        store.db.upsert([("bad", "u1", "screening", "greeting", "9999", None, '{"x": 1}')])
+
+        fresh = PersistentSessionStore(backend="sqlite", sqlite_path=db)
+        assert fresh.get("bad") is None
+        assert [sid for sid, _ in fresh.query(user_id="u1")] == ["good"]
+
+    def test_delete_and_cleanup(self, tmp_path):
+        db = str(tmp_path / "sessions.db")
+        store = PersistentSessionStore(backend="sqlite", sqlite_path=db)
+        store.save("a", _user_session("a", "u1"))
+        store.save("b", _user_session("b", "u1"))
+        store.delete("a")
+        assert not store.db.exists("a")
+
+        store.db._connect().execute("UPDATE sessions SET updated_at = 0")
+        store.cleanup_old(max_age_hours=1)
+        assert store.db.count() == 0
+        assert store.get("b") is None
+
+
+class TestDashboardQueries:
+    """Test that dashboard queries read each session body once"""
+
+    @pytest.mark.asyncio
+    async def test_history_loads_each_session_once(self, tmp_path, monkeypatch):
+        from types import SimpleNamespace
+        from app.api.routes import dashboard
+
+        monkeypatch.setattr(session_persistence, "SESSION_DIR", tmp_path)
+        monkeypatch.setattr(session_persistence, "_indexes", {})
+        getters = [
+            dashboard.get_screening_interview_service,
+            dashboard.get_behavioral_interview_service,
+            dashboard.get_technical_interview_service,
+        ]
+        for getter in getters:
+            getter.cache_clear()
+        try:
+            for getter in getters:
+                service = getter(session_store=None)
+                session = await service.create_session(user_id="u1")
+                service.sessions.save(session.session_id, session)
+
+            # Restart: fresh services and index, nothing cached
+            monkeypatch.setattr(session_persistence, "_indexes", {})
+            for getter in getters:
+                getter.cache_clear()
+            request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+            result = await dashboard.get_interview_history(request, "u1")
+
+            assert sorted(i["interview_type"] for i in result["interviews"]) == [
+                "behavioral", "screening", "technical"
+            ]
+            services = [getter(session_store=None) for getter in getters]
+            assert [service.sessions.loads for service in services] == [1, 1, 1]
+        finally:
+            for getter in getters:
+                getter.cache_clear()
@@ -0,0 +1,257 @@
+"""
+Tests for the offline stub providers and the fake GPU server
+"""
+
+import io
+import json
+import math
+import string
+import wave
+
+import httpx
+import pytest
+
+from app.core import embedding_service as embedding_module
+from app.core.embedding_cache import EmbeddingCache
+from app.core.embedding_service import EmbeddingService
+from app.prompts.behavioral_prompts import BEHAVIORAL_STAR_EVALUATION
+from app.prompts.screening_prompts import SCREENING_EVALUATION_PROMPT
+from app.prompts.technical_prompts import TECHNICAL_EVALUATION_PROMPT
+from app.services import llm_service as llm_module
+from app.services.llm_cache import LLMResponseCache
+from app.services.llm_service import LLMService, get_chat_client
+from app.stubs import (
+    STUB_EMBEDDING_MODEL, StubBehavior, StubEmbeddings, StubLLM, StubProviderError
+)
+from app.stubs.gpu_server import create_app
+
+
+def _format(template: str) -> str:
+    keys = {field for _, field, _, _ in string.Formatter().parse(template) if field}
+    return template.format(**{key: "sample" for key in keys})
+
+
+class TestStubBehavior:
+    """Test latency sampling and error injection"""
+
+    def test_constant_latency(self):
+        behavior = StubBehavior(median_ms=120)
+        assert [behavior.sample_latency_ms() for _ in range(3)] == [120, 120, 120]
+
+    def test_lognormal_is_seeded(self):
+        a = StubBehavior(median_ms=100, sigma=0.5, seed=7)
+        b = StubBehavior(median_ms=100, sigma=0.5, seed=7)
+        samples = [a.sample_latency_ms() for _ in range(200)]
+        assert samples == [b.sample_latency_ms() for _ in range(200)]
+        assert len(set(samples)) > 1
+        median = sorted(samples)[100]
+        assert 70 < median < 140
+
+    @pytest.mark.asyncio
+    async def test_error_rate(self):
+        behavior = StubBehavior(error_rate=1.0)
+        with pytest.raises(StubProviderError):
+            await behavior.simulate("LLM")
+        await StubBehavior(error_rate=0.0).simulate("LLM")
+
+
+class TestStubLLM:
+    """Test deterministic, schema-shaped responses"""
+
+    @pytest.mark.parametrize("template,keys", [
+        (SCREENING_EVALUATION_PROMPT, {"communication_clarity", "first_impression"}),
+        (BEHAVIORAL_STAR_EVALUATION, {"star_scores", "strengths"}),
+        (TECHNICAL_EVALUATION_PROMPT, {"technical_accuracy", "hire_signal"}),
+    ])
+    def test_evaluation_json(self, template, keys):
+        """Evaluation prompts get valid JSON with in-range scores"""
+        data = json.loads(StubLLM().respond(_format(template)))
+        assert keys <= set(data)
+        scores = data.get("star_scores", data)
+        for value in scores.values():
+            if isinstance(value, int) and not isinstance(value, bool):
+                assert 1 <= value <= 5
+
+    def test_choice_placeholders(self):
+        prompt = 'Respond with ONLY JSON: {"quality": "good|fair|needs_improvement", "ok": true/false}'
+        data = json.loads(StubLLM().respond(prompt))
+        assert data["quality"] in ("good", "fair", "needs_improvement")
+        assert isinstance(data["ok"], bool)
+
+    def test_conversation_turn_carries_question(self):
+        from app.core.conversation_engine import ConversationEngine
+        prompt = (
+            'NEXT PLANNED QUESTION (adapt this naturally):\n'
+            '"Why are you interested in this role?"\n\n'
+            + ConversationEngine.RESPONSE_FORMAT
+        )
+        data = json.loads(StubLLM().respond(prompt))
+        assert data["next_content"].endswith("why are you interested in this role?")
+        assert data["acknowledgment"] == ""
+        assert data["tone"] in ("friendly", "curious", "impressed", "neutral", "encouraging")
+
+    def test_question_prompt(self):
+        prompt = "BASE QUESTION TO PERSONALIZE:\nTell me about yourself.\n\nReturn ONLY the question"
+        assert StubLLM().respond(prompt).endswith("tell me about yourself.")
+
+    def test_deterministic_per_seed(self):
+        prompt = _format(SCREENING_EVALUATION_PROMPT)
+        assert StubLLM(seed=1).respond(prompt) == StubLLM(seed=1).respond(prompt)
+        outputs = {StubLLM(seed=seed).respond(prompt) for seed in range(10)}
+        assert len(outputs) > 1
+
+    @pytest.mark.asyncio
+    async def test_stream_and_chat_surface(self):
+        stub = StubLLM()
+        prompt = "BASE QUESTION TEMPLATE:\nDescribe a conflict you resolved.\n"
+        deltas = [d async for d in stub.stream(prompt)]
+        assert len(deltas) > 1
+        assert "".join(deltas) == stub.respond(prompt)
+
+        response = await stub.chat.completions.create(
+            model="any",
+            messages=[{"role": "user", "content": prompt}]
+        )
+        assert response.choices[0].message.content == stub.respond(prompt)
+
+
+class TestStubWiring:
+    """Test LLM_PROVIDER=stub and EMBEDDING_PROVIDER=stub"""
+
+    def _stub_service(self, monkeypatch, stub) -> LLMService:
+        monkeypatch.setattr(llm_module.settings, "llm_provider", "stub")
+        monkeypatch.setattr(llm_module, "get_stub_llm", lambda: stub)
+        service = LLMService()
+        service.cache = LLMResponseCache()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_llm_service_routes_to_stub(self, monkeypatch):
+        stub = StubLLM()
+        service = self._stub_service(monkeypatch, stub)
+        prompt = _format(SCREENING_EVALUATION_PROMPT)
+
+        assert json.loads(await service.generate(prompt, force_provider="openai"))
+        deltas = [d async for d in service.generate_stream(prompt)]
+        assert "".join(deltas) == stub.respond(prompt)
+        assert stub.calls == 2
+        stats = service.get_usage_stats()
+        assert stats["primary_provider"] == "stub"
+        assert stats["provider_usage"]["stub"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stub_responses_are_not_cached(self, monkeypatch):
+        stub = StubLLM()
+        service = self._stub_service(monkeypatch, stub)
+        prompt = _format(SCREENING_EVALUATION_PROMPT)
+
+        for _ in range(2):
+            await service.generate(prompt, temperature=0.0)
+        assert stub.calls == 2
+        assert service.cache.get_stats()["stores"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stub_errors_trip_breaker(self, monkeypatch):
+        service = self._stub_service(
+            monkeypatch, StubLLM(StubBehavior(error_rate=1.0))
+        )
+        for _ in range(service.health.config.min_calls):
+            with pytest.raises(Exception):
+                await service.generate("hello")
+        assert service.health.get_stats()["breakers"]["stub/stub"]["state"] == "open"
+
+    def test_chat_client(self, monkeypatch):
+        stub = StubLLM()
+        monkeypatch.setattr(llm_module.settings, "llm_provider", "stub")
+        monkeypatch.setattr(llm_module, "get_stub_llm", lambda: stub)
+        assert get_chat_client() is stub
+
+    @pytest.mark.asyncio
+    async def test_embedding_service(self, monkeypatch):
+        stub = StubEmbeddings(dimension=64)
+        monkeypatch.setattr(embedding_module.settings, "embedding_provider", "stub")
+        monkeypatch.setattr(embedding_module, "get_stub_embeddings", lambda: stub)
+        service = EmbeddingService(cache=EmbeddingCache(max_entries=16))
+        assert service.model == STUB_EMBEDDING_MODEL
+
+        one = await service.embed_text("Python backend engineer")
+        batch = await service.embed_batch(["Python backend engineer", "Gardening tips"])
+        assert batch[0] == pytest.approx(one, rel=1e-6)
+        assert stub.calls == 2  # The batch call only embedded the new text
+        assert math.isclose(sum(v * v for v in one), 1.0, rel_tol=1e-5)
+
+
+class TestStubEmbeddings:
+    """Test the feature-hashed embedding vectors"""
+
+    def test_similarity_follows_vocabulary(self):
+        stub = StubEmbeddings(dimension=256)
+
+        def cosine(a, b):
+            return sum(x * y for x, y in zip(stub.embed(a), stub.embed(b)))
+
+        assert stub.embed("distributed systems") == stub.embed("distributed systems")
+        assert cosine("designing distributed systems", "distributed systems design") > \
+            cosine("designing distributed systems", "team conflict resolution")
+        assert stub.embed("") == [0.0] * 256
+
+
+class TestFakeGPUServer:
+    """Test the fake GPU server against GPUClient's request shapes"""
+
+    def _client(self, behavior=None) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=create_app(behavior)),
+            base_url="http://gpu"
+        )
+
+    @pytest.mark.asyncio
+    async def test_health(self):
+        async with self._client() as client:
+            data = (await client.get("/health")).json()
+        assert data["services"] == {"stt": True, "tts": True, "rag": True}
+
+    @pytest.mark.asyncio
+    async def test_transcribe_passes_validation(self):
+        from app.utils.input_validator import validate_response
+        async with self._client() as client:
+            response = await client.post(
+                "/api/stt/transcribe",
+                files={"audio": ("audio.webm", b"\x01\x02\x03", "audio/webm")},
+                data={"language": "en"}
+            )
+        text = response.json()["text"]
+        assert validate_response(text) == (True, None)
+
+    @pytest.mark.asyncio
+    async def test_synthesize_wav(self):
+        async with self._client() as client:
+            response = await client.post(
+                "/api/tts/synthesize",
+                json={"text": "one two three four five", "voice": "default",
+                      "emotion": None, "model": "xtts-v2"}
+            )
+        assert response.headers["content-type"] == "audio/wav"
+        with wave.open(io.BytesIO(response.content)) as audio:
+            assert audio.getnframes() / audio.getframerate() == pytest.approx(2.0)
+
+    @pytest.mark.asyncio
+    async def test_rag_build(self):
+        async with self._client() as client:
+            response = await client.post(
+                "/api/rag/build",
+                files=[("files", ("resume.txt", b"Python engineer", "text/plain"))],
+                data={"user_id": "user-1"}
+            )
+        data = response.json()
+        assert data["rag_id"].startswith("stub-")
+        assert data["profile"]["files"] == ["resume.txt"]
+        assert len(data["questions"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_injected_errors(self):
+        async with self._client(StubBehavior(error_rate=1.0)) as client:
+            response = await client.post(
+                "/api/tts/synthesize", json={"text": "hello"}
+            )
+        assert response.status_code == 503
@@ -0,0 +1,582 @@
+"""
+Tests for the in-memory VectorStore
+"""
+
+import dataclasses
+import gc
+
+import numpy as np
+import pytest
+
+from app.core.ivf_index import recall_at_k
+from app.core.vector_snapshot import restore_snapshot, write_snapshot
+from app.core.vector_store import VectorStore
+
+
+def _random_documents(n: int, dim: int = 32, seed: int = 0):
+    """Build add_documents payloads with random embeddings"""
+    rng = np.random.default_rng(seed)
+    embeddings = rng.normal(size=(n, dim))
+    return [
+        {
+            "content": f"chunk {i}",
+            "embedding": embeddings[i].tolist(),
+            "metadata": {"type": "resume" if i % 2 == 0 else "job_description"}
+        }
+        for i in range(n)
+    ]
+
+
+def _brute_force(documents, query, k, doc_type=None):
+    """Reference ranking using the original per-document loop"""
+    scored = []
+    for i, doc in enumerate(documents):
+        if doc_type and doc["metadata"]["type"] != doc_type:
+            continue
+        a = np.array(query)
+        b = np.array(doc["embedding"])
+        scored.append((float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b))), i))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return scored[:k]
+
+
+class TestVectorSearch:
+    """Test matrix-backed similarity search"""
+
+    def test_search_matches_brute_force(self):
+        """Top-k ranking and scores match the reference loop"""
+        store = VectorStore()
+        documents = _random_documents(200)
+        store.add_documents("user_1", documents)
+
+        query = np.random.default_rng(1).normal(size=32).tolist()
+        results = store.search("user_1", query, k=7)
+        expected = _brute_force(documents, query, k=7)
+
+        assert [r.document.content for r in results] == [
+            f"chunk {i}" for _, i in expected
+        ]
+        for result, (score, _) in zip(results, expected):
+            assert result.score == pytest.approx(score, abs=1e-5)
+            assert result.distance == pytest.approx(1 - score, abs=1e-5)
+
+    def test_equal_scores_keep_insertion_order(self):
+        """Ties at the k-th score resolve to the earliest documents"""
+        store = VectorStore()
+        rng = np.random.default_rng(4)
+        documents = [
+            {"content": f"chunk {i}", "embedding": [1.0, 0.0] if i % 3 else [0.0, 1.0]}
+            for i in range(300)
+        ]
+        rng.shuffle(documents)
+        store.add_documents("user_1", documents)
+
+        results = store.search("user_1", [1.0, 0.0], k=10)
+        expected = [d["content"] for d in documents if d["embedding"] == [1.0, 0.0]][:10]
+        assert [r.document.content for r in results] == expected
+
+    def test_search_with_metadata_filter(self):
+        """Filtered search only returns matching documents"""
+        store = VectorStore()
+        documents = _random_documents(50)
+        store.add_documents("user_1", documents)
+
+        query = np.random.default_rng(2).normal(size=32).tolist()
+        results = store.search(
+            "user_1", query, k=5, metadata_filter={"type": "resume"}
+        )
+        expected = _brute_force(documents, query, k=5, doc_type="resume")
+
+        assert [r.document.content for r in results] == [
+            f"chunk {i}" for _, i in expected
+        ]
+
+    def test_matrix_grows_across_single_adds(self):
+        """Single-document adds grow the matrix without losing rows"""
+        store = VectorStore()
+        documents = _random_documents(40, dim=8)
+        for doc in documents:
+            store.add_document(
+                "user_1", doc["content"], doc["embedding"], doc["metadata"]
+            )
+
+        assert store.count_documents("user_1") == 40
+        query = documents[33]["embedding"]
+        assert store.search("user_1", query, k=1)[0].document.content == "chunk 33"
+
+    def test_zero_vectors_score_zero(self):
+        """Zero embeddings (failed provider fallback) never divide by zero"""
+        store = VectorStore()
+        store.add_document("user_1", "empty", [0.0] * 4)
+        store.add_document("user_1", "real", [1.0, 0.0, 0.0, 0.0])
+
+        results = store.search("user_1", [1.0, 0.0, 0.0, 0.0], k=2)
+        assert [r.document.content for r in results] == ["real", "empty"]
+        assert results[1].score == 0.0
+
+        assert all(
+            r.score == 0.0 for r in store.search("user_1", [0.0] * 4, k=2)
+        )
+
+    def test_search_missing_collection(self):
+        """Unknown collections return no results"""
+        store = VectorStore()
+        assert store.search("missing", [1.0, 0.0], k=3) == []
+
+    def test_dimension_mismatch_rejected(self):
+        """Embeddings with a different dimension are rejected"""
+        store = VectorStore()
+        store.add_document("user_1", "a", [1.0, 0.0, 0.0])
+        with pytest.raises(ValueError):
+            store.add_document("user_1", "b", [1.0, 0.0])
+        assert store.count_documents("user_1") == 1
+
+
+class TestSearchMany:
+    """Test batched multi-query search"""
+
+    @pytest.mark.parametrize("precision,rerank", [
+        ("float32", False), ("float16", False), ("int8", True)
+    ])
+    def test_matches_individual_searches(self, precision, rerank):
+        """Each query's results equal a separate search() call"""
+        store = VectorStore(precision=precision, rerank=rerank)
+        ids = store.add_documents("user_1", _random_documents(120, dim=16))
+        store.delete_document("user_1", ids[3])
+
+        queries = np.random.default_rng(7).normal(size=(3, 16))
+        filters = [None, {"type": "resume"}, {"type": "job_description"}]
+        batched = store.search_many("user_1", queries, k=6, metadata_filters=filters)
+
+        assert len(batched) == 3
+        for query, metadata_filter, results in zip(queries, filters, batched):
+            single = store.search("user_1", query.tolist(), k=6, metadata_filter=metadata_filter)
+            assert [r.document.id for r in results] == [r.document.id for r in single]
+            for a, b in zip(results, single):
+                assert a.score == pytest.approx(b.score, abs=1e-5)
+
+    def test_empty_inputs(self):
+        """Missing collections and unmatched filters return empty lists"""
+        store = VectorStore()
+        assert store.search_many("missing", [[1.0, 0.0]] * 2, k=3) == [[], []]
+        assert store.search_many("missing", [], k=3) == []
+
+        store.add_document("user_1", "a", [1.0, 0.0], {"type": "resume"})
+        results = store.search_many(
+            "user_1", [[1.0, 0.0], [0.0, 1.0]], k=3,
+            metadata_filters=[{"type": "cover_letter"}, None]
+        )
+        assert results[0] == [] and [r.document.content for r in results[1]] == ["a"]
+
+
+def _clustered_documents(n: int, dim: int = 32, clusters: int = 40, seed: int = 0):
+    """add_documents payloads drawn around random cluster centers"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    points = centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    return [
+        {
+            "content": f"chunk {i}",
+            "embedding": points[i].tolist(),
+            "metadata": {"type": "resume" if i % 2 == 0 else "job_description"}
+        }
+        for i in range(n)
+    ]
+
+
+class TestAnnIndex:
+    """Test the IVF index used for large collections"""
+
+    def _store(self, n=3000, **kwargs):
+        store = VectorStore(ann_min_rows=1000, **kwargs)
+        store.add_documents("bank", _clustered_documents(n))
+        return store
+
+    def test_recall_against_brute_force(self):
+        """Probing a few clusters keeps recall high; probing all is exact"""
+        store = self._store()
+        queries = np.random.default_rng(8).normal(size=(20, 32))
+
+        assert recall_at_k(store, "bank", queries, k=10) >= 0.9
+        index = store.collections["bank"]._ann
+        assert index is not None and index.n_lists > 8
+        assert recall_at_k(store, "bank", queries, k=10, nprobe=index.n_lists) == 1.0
+
+    def test_filtered_search_uses_index(self):
+        """Filters are intersected with the probed candidates"""
+        store = self._store()
+        query = np.random.default_rng(9).normal(size=32).tolist()
+        results = store.search("bank", query, k=5, metadata_filter={"type": "resume"})
+        assert len(results) == 5
+        assert all(r.document.metadata["type"] == "resume" for r in results)
+        assert recall_at_k(
+            store, "bank", [query], k=5, metadata_filter={"type": "resume"}
+        ) >= 0.8
+
+    def test_small_collections_stay_exact(self):
+        """Collections under the threshold never build an index"""
+        store = self._store(n=500)
+        store.search("bank", [1.0] * 32, k=3)
+        assert store.collections["bank"]._ann is None
+
+    def test_index_tracks_appends_and_compaction(self):
+        """Appended rows are indexed; compaction discards the index"""
+        store = self._store(n=1200)
+        store.search("bank", [1.0] * 32, k=3)
+        collection = store.collections["bank"]
+        assert collection._ann is not None
+
+        new_id = store.add_document("bank", "new", [5.0] + [0.0] * 31)
+        index = collection._ann
+        assert index.size == collection.size
+        assert sum(index.list_rows(i).size for i in range(index.n_lists)) == collection.size
+        assert collection.size - 1 in index.candidates(
+            collection.dense_rows(np.array([collection.size - 1]))[0], nprobe=1
+        )
+        assert store.search("bank", [1.0] + [0.0] * 31, k=1)[0].document.id == new_id
+
+        for doc in store.get_all_documents("bank")[:400]:
+            store.delete_document("bank", doc.id)
+        assert collection._ann is None
+        assert store.search("bank", [1.0] + [0.0] * 31, k=1)[0].document.id == new_id
+
+    def test_search_many_with_index(self):
+        """Batched search falls back to per-query indexed search"""
+        store = self._store(precision="int8", rerank=True)
+        queries = np.random.default_rng(10).normal(size=(3, 32))
+        batched = store.search_many("bank", queries, k=4)
+        assert [[r.document.id for r in results] for results in batched] == [
+            [r.document.id for r in store.search("bank", q.tolist(), k=4)]
+            for q in queries
+        ]
+
+
+class TestMetadataIndex:
+    """Test inverted-index metadata filtering"""
+
+    def _store(self):
+        store = VectorStore()
+        store.add_documents("user_1", [
+            {"content": "r1", "embedding": [1.0, 0.0], "metadata": {"type": "resume", "section": "Skills"}},
+            {"content": "j1", "embedding": [0.0, 1.0], "metadata": {"type": "job_description", "section": "Skills"}},
+            {"content": "r2", "embedding": [1.0, 1.0], "metadata": {"type": "resume", "section": "Experience"}},
+            {"content": "x1", "embedding": [1.0, 0.5], "metadata": {"tags": ["a", "b"]}},
+        ])
+        return store
+
+    def test_filter_intersects_keys(self):
+        """Conditions on several keys must all match"""
+        store = self._store()
+        docs = store.get_all_documents(
+            "user_1", metadata_filter={"type": "resume", "section": "Skills"}
+        )
+        assert [d.content for d in docs] == ["r1"]
+
+    def test_list_filter_is_union(self):
+        """List filter values match any element"""
+        store = self._store()
+        docs = store.get_all_documents(
+            "user_1", metadata_filter={"section": ["Experience", "Skills"]}
+        )
+        assert [d.content for d in docs] == ["r1", "j1", "r2"]
+
+    def test_missing_key_or_value_matches_nothing(self):
+        """Unknown keys and values resolve to an empty row set"""
+        store = self._store()
+        assert store.get_all_documents("user_1", {"type": "cover_letter"}) == []
+        assert store.search("user_1", [1.0, 0.0], k=3, metadata_filter={"nope": 1}) == []
+
+    def test_unhashable_values_fall_back_to_scan(self):
+        """Unhashable metadata values are still filterable"""
+        store = self._store()
+        docs = store.get_all_documents("user_1", {"tags": [["a", "b"]]})
+        assert [d.content for d in docs] == ["x1"]
+
+    def test_filtered_search_uses_index_rows(self):
+        """Filtered search ranks only the indexed rows"""
+        store = self._store()
+        results = store.search(
+            "user_1", [0.0, 1.0], k=5, metadata_filter={"type": "resume"}
+        )
+        assert [r.document.content for r in results] == ["r2", "r1"]
+
+
+class TestDocumentLookup:
+    """Test id index, delete/upsert and compaction"""
+
+    def test_get_delete_and_upsert(self):
+        """Documents are addressable, deletable and replaceable by id"""
+        store = VectorStore()
+        ids = store.add_documents("user_1", _random_documents(5, dim=4))
+
+        assert store.get_document("user_1", ids[2]).content == "chunk 2"
+        assert store.delete_document("user_1", ids[2]) is True
+        assert store.delete_document("user_1", ids[2]) is False
+        assert store.get_document("user_1", ids[2]) is None
+        assert store.count_documents("user_1") == 4
+
+        store.upsert_document("user_1", ids[0], "replaced", [0.0, 0.0, 0.0, 1.0])
+        assert store.count_documents("user_1") == 4
+        assert store.get_document("user_1", ids[0]).content == "replaced"
+        top = store.search("user_1", [0.0, 0.0, 0.0, 1.0], k=10)
+        assert top[0].document.content == "replaced"
+        assert len(top) == 4
+        assert "chunk 2" not in [r.document.content for r in top]
+
+    def test_deleted_rows_excluded_from_filters(self):
+        """Tombstoned rows never appear in filtered results"""
+        store = VectorStore()
+        ids = store.add_documents("user_1", _random_documents(6, dim=4))
+        store.delete_document("user_1", ids[0])
+
+        docs = store.get_all_documents("user_1", {"type": "resume"})
+        assert [d.content for d in docs] == ["chunk 2", "chunk 4"]
+
+    def test_compaction_preserves_results(self):
+        """Compaction drops tombstones without changing search results"""
+        store = VectorStore()
+        documents = _random_documents(100, dim=16)
+        ids = store.add_documents("user_1", documents)
+        for doc_id in ids[:60]:
+            store.delete_document("user_1", doc_id)
+
+        collection = store.collections["user_1"]
+        assert collection.size < 100  # at least one compaction ran
+        assert collection.size - collection.deleted == 40
+        assert store.count_documents("user_1") == 40
+
+        query = documents[75]["embedding"]
+        assert store.search("user_1", query, k=1)[0].document.id == ids[75]
+        assert store.get_document("user_1", ids[99]).content == "chunk 99"
+
+
+class TestQuantizedStorage:
+    """Test float16/int8 collections and exact re-ranking"""
+
+    @pytest.mark.parametrize("precision", ["float16", "int8"])
+    def test_quantized_search_close_to_exact(self, precision):
+        """Quantized scores stay close to float32 and shrink memory"""
+        documents = _random_documents(300, dim=64)
+        exact = VectorStore()
+        exact.add_documents("user_1", documents)
+        store = VectorStore(precision=precision)
+        store.add_documents("user_1", documents)
+
+        query = np.random.default_rng(4).normal(size=64).tolist()
+        expected = exact.search("user_1", query, k=10)
+        actual = store.search("user_1", query, k=10)
+        assert actual[0].document.content == expected[0].document.content
+        for result, reference in zip(actual, expected):
+            assert result.score == pytest.approx(reference.score, abs=0.02)
+
+        collection = store.collections["user_1"]
+        assert collection.vectors.dtype == np.dtype(precision)
+        assert collection.nbytes < exact.collections["user_1"].nbytes / 1.9
+
+    def test_rerank_returns_exact_scores(self):
+        """Re-ranked int8 search matches float32 ranking and scores"""
+        documents = _random_documents(300, dim=64)
+        store = VectorStore(precision="int8", rerank=True)
+        store.add_documents("user_1", documents)
+
+        query = np.random.default_rng(5).normal(size=64).tolist()
+        results = store.search("user_1", query, k=5)
+        expected = _brute_force(documents, query, k=5)
+        assert [r.document.content for r in results] == [
+            f"chunk {i}" for _, i in expected
+        ]
+        for result, (score, _) in zip(results, expected):
+            assert result.score == pytest.approx(score, abs=1e-5)
+
+    def test_embeddings_not_retained_on_documents(self):
+        """Raw lists are dropped; documents and get_embedding read the stored row"""
+        store = VectorStore(precision="int8")
+        ids = store.add_documents("user_1", [
+            {"content": "a", "embedding": [3.0, 4.0]},
+            {"content": "zero", "embedding": [0.0, 0.0]},
+        ])
+        document = store.get_document("user_1", ids[0])
+        assert document._embedding is None
+        assert document.embedding == pytest.approx([0.6, 0.8], abs=0.01)
+        assert store.get_all_documents("user_1")[1].embedding == [0.0, 0.0]
+        results = store.search("user_1", [1.0, 1.0], k=1)
+        assert results[0].document.embedding == pytest.approx([0.6, 0.8], abs=0.01)
+
+        assert store.get_embedding("user_1", ids[0]) == pytest.approx([0.6, 0.8], abs=0.01)
+        assert not store.get_embedding("user_1", ids[1]).any()
+        assert store.get_embedding("user_1", "missing") is None
+
+        store.upsert_document("user_1", ids[0], "b", [0.0, 2.0])
+        assert document.embedding is None  # Replaced
+        assert store.get_document("user_1", ids[0]).embedding == pytest.approx([0.0, 1.0], abs=0.01)
+
+    def test_documents_do_not_keep_collections_alive(self):
+        """Documents hold a weak reference; repr, eq and replace ignore the collection"""
+        store = VectorStore()
+        store.add_document("user_1", "a", [1.0, 0.0], document_id="d1")
+        document = store.get_document("user_1", "d1")
+        assert "embedding" not in repr(document)
+        copy = dataclasses.replace(document)
+        assert copy == document and copy._owner is None
+        assert copy.embedding == [1.0, 0.0]  # Detached copy keeps the values
+
+        store.delete_collection("user_1")
+        gc.collect()
+        assert document._owner() is None
+        assert document.embedding is None
+
+    def test_unknown_precision_rejected(self):
+        """Only float32, float16 and int8 are supported"""
+        with pytest.raises(ValueError):
+            VectorStore(precision="float8")
+
+
+class TestMemoryBudget:
+    """Test LRU eviction of whole collections"""
+
+    def _fill(self, store, collection_id, n=20, seed=0):
+        return store.add_documents(collection_id, _random_documents(n, dim=16, seed=seed))
+
+    def test_least_recently_used_collection_evicted(self):
+        """Searching a collection protects it from the next eviction"""
+        probe = VectorStore()
+        self._fill(probe, "x")
+        size = probe.collections["x"].resident_bytes
+
+        store = VectorStore(memory_budget_bytes=int(size * 2.5))
+        self._fill(store, "user_1")
+        self._fill(store, "user_2")
+        store.search("user_1", [1.0] * 16, k=1)
+        self._fill(store, "user_3")
+
+        assert list(store.collections) == ["user_1", "user_3"]
+        assert store.count_documents("user_2") == 0
+        stats = store.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["bytes_resident"] <= stats["memory_budget_bytes"]
+
+    def test_spilled_collection_reloads(self, tmp_path):
+        """Spilled collections come back memory-mapped with the same results"""
+        store = VectorStore(memory_budget_bytes=1, spill_dir=str(tmp_path))
+        ids = self._fill(store, "user_1")
+        query = np.random.default_rng(11).normal(size=16).tolist()
+        expected = [r.document.id for r in store.search("user_1", query, k=3)]
+
+        self._fill(store, "user_2", seed=1)
+        assert "user_1" not in store.collections
+
+        assert [r.document.id for r in store.search("user_1", query, k=3)] == expected
+        assert isinstance(store.collections["user_1"].vectors, np.memmap)
+        assert store.get_document("user_1", ids[0]).content == "chunk 0"
+        assert store.get_stats()["reloads"] == 1
+
+    def test_delete_spilled_collection(self, tmp_path):
+        """Deleting a spilled collection removes its files"""
+        store = VectorStore(memory_budget_bytes=1, spill_dir=str(tmp_path))
+        self._fill(store, "user_1")
+        self._fill(store, "user_2")
+        assert any(tmp_path.iterdir())
+
+        assert store.delete_collection("user_1") is True
+        assert store.count_documents("user_1") == 0
+        store.clear_all()
+        assert not any(tmp_path.iterdir())
+
+
+class TestSnapshot:
+    """Test on-disk snapshots and memory-mapped restore"""
+
+    def test_round_trip_search_matches(self, tmp_path):
+        """A restored collection is memory-mapped and ranks identically"""
+        store = VectorStore()
+        documents = _random_documents(30, dim=8)
+        ids = store.add_documents("user_1", documents)
+        store.delete_document("user_1", ids[4])
+        assert write_snapshot(store, tmp_path) == 1
+
+        restored = VectorStore()
+        assert restore_snapshot(restored, tmp_path) == 1
+        collection = restored.collections["user_1"]
+        assert isinstance(collection.vectors, np.memmap)
+        assert restored.count_documents("user_1") == 29
+        assert restored.get_document("user_1", ids[4]) is None
+        assert restored.get_document("user_1", ids[0]).embedding == pytest.approx(
+            store.get_document("user_1", ids[0]).embedding
+        )
+
+        query = np.random.default_rng(3).normal(size=8).tolist()
+        expected = store.search("user_1", query, k=5, metadata_filter={"type": "resume"})
+        actual = restored.search("user_1", query, k=5, metadata_filter={"type": "resume"})
+        assert [r.document.id for r in actual] == [r.document.id for r in expected]
+
+    def test_writes_after_restore_copy_on_write(self, tmp_path):
+        """Adding to a restored collection leaves the snapshot file intact"""
+        store = VectorStore()
+        store.add_documents("user_1", _random_documents(5, dim=4))
+        write_snapshot(store, tmp_path)
+
+        restored = VectorStore()
+        restore_snapshot(restored, tmp_path)
+        restored.add_document("user_1", "new", [0.0, 0.0, 0.0, 1.0])
+        assert restored.search("user_1", [0.0, 0.0, 0.0, 1.0], k=1)[0].document.content == "new"
+
+        again = VectorStore()
+        restore_snapshot(again, tmp_path)
+        assert again.count_documents("user_1") == 5
+
+    def test_only_changed_collections_rewritten(self, tmp_path):
+        """Snapshots are incremental and dropped collections are removed"""
+        store = VectorStore()
+        store.add_documents("user_1", _random_documents(3, dim=4))
+        store.add_documents("user_2", _random_documents(3, dim=4))
+        assert write_snapshot(store, tmp_path) == 2
+        assert write_snapshot(store, tmp_path) == 0
+
+        store.delete_collection("user_2")
+        write_snapshot(store, tmp_path)
+        restored = VectorStore()
+        assert restore_snapshot(restored, tmp_path) == 1
+        assert list(restored.collections) == ["user_1"]
+
+    def test_evicted_changes_are_not_restored_stale(self, tmp_path):
+        """A dirty collection evicted before the snapshot is spilled or dropped, not left stale"""
+        snapshots, spill = tmp_path / "snapshots", tmp_path / "spill"
+        for spill_dir in (None, spill):
+            store = VectorStore()
+            ids = store.add_documents("user_1", _random_documents(5, dim=4))
+            write_snapshot(store, snapshots)
+
+            store.memory_budget_bytes = 1
+            store.spill_dir = spill_dir and str(spill_dir)
+            store.delete_document("user_1", ids[0])
+            store.add_documents("user_2", _random_documents(5, dim=4, seed=1))
+            assert "user_1" not in store.collections
+            write_snapshot(store, snapshots)
+
+            restored = VectorStore()
+            restore_snapshot(restored, snapshots)
+            if spill_dir is None:
+                assert "user_1" not in restored.collections
+            else:
+                assert restored.count_documents("user_1") == 4
+                assert restored.get_document("user_1", ids[0]) is None
+                assert "user_1" not in store.collections  # Not reloaded
+
+    def test_quantized_round_trip(self, tmp_path):
+        """Scales and re-rank rows are snapshotted with int8 collections"""
+        store = VectorStore(precision="int8", rerank=True)
+        store.add_documents("user_1", _random_documents(40, dim=8))
+        write_snapshot(store, tmp_path)
+
+        restored = VectorStore()
+        restore_snapshot(restored, tmp_path)
+        collection = restored.collections["user_1"]
+        assert collection.precision == "int8" and collection.rerank
+        assert isinstance(collection.exact_vectors, np.memmap)
+
+        query = np.random.default_rng(6).normal(size=8).tolist()
+        assert [
+            (r.document.id, r.score) for r in restored.search("user_1", query, k=5)
+        ] == [
+            (r.document.id, r.score) for r in store.search("user_1", query, k=5)
+        ]